@@ -1,5 +1,6 @@
 # Import the Streamlit library, to build the interactive web apps
 import streamlit as st
+import threading
 
 #############################
 # --- Page Configuration ---
@@ -14,6 +15,27 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+#############################
+# --- Dashboard Warm-up ---
+#############################
+# Users usually land here first: start loading the dashboard datasets and filter
+# options in the background so the first dashboard click hits a warm cache.
+# Importing utils.warmer connects and reflects the tables, so the import and the
+# prefetch run in a background thread: the landing page never waits on (or fails
+# because of) the database.
+WARMUP_THREAD = "wsr-warmup"
+
+def warm_up():
+    try:
+        from utils.warmer import get_warmer, prefetch
+        prefetch(get_warmer())
+    except Exception as e:
+        print("Dashboard prefetch skipped:", e)
+
+# One warm-up at a time per process, however often the landing page reruns
+if not any(thread.name == WARMUP_THREAD for thread in threading.enumerate()):
+    threading.Thread(target=warm_up, name=WARMUP_THREAD, daemon=True).start()
+
 
 #######################
 # --- Logo Display ---
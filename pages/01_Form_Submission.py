@@ -7,7 +7,7 @@ from sqlalchemy import create_engine, MetaData, Table, select, insert, func  # F
 from datetime import date, timedelta, datetime  # For working with dates
 
 # Import shared modules
-from utils.db import engine, employees, weekly_reports, hourstracking, accomplishments, load_tables
+from utils.db import engine, accomplishments, load_tables
 from utils.helpers import (
     get_most_recent_monday,
     get_or_create_employee,
@@ -15,6 +15,10 @@ from utils.helpers import (
     clean_dataframe_dates_hours,
     normalize_text
 )
+from utils.ingest import prepare_weekly_rows, bulk_ingest_weekly_reports
+from utils.cube import refresh_accomplishment_cube
+from utils.versions import bump_versions
+from utils.spool import is_connectivity_error, dead_batches, spool_batch, spool_depth, start_replayer
 
 
 ####################
@@ -32,6 +36,24 @@ st.image("images/Iberia-Advisory.png", width=250)
 
 # Load global tables
 load_tables()
+
+# Start one background replayer per process for submissions spooled while the DB was down
+@st.cache_resource
+def get_spool_replayer():
+    return start_replayer(engine)
+
+get_spool_replayer()
+
+pending_batches = spool_depth()
+if pending_batches:
+    st.info(f"{pending_batches} submission batch(es) are waiting to be sent to the database.")
+
+failed_batches = dead_batches()
+if failed_batches:
+    st.error(
+        f"{len(failed_batches)} saved submission batch(es) could not be sent after repeated attempts "
+        f"and need attention. Last error: {failed_batches[-1][4]}"
+    )
    
 ####################################
 # --- Page Title and Description ---
@@ -131,65 +153,27 @@ if st.button("📤 Submit Weekly Reports"):
             # Compute effort percentage
             cleaned_df["effortpercentage"] = (cleaned_df["hoursworked"] / 40) * 100
 
-            # Begin database transaction
-            with engine.begin() as conn:
-                for _, row in cleaned_df.iterrows():
-                    contractor = normalize_text(row.get("contractorname", ""))
-                    if not contractor:
-                        
-                        # Skip empty contractors
-                        continue
-
-                    employee_id = get_or_create_employee(
-                        conn,
-                        contractor_name=contractor,
-                        vendor=normalize_text(row.get("vendorname", "")),
-                        laborcategory=normalize_text(row.get("laborcategory", ""))
-                    )
-
-                    # Insert Weekly Report
-                    conn.execute(
-                        insert(weekly_reports).values(
-                            employeeid=employee_id,
-                            weekstartdate=row["weekstartdate"],
-                            divisioncommand=normalize_text(row.get("divisioncommand", "")),
-                            workproducttitle=normalize_text(row.get("workproducttitle", "")),
-                            contributiondescription=normalize_text(row.get("contributiondescription", "")),
-                            status=normalize_text(row.get("status", "")),
-                            plannedorunplanned=row.get("plannedorunplanned", "").strip().lower(),
-                            datecompleted=row["datecompleted"],
-                            distinctnfr=normalize_text(row.get("distinctnfr", "")),
-                            distinctcap=normalize_text(row.get("distinctcap", "")),
-                            effortpercentage=row["effortpercentage"],
-                            contractorname=contractor,
-                            govttaname=normalize_text(row.get("govttaname", "")),
-                            
-                            
-                            # Audit fields
-                            created_at=datetime.utcnow(),
-                            entered_by=st.session_state.get("username", "anonymous"),  # or a fallback string
-                            source_file="manual_form_submission"
-                        )
-                    )
-
-                    # Insert Hours Tracking
-                    if row["hoursworked"] > 0:
-                        conn.execute(
-                            insert(hourstracking).values(
-                                employeeid=employee_id,
-                                workstreamid=None,
-                                reportingweek=row["weekstartdate"],
-                                hoursworked=row["hoursworked"],
-                                levelofeffort=row["effortpercentage"],
-                                # Audit Fields
-                                created_at=datetime.utcnow(),
-                                entered_by=st.session_state["username"],
-                                source_file="manual_form_submission"
-                            )
-                        )
-
-
-            st.success("✅ Weekly Reports submitted successfully!")
+            # Normalize rows and resolve employee keys before touching the database
+            staged_rows = prepare_weekly_rows(cleaned_df)
+
+            entered_by = st.session_state.get("username", "anonymous")
+
+            # Begin database transaction: stage the batch, then merge it with set-based SQL
+            try:
+                with engine.begin() as conn:
+                    bulk_ingest_weekly_reports(conn, staged_rows, entered_by=entered_by)
+            except Exception as e:
+                # Only an unreachable database is spooled; any other error is reported below
+                if not is_connectivity_error(engine, e):
+                    raise
+                # Database unreachable: keep the batch locally, it is replayed automatically
+                depth = spool_batch(staged_rows, entered_by=entered_by)
+                st.warning(
+                    f"⚠️ Database is unreachable. Your submission was saved locally and will be "
+                    f"sent automatically ({depth} batch(es) waiting)."
+                )
+            else:
+                st.success("✅ Weekly Reports submitted successfully!")
             # Show the submitted data
             with st.expander("View Submitted Data"):
                 st.dataframe(cleaned_df)
@@ -237,6 +221,7 @@ if st.button("Submit Accomplishments"):
             df = cleaned_accom_df.rename(columns=accomplishments_col_map)
             duplicates_found = []
             inserted_count = 0
+            touched_weeks = set()
 
             with engine.begin() as conn:
                 for _, row in df.iterrows():
@@ -251,7 +236,9 @@ if st.button("Submit Accomplishments"):
                     )
 
                     reporting_week = row.get("reporting_week")
-                    week_str = reporting_week.strftime("%m/%d/%Y") if pd.notnull(reporting_week) else ""
+                    week_date = pd.Timestamp(reporting_week).date() if pd.notnull(reporting_week) else None
+                    week_str = week_date.strftime("%m/%d/%Y") if week_date else ""
+                    touched_weeks.add(week_date)
                     
                     # Insert each accomplishment individually
                     for i in range(1, 6):
@@ -261,12 +248,18 @@ if st.button("Submit Accomplishments"):
                             employeeid=employee_id,
                             workstreamid=workstream_id,
                             daterange=week_str,
+                            weekstartdate=week_date,
                             description=text,
                             # Audit Fields
                             created_at=datetime.utcnow(),
                             entered_by=st.session_state.get("username", "anonymous")
                         ))
 
+                # Keep the dashboard rollup and cache versions in step with the inserted rows
+                # (the helpers bump employees / workstreams themselves when they write)
+                refresh_accomplishment_cube(conn, touched_weeks)
+                bump_versions(conn, accomplishments.name)
+
 
             st.success("Accomplishments submitted successfully!")
             with st.expander("View Submitted Data"):
@@ -1,20 +1,13 @@
 # Import necessary libraries
 import streamlit as st  # For creating the interactive web app
-from sqlalchemy import create_engine, text  # For database connection and raw SQL execution
-import pandas as pd  # For working with tabular data
 import plotly.express as px  # For creating visualizations
-import re  # For text cleaning using regular expressions
 
 # Import shared modules
-from utils.db import engine, load_tables, employees, workstreams, weekly_reports, accomplishments, hourstracking
-from utils.queries import weekly_reports_with_employees
-from utils.helpers import (
-    get_most_recent_monday,
-    get_or_create_employee,
-    get_or_create_workstream,
-    clean_dataframe_dates_hours,
-    normalize_text
-)
+from utils.db import engine, load_tables
+from utils.catalog import get_filter_options
+from utils.versions import read_versions
+from utils.datasets import DATASETS, query_weekly_reports
+from utils.cache import get_frame_cache
 
 
 
@@ -42,19 +35,37 @@ st.image("images/Iberia-Advisory.png", width=250)
 st.title("Management Dashboard") 
 st.caption("Visualize and filter team effort across vendors, divisions, and contractors.")
 
+#########################
+# --- Sidebar Filters ---
+#########################
+# Option lists come from cached DISTINCT queries (utils/catalog.py), not from the full report history
+options = get_filter_options("weekly_reports")
+
+st.sidebar.header("Filter Data")
+selected_weeks = st.sidebar.multiselect("Reporting Week", options["weeks"])
+selected_vendors = st.sidebar.multiselect("Vendor", options["vendors"])
+selected_contractors = st.sidebar.multiselect("Contractor", options["contractors"])
+
 ############################
 # --- Load Weekly Report Data ---
 ############################
-@st.cache_data(ttl=600)
-def load_weekly_data():
-    with engine.connect() as conn:
-        result = conn.execute(text(weekly_reports_with_employees))
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-
-    df.columns = [re.sub(r"\s+", " ", col).strip() for col in df.columns]
-    return df
-
-df = load_weekly_data()
+# Filters are applied in SQL (utils/datasets.py), so transfer and memory scale with the
+# selection; rows are typed as they are fetched, like the canonical weekly report frame.
+# Frames are cached in the size-bounded memory + disk cache (utils/cache.py), keyed on the
+# filters and the data version (utils/versions.py), so they are recomputed once per write.
+def load_weekly_data(version, weeks=(), vendors=(), contractors=()):
+    def load():
+        with engine.connect() as conn:
+            return query_weekly_reports(conn, weeks, vendors, contractors)
+
+    return get_frame_cache().get_or_load(("weekly_reports", weeks, vendors, contractors), version, load)
+
+filters = (
+    tuple(sorted(selected_weeks)),
+    tuple(sorted(selected_vendors)),
+    tuple(sorted(selected_contractors))
+)
+df = load_weekly_data(read_versions(engine, *DATASETS["weekly_reports"].tables), *filters)
 
 #########################
 # --- Data Preparation ---
@@ -73,40 +84,8 @@ if missing_cols:
     st.error(f"Missing required columns: {missing_cols}")
     st.stop()
 
-# Convert reporting week to datetime
-df["Reporting Week"] = pd.to_datetime(df["Reporting Week"], errors='coerce')
-
-# Convert level of effort to numeric (strip % if present)
-df["Level of Effort (%)"] = pd.to_numeric(
-    df["Level of Effort (%)"].astype(str).str.replace('%', '', regex=False),
-    errors='coerce'
-).fillna(0)
-
-# Calculate hours worked assuming 40 hours is 100% effort
-df["Hours"] = (df["Level of Effort (%)"] / 100 * 40).round(2)
-
-#########################
-# --- Sidebar Filters ---
-#########################
-st.sidebar.header("Filter Data")
-
-# Create dropdowns/multiselects based on available data
-week_options = df["Reporting Week"].dropna().dt.strftime("%Y-%m-%d").sort_values().unique()
-selected_weeks = st.sidebar.multiselect("Reporting Week", week_options)
-
-vendors = df["Vendor Name"].dropna().sort_values().unique()
-selected_vendors = st.sidebar.multiselect("Vendor", vendors)
-
-contractors = df["Contractor (Last Name, First Name)"].dropna().sort_values().unique()
-selected_contractors = st.sidebar.multiselect("Contractor", contractors)
-
-# Apply filters
-if selected_weeks:
-    df = df[df["Reporting Week"].dt.strftime("%Y-%m-%d").isin(selected_weeks)]
-if selected_vendors:
-    df = df[df["Vendor Name"].isin(selected_vendors)]
-if selected_contractors:
-    df = df[df["Contractor (Last Name, First Name)"].isin(selected_contractors)]
+# Reporting Week, Level of Effort, and Hours (40 hours == 100% effort) are typed and
+# derived once in the canonical frame, so they are used as loaded.
 
 ####################
 # --- Export CSV ---
@@ -133,22 +112,26 @@ if df.empty:
 # --- Treemap Chart ---
 ########################
 # Treemap
+# Built from the filtered rows; hierarchy and hover columns go in as plain values
+# (not categoricals) so plotly only sees the names actually present.
 st.subheader("Effort Breakdown: Vendor → Division → Contractor → Work Product")
+treemap_path = [
+    "Vendor Name",
+    "Division/Command",
+    "Contractor (Last Name, First Name)",
+    "Work Product Title"
+]
+treemap_hover = [
+    "Work Product Status",
+    "Planned or Unplanned",
+    "Govt TA (Last Name, First Name)"
+]
 try:
     fig = px.treemap(
-        df,
-        path=[
-            "Vendor Name",
-            "Division/Command",
-            "Contractor (Last Name, First Name)",
-            "Work Product Title"
-        ],
+        df.astype({col: object for col in treemap_path + treemap_hover}),
+        path=treemap_path,
         values="Level of Effort (%)",
-        hover_data=[
-            "Work Product Status",
-            "Planned or Unplanned",
-            "Govt TA (Last Name, First Name)"
-        ]
+        hover_data=treemap_hover
     )
     st.plotly_chart(fig, use_container_width=True)
 except ValueError as ve:
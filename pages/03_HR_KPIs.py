@@ -1,11 +1,12 @@
 # Import required libraries
 import streamlit as st  # Used for building the web app
-from sqlalchemy import create_engine, MetaData, Table, select, join  # For database connections
-import pandas as pd  # For working with tabular data
 import plotly.express as px  # For generating interactive charts
 
-from utils.db import engine, employees, weekly_reports, load_tables
-from utils.helpers import normalize_text
+from utils.db import engine, load_tables
+from utils.kpis import monthly_hours, contractor_count
+from utils.datasets import DATASETS, hr_view
+from utils.versions import read_versions
+from utils.warmer import get_warmer
 
 ############################
 # --- Page Configuration ---
@@ -35,49 +36,25 @@ st.caption("Track contractor activity, coverage, and labor category distribution
 ################################
 # --- Data Loader ---
 ################################
-# Cache the function output for 10 minutes
-@st.cache_data(ttl=600)
-def load_hr_data():
-    # Join weekly reports and employees on employee ID
-    j = join(weekly_reports, employees, weekly_reports.c.employeeid == employees.c.employeeid)
-    stmt = select(weekly_reports, employees.c.laborcategory).select_from(j)
-
-    # Execute query and load into DataFrame
-    with engine.connect() as conn:
-        df = pd.DataFrame(conn.execute(stmt).fetchall(), columns=stmt.columns.keys())
-
-    # Rename columns for clarity
-    df.rename(columns={
-        'weekstartdate': 'Reporting Week',
-        'datecompleted': 'If Completed, Date Completed',
-        'status': 'Work Product Status',
-        'plannedorunplanned': 'Planned or Unplanned',
-        'effortpercentage': 'Level of Effort (%)',
-        'contractorname': 'Contractor (Last Name, First Name)',
-        'workproducttitle': 'Work Product Title',
-        'divisioncommand': 'Division/Command',
-        'govttaname': 'Govt TA (Last Name, First Name)',
-        'distinctnfr': 'Distinct NFR',
-        'distinctcap': 'Distinct CAP',
-        'laborcategory': 'Labor Category'
-    }, inplace=True)
-
-    return df
-
-# Load the data
-df = load_hr_data()
-
-############################
-# --- Data Cleaning ---
-############################
-df["Reporting Week"] = pd.to_datetime(df["Reporting Week"], errors='coerce')
-df["If Completed, Date Completed"] = pd.to_datetime(df["If Completed, Date Completed"], errors='coerce')
-df["Work Product Status"] = df["Work Product Status"].astype(str).str.strip().str.title()
-df["Planned or Unplanned"] = df["Planned or Unplanned"].astype(str).str.strip().str.lower()
-df["Level of Effort (%)"] = pd.to_numeric(df["Level of Effort (%)"], errors='coerce').fillna(0)
-
-# Calculate total hours assuming 40 hours is 100% effort
-df["Hours"] = (df["Level of Effort (%)"] / 100 * 40).round(2)
+# The raw rows (for export) are a view of the canonical weekly report frame
+# (utils/datasets.py), shared with the Management Dashboard. It and the KPI aggregates
+# are kept warm by the background dataset warmer (utils/warmer.py): pages get the last
+# finished build immediately and rebuilds happen off the request path after each write.
+warmer = get_warmer()
+
+# Load the data. The heatmap below pages through the cube live, keyed on the version
+# the KPIs were built from; if a write has moved the data past that version, catch the
+# KPIs up first so every chart on the page comes from the same data.
+weekly_version, kpis = warmer.get_with_version("hr_kpis")
+if read_versions(engine, *DATASETS["hr_kpis"].tables) != weekly_version:
+    warmer.refresh("hr_kpis")
+    weekly_version, kpis = warmer.get_with_version("hr_kpis")
+df = hr_view(warmer.get("weekly_reports"))
+
+# Reporting Week, Level of Effort, and Hours (40 hours == 100% effort) are typed and
+# derived once in the canonical frame. Status (title case), planned/unplanned
+# (lowercase), and contractor names are stored in canonical form at ingest (backfilled
+# by utils/migrations/canonical_text.py), so everything is used as loaded.
 
 ####################
 # --- Export CSV ---
@@ -94,17 +71,17 @@ st.download_button(
 #####################
 st.markdown("## Key Performance Indicators")
 
-total_hours = df["Hours"].sum()
-avg_hours_per_contractor = df.groupby("Contractor (Last Name, First Name)")["Hours"].sum().mean()
-unplanned_hours = df[df["Planned or Unplanned"] == "unplanned"]["Hours"].sum()
-unplanned_pct = (unplanned_hours / total_hours * 100) if total_hours > 0 else 0
+summary = kpis["summary"]
+total_hours = summary["total_hours"]
+avg_hours_per_contractor = summary["avg_hours_per_contractor"]
+unplanned_pct = summary["unplanned_pct"]
 
 # Define expected contractors manually or from config
 expected_contractors = {
     "Smith, John", "Doe, Jane"
 }
 
-active_contractors = set(df["Contractor (Last Name, First Name)"].dropna().apply(normalize_text).unique())
+active_contractors = kpis["active_contractors"]
 missing_contractors = sorted(expected_contractors - active_contractors)
 
 # Display metrics in columns
@@ -123,19 +100,19 @@ st.markdown("## Work Metrics Visualizations")
 row1_col1, row1_col2 = st.columns(2)
 with row1_col1:
     st.subheader("Work Product Status Overview")
-    status_counts = df["Work Product Status"].value_counts()
+    status_counts = kpis["status_counts"]
     st.plotly_chart(px.pie(
-        names=status_counts.index,
-        values=status_counts.values,
+        names=status_counts["Work Product Status"],
+        values=status_counts["count"],
         title="Work Status Distribution"
     ), use_container_width=True)
 
 with row1_col2:
     st.subheader("Weekly Completion Trend")
+    completed = kpis["weekly_completed"]
     weekly_completed = (
-        df[df["Work Product Status"] == "Completed"]
-        .groupby(df["Reporting Week"].dt.to_period("W").dt.start_time)
-        .size()
+        completed.groupby(completed["Reporting Week"].dt.to_period("W").dt.start_time)["count"]
+        .sum()
     )
     st.line_chart(weekly_completed)
 
@@ -143,12 +120,7 @@ with row1_col2:
 row2_col1, row2_col2 = st.columns(2)
 with row2_col1:
     st.subheader("Level of Effort by Division")
-    division_effort = (
-        df.groupby("Division/Command")["Level of Effort (%)"]
-        .sum()
-        .sort_values(ascending=True)
-        .reset_index()
-    )
+    division_effort = kpis["effort_by_division"]
     st.plotly_chart(px.bar(
         division_effort,
         x="Level of Effort (%)",
@@ -159,13 +131,7 @@ with row2_col1:
 
 with row2_col2:
     st.subheader("Unplanned Hours by Division")
-    unplanned_by_div = (
-        df[df["Planned or Unplanned"] == "unplanned"]
-        .groupby("Division/Command")["Hours"]
-        .sum()
-        .sort_values(ascending=True)    # Horizontal bar
-        .reset_index()
-    )
+    unplanned_by_div = kpis["unplanned_by_division"]  # ascending for horizontal bars
     st.plotly_chart(px.bar(
         unplanned_by_div,
         x="Hours",
@@ -178,39 +144,51 @@ with row2_col2:
 row3_col1, row3_col2 = st.columns(2)
 with row3_col1:
     st.subheader("Top Work Products by Total Hours")
-    top_titles = (
-        df.groupby("Work Product Title", as_index=False)
-        .agg(Total_Hours=("Hours", "sum"), Frequency=("Hours", "count"))
-        .sort_values(by="Total_Hours", ascending=False)
-        .head(5)
-    )
+    top_titles = kpis["top_work_products"]
     st.table(top_titles)
 
 with row3_col2:
     st.subheader("Labor Category Distribution")
-    labor_dist = df["Labor Category"].value_counts()
+    labor_dist = kpis["labor_category_counts"]
     st.plotly_chart(px.pie(
-        names=labor_dist.index,
-        values=labor_dist.values,
+        names=labor_dist["Labor Category"],
+        values=labor_dist["count"],
         title="Labor Categories"
     ), use_container_width=True)
 
 # --- Heatmap: Hours by Contractor and Month ---
 st.subheader("Monthly Hours Heatmap by Contractor")
-heatmap_df = (
-    df.dropna(subset=["Reporting Week"])
-    .assign(Month=df["Reporting Week"].dt.to_period("M").astype(str))
-    .groupby(["Contractor (Last Name, First Name)", "Month"])["Hours"]
-    .sum()
-    .reset_index()
-    .pivot(index="Contractor (Last Name, First Name)", columns="Month", values="Hours")
-    .fillna(0)
-)
 
-st.dataframe(
-    heatmap_df.style.background_gradient(axis=1, cmap="Blues"),
-    use_container_width=True
-)
+# Months are bucketed and summed in SQL; contractors are paged so each rerun
+# only fetches and draws one page of heatmap rows.
+HEATMAP_PAGE_SIZE = 50
+
+@st.cache_data(max_entries=32)
+def load_monthly_hours(version, page):
+    with engine.connect() as conn:
+        return monthly_hours(conn, limit=HEATMAP_PAGE_SIZE, offset=page * HEATMAP_PAGE_SIZE)
+
+@st.cache_data(max_entries=4)
+def load_contractor_count(version):
+    with engine.connect() as conn:
+        return contractor_count(conn)
+
+page_count = max(1, -(-load_contractor_count(weekly_version) // HEATMAP_PAGE_SIZE))
+page = st.number_input("Contractor page", min_value=1, max_value=page_count, value=1, step=1) - 1
+heatmap_long = load_monthly_hours(weekly_version, page)
+
+if heatmap_long.empty:
+    st.info("No hours reported yet.")
+else:
+    heatmap_df = heatmap_long.pivot(index="Contractor", columns="Month", values="Hours").fillna(0)
+    st.plotly_chart(px.imshow(
+        heatmap_df,
+        color_continuous_scale="Blues",
+        aspect="auto",
+        labels=dict(x="Month", y="Contractor (Last Name, First Name)", color="Hours"),
+        height=max(300, 24 * len(heatmap_df))
+    ), use_container_width=True)
+    st.caption(f"Page {page + 1} of {page_count}")
 
 # --- Contractor Coverage Check --
 st.subheader("Contractors with Zero Submissions")
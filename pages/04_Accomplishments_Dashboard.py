@@ -1,10 +1,12 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-from sqlalchemy import select, join
 
-from utils.db import engine, employees, accomplishments, workstreams, load_tables
-from utils.helpers import normalize_text
+from utils.db import engine, load_tables
+from utils.catalog import get_filter_options
+from utils.cube import accomplishment_counts
+from utils.datasets import DATASETS
+from utils.versions import read_versions
+from utils.warmer import get_warmer
 
 # ----------------------------
 # Page Setup
@@ -19,51 +21,29 @@ load_tables()
 # ----------------------------
 # Load Data (w/ Join)
 # ----------------------------
-@st.cache_data(ttl=600)
-def load_accomplishments():
-    j = join(
-        accomplishments,
-        employees, accomplishments.c.employeeid == employees.c.employeeid
-    ).join(
-        workstreams, accomplishments.c.workstreamid == workstreams.c.workstreamid
-    )
-
-    stmt = select(
-        accomplishments.c.daterange,
-        accomplishments.c.description,
-        employees.c.name.label("Contractor"),
-        employees.c.vendorname.label("Vendor"),
-        employees.c.laborcategory.label("Labor Category"),
-        workstreams.c.name.label("Workstream")
-    ).select_from(j)
-
-    with engine.connect() as conn:
-        df = pd.DataFrame(conn.execute(stmt).fetchall(), columns=stmt.columns.keys())
-    return df
-
-df = load_accomplishments()
+# Canonical accomplishments frame (utils/datasets.py), kept warm by the background
+# dataset warmer (utils/warmer.py) and refreshed incrementally after each write.
+# `version` is the data version the frame was built from.
+version, df = get_warmer().get_with_version("accomplishments")
 
 # ----------------------------
 # Input Normalization
 # ----------------------------
-df["Reporting Week"] = pd.to_datetime(df["daterange"], errors="coerce")
-df["Accomplishment"] = df["description"].astype(str).apply(normalize_text)
-df["Contractor"] = df["Contractor"].astype(str).apply(normalize_text)
-df["Workstream"] = df["Workstream"].astype(str).apply(normalize_text)
+# Accomplishment, contractor, and workstream text is stored in canonical form at
+# ingest (backfilled by utils/migrations/canonical_text.py), and Reporting Week is typed
+# from the DATE column in the canonical frame (utils/datasets.py), so it is used as loaded.
 
 # ----------------------------
 # Sidebar Filters
 # ----------------------------
 st.sidebar.header("Filter Accomplishments")
 
-week_options = df["Reporting Week"].dropna().dt.strftime("%Y-%m-%d").sort_values().unique()
-selected_weeks = st.sidebar.multiselect("Reporting Week", week_options)
+# Option lists come from cached DISTINCT queries (utils/catalog.py), not from the loaded rows
+options = get_filter_options("accomplishments")
 
-contractor_options = df["Contractor"].dropna().sort_values().unique()
-selected_contractors = st.sidebar.multiselect("Contractor", contractor_options)
-
-workstream_options = df["Workstream"].dropna().sort_values().unique()
-selected_workstreams = st.sidebar.multiselect("Workstream", workstream_options)
+selected_weeks = st.sidebar.multiselect("Reporting Week", options["weeks"])
+selected_contractors = st.sidebar.multiselect("Contractor", options["contractors"])
+selected_workstreams = st.sidebar.multiselect("Workstream", options["workstreams"])
 
 search_keyword = st.sidebar.text_input("Search Keyword (in accomplishments)")
 
@@ -85,6 +65,30 @@ if selected_workstreams:
 if search_keyword:
     filtered_df = filtered_df[filtered_df["Accomplishment"].str.lower().str.contains(search_keyword.lower())]
 
+# Bar chart counts come from the accomplishment cube (utils/cube.py) when it holds the
+# same data version as the frame, so charts and metrics always agree. While the warmer
+# is still rebuilding the frame after a write, and for keyword searches (which have no
+# rollup), the filtered rows are counted instead.
+cube_matches_frame = read_versions(engine, *DATASETS["accomplishments"].tables) == version
+
+@st.cache_data(max_entries=32)
+def load_accomplishment_counts(version, by, weeks=(), contractors=(), workstreams=()):
+    with engine.connect() as conn:
+        return accomplishment_counts(conn, by, weeks, contractors, workstreams)
+
+def counts_by(by, column):
+    if search_keyword or not cube_matches_frame:
+        # Categorical columns also count names filtered out; keep only the ones present
+        counts = filtered_df[column].value_counts()
+        return counts[counts > 0]
+    return load_accomplishment_counts(
+        version,
+        by,
+        tuple(sorted(selected_weeks)),
+        tuple(sorted(selected_contractors)),
+        tuple(sorted(selected_workstreams))
+    )
+
 # ----------------------------
 # Top-Level Metrics
 # ----------------------------
@@ -99,12 +103,12 @@ v1, v2 = st.columns(2)
 
 with v1:
     st.subheader("Accomplishments by Workstream")
-    workstream_counts = filtered_df["Workstream"].value_counts()
+    workstream_counts = counts_by("workstream", "Workstream")
     st.bar_chart(workstream_counts)
 
 with v2:
     st.subheader("Top Contractors by Accomplishment Count")
-    contractor_counts = filtered_df["Contractor"].value_counts()
+    contractor_counts = counts_by("contractor", "Contractor")
     st.bar_chart(contractor_counts)
 
 # ----------------------------
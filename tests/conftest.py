@@ -0,0 +1,25 @@
+# tests/conftest.py
+import os
+
+import pytest
+from sqlalchemy import create_engine
+
+from utils import schema
+
+# Without a configured database, run the suite against an in-memory SQLite
+# database bootstrapped from utils/schema.py (see utils/db.get_engine).
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+
+@pytest.fixture
+def engine():
+    """Fresh in-memory SQLite database with the reporting schema (utils/schema.py)."""
+    engine = create_engine("sqlite://")
+    schema.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def empty_engine():
+    """Fresh in-memory SQLite database with no tables, for tests that model older or partial schemas."""
+    return create_engine("sqlite://")
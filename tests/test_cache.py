@@ -0,0 +1,81 @@
+# tests/test_cache.py
+import os
+import pandas as pd
+from utils.cache import FrameCache, frame_nbytes
+
+def make_frame(n, label="x"):
+    return pd.DataFrame({"Vendor Name": [f"{label}{i}" for i in range(n)], "Hours": [1.5] * n})
+
+# -------------------------------
+# In-memory tier
+# -------------------------------
+def test_hit_miss_and_version_replacement():
+    cache = FrameCache(max_bytes=10 ** 7, spill_dir=None)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return make_frame(10)
+
+    cache.get_or_load(("weekly", ()), 1, loader)
+    cache.get_or_load(("weekly", ()), 1, loader)
+    cache.get_or_load(("weekly", ()), 2, loader)   # new data version replaces the entry
+
+    stats = cache.stats()
+    assert len(loads) == 2
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert stats["memory_entries"] == 1
+
+def test_lru_evicts_by_bytes():
+    frame = make_frame(100)
+    cache = FrameCache(max_bytes=int(frame_nbytes(frame) * 3.5), spill_dir=None)
+    for name in ("a", "b", "c"):
+        cache.put(name, 1, make_frame(100))
+    cache.get("a", 1)                 # "a" becomes most recently used
+    cache.put("d", 1, make_frame(100))
+
+    assert cache.get("b", 1) is None  # least recently used went first
+    assert cache.get("a", 1) is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["memory_bytes"] <= cache.max_bytes
+
+def test_returned_frames_do_not_alter_cache():
+    cache = FrameCache(spill_dir=None)
+    df = cache.get_or_load("k", 1, lambda: make_frame(3))
+    df["Hours"] = 0.0
+    assert cache.get("k", 1)["Hours"].tolist() == [1.5] * 3
+
+# -------------------------------
+# Disk spill tier
+# -------------------------------
+def test_evicted_frames_spill_to_parquet_and_promote_back(tmp_path):
+    frame = make_frame(100)
+    cache = FrameCache(max_bytes=int(frame_nbytes(frame) * 1.5), spill_dir=str(tmp_path))
+    cache.put("a", 1, make_frame(100, "a"))
+    cache.put("b", 1, make_frame(100, "b"))   # evicts "a" to disk
+
+    stats = cache.stats()
+    assert (stats["spills"], stats["disk_entries"]) == (1, 1)
+    assert len(os.listdir(cache.spill_dir)) == 1
+
+    restored = cache.get("a", 1)
+    pd.testing.assert_frame_equal(restored, make_frame(100, "a"))
+    assert cache.stats()["disk_hits"] == 1
+
+def test_stale_spill_files_are_removed(tmp_path):
+    frame = make_frame(100)
+    cache = FrameCache(max_bytes=int(frame_nbytes(frame) * 1.5), spill_dir=str(tmp_path))
+    cache.put("a", 1, make_frame(100))
+    cache.put("b", 1, make_frame(100))   # "a" v1 spilled
+    assert cache.get("a", 2) is None     # newer version: spill file discarded
+    assert os.listdir(cache.spill_dir) == []
+
+def test_disk_tier_is_bounded(tmp_path):
+    frame = make_frame(100)
+    cache = FrameCache(max_bytes=int(frame_nbytes(frame) * 1.5), spill_dir=str(tmp_path), max_disk_bytes=1)
+    for name in ("a", "b", "c"):
+        cache.put(name, 1, make_frame(100))
+    stats = cache.stats()
+    assert stats["disk_entries"] == 0
+    assert stats["disk_evictions"] == 2
@@ -0,0 +1,62 @@
+# tests/test_catalog.py
+from datetime import date
+from sqlalchemy import insert
+from utils import catalog, schema, versions
+
+def seed_catalog_db(engine, monkeypatch):
+    with engine.begin() as conn:
+        conn.execute(insert(schema.employees), [
+            {"employeeid": 1, "name": "Doe, Jane", "vendorname": "Acme", "uniquekey": "k1"},
+            {"employeeid": 2, "name": "Smith, John", "vendorname": "Globex", "uniquekey": "k2"},
+        ])
+        conn.execute(insert(schema.workstreams), [
+            {"workstreamid": 1, "name": "Data Ops"},
+            {"workstreamid": 2, "name": "Unused"},
+        ])
+        conn.execute(insert(schema.weekly_reports), [
+            {"employeeid": 1, "weekstartdate": date(2025, 7, 14), "workproducttitle": "A"},
+            {"employeeid": 1, "weekstartdate": date(2025, 7, 7), "workproducttitle": "B"},
+        ])
+        conn.execute(insert(schema.accomplishments), [
+            {"employeeid": 2, "workstreamid": 1, "weekstartdate": date(2025, 7, 7), "description": "Shipped"},
+        ])
+    monkeypatch.setattr(catalog, "engine", engine)
+    catalog._load_options.clear()
+
+# -------------------------------
+# get_filter_options
+# -------------------------------
+def test_weekly_report_options(engine, monkeypatch):
+    seed_catalog_db(engine, monkeypatch)
+    options = catalog.get_filter_options("weekly_reports")
+    assert options == {
+        "weeks": ["2025-07-07", "2025-07-14"],
+        "vendors": ["Acme"],
+        "contractors": ["Doe, Jane"],
+    }
+
+def test_accomplishment_options(engine, monkeypatch):
+    seed_catalog_db(engine, monkeypatch)
+    options = catalog.get_filter_options("accomplishments")
+    assert options == {
+        "weeks": ["2025-07-07"],
+        "contractors": ["Smith, John"],
+        "workstreams": ["Data Ops"],
+    }
+
+def test_options_refresh_when_data_version_changes(engine, monkeypatch):
+    seed_catalog_db(engine, monkeypatch)
+    assert catalog.get_filter_options("weekly_reports")["vendors"] == ["Acme"]
+
+    with engine.begin() as conn:
+        conn.execute(insert(schema.weekly_reports), [
+            {"employeeid": 2, "weekstartdate": date(2025, 7, 21), "workproducttitle": "C"},
+        ])
+    # Unversioned writes are not seen until the version is bumped
+    assert catalog.get_filter_options("weekly_reports")["vendors"] == ["Acme"]
+
+    with engine.begin() as conn:
+        versions.bump_versions(conn, "weeklyreports")
+    options = catalog.get_filter_options("weekly_reports")
+    assert options["vendors"] == ["Acme", "Globex"]
+    assert options["weeks"][-1] == "2025-07-21"
@@ -0,0 +1,156 @@
+# tests/test_cube.py
+import threading
+from datetime import date
+from sqlalchemy import create_engine, event, insert, select, func
+from utils import cube, schema
+
+WK1, WK2 = date(2025, 7, 7), date(2025, 7, 14)
+
+# -------------------------------
+# Fake reporting database
+# -------------------------------
+def seed_cube_db(engine):
+    with engine.begin() as conn:
+        conn.execute(insert(schema.employees), [
+            {"employeeid": 1, "name": "Doe, Jane", "vendorname": "Acme", "laborcategory": "Analyst", "uniquekey": "k1"},
+            {"employeeid": 2, "name": "Smith, John", "vendorname": "Globex", "laborcategory": "Engineer", "uniquekey": "k2"},
+        ])
+        conn.execute(insert(schema.workstreams), [
+            {"workstreamid": 1, "name": "Data Ops"},
+            {"workstreamid": 2, "name": "Cloud"},
+        ])
+        conn.execute(insert(schema.weekly_reports), [
+            {"employeeid": 1, "contractorname": "Doe, Jane", "weekstartdate": WK1, "workproducttitle": "A",
+             "divisioncommand": "N1", "status": "Completed", "effortpercentage": 50},
+            {"employeeid": 1, "contractorname": "Doe, Jane", "weekstartdate": WK1, "workproducttitle": "A",
+             "divisioncommand": "N1", "status": "Completed", "effortpercentage": 25},
+            {"employeeid": 2, "contractorname": "Smith, John", "weekstartdate": WK2, "workproducttitle": "B",
+             "divisioncommand": "N2", "status": "In Progress", "effortpercentage": 100},
+        ])
+        conn.execute(insert(schema.accomplishments), [
+            {"employeeid": 1, "workstreamid": 1, "weekstartdate": WK1, "description": "One"},
+            {"employeeid": 1, "workstreamid": 1, "weekstartdate": WK1, "description": "Two"},
+            {"employeeid": 2, "workstreamid": 2, "weekstartdate": None, "description": "Undated"},
+        ])
+        cube.rebuild(conn)
+
+def cube_rows(conn, table):
+    return conn.execute(select(table).order_by(*table.c)).fetchall()
+
+# -------------------------------
+# Maintenance
+# -------------------------------
+def test_rebuild_rolls_up_reports_by_dimension(engine):
+    seed_cube_db(engine)
+    c = schema.weekly_fact_cube.c
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(c.weekstartdate, c.vendorname, c.hours, c.effortpercentage, c.reportcount)
+            .order_by(c.weekstartdate)
+        ).fetchall()
+    assert [(r[0], r[1], float(r[2]), float(r[3]), r[4]) for r in rows] == [
+        (WK1, "Acme", 30.0, 75.0, 2),
+        (WK2, "Globex", 40.0, 100.0, 1),
+    ]
+
+def test_refresh_weekly_cube_only_touches_given_weeks(engine):
+    seed_cube_db(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(schema.weekly_reports), [
+            {"employeeid": 2, "contractorname": "Smith, John", "weekstartdate": WK1, "workproducttitle": "C",
+             "effortpercentage": 10},
+        ])
+        # Stale row in an untouched week survives the refresh
+        conn.execute(schema.weekly_fact_cube.update()
+                     .where(schema.weekly_fact_cube.c.weekstartdate == WK2)
+                     .values(reportcount=99))
+        written = cube.refresh_weekly_cube(conn, [WK1])
+
+    c = schema.weekly_fact_cube.c
+    with engine.connect() as conn:
+        counts = dict(conn.execute(
+            select(c.weekstartdate, func.sum(c.reportcount)).group_by(c.weekstartdate)
+        ).fetchall())
+    assert written == 2
+    assert counts == {WK1: 3, WK2: 99}
+
+def test_refresh_locks_cube_version_before_deleting(engine):
+    seed_cube_db(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2].split()[0:3]))
+    with engine.begin() as conn:
+        cube.refresh_weekly_cube(conn, [WK1])
+    assert statements.index(["UPDATE", "dataversions", "SET"]) < statements.index(["DELETE", "FROM", "weeklyfactcube"])
+
+def test_concurrent_refreshes_of_one_week_do_not_double_count(tmp_path):
+    # Two connections must see one database, so this test needs a file rather than the in-memory fixture
+    engine = create_engine(f"sqlite:///{tmp_path / 'cube.db'}")
+    schema.create_all(engine)
+    seed_cube_db(engine)
+    report = {"employeeid": 2, "contractorname": "Smith, John", "weekstartdate": WK1, "workproducttitle": "C",
+              "effortpercentage": 10}
+
+    def second_writer():
+        with engine.begin() as conn:
+            conn.execute(insert(schema.weekly_reports), [report])
+            cube.refresh_weekly_cube(conn, [WK1])
+
+    with engine.begin() as conn:
+        conn.execute(insert(schema.weekly_reports), [report])
+        cube.refresh_weekly_cube(conn, [WK1])
+        other = threading.Thread(target=second_writer)
+        other.start()
+        other.join(timeout=0.5)
+        # The second writer waits until this transaction commits
+        assert other.is_alive()
+    other.join()
+
+    c = schema.weekly_fact_cube.c
+    with engine.connect() as conn:
+        total = conn.execute(select(func.sum(c.reportcount)).where(c.weekstartdate == WK1)).scalar()
+    assert total == 4
+
+def test_refresh_accomplishment_cube_handles_undated_rows(engine):
+    seed_cube_db(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(schema.accomplishments), [
+            {"employeeid": 2, "workstreamid": 2, "weekstartdate": None, "description": "Also undated"},
+        ])
+        cube.refresh_accomplishment_cube(conn, [None])
+        rows = cube_rows(conn, schema.accomplishment_cube)
+    assert rows[0] == (None, "Cloud", "Smith, John", 2)
+    assert rows[1] == (WK1, "Data Ops", "Doe, Jane", 2)
+
+def test_work_products_roll_up_apart_from_the_fact_cube(engine):
+    seed_cube_db(engine)
+    with engine.connect() as conn:
+        products = cube_rows(conn, schema.work_product_cube)
+        fact_rows = conn.execute(select(func.count()).select_from(schema.weekly_fact_cube)).scalar()
+    assert [(r[0], r[1], float(r[2]), r[3]) for r in products] == [(WK1, "A", 30.0, 2), (WK2, "B", 40.0, 1)]
+    assert "workproducttitle" not in schema.weekly_fact_cube.c
+    assert fact_rows == 2
+
+def test_cube_contractor_names_come_from_employees(engine):
+    seed_cube_db(engine)
+    with engine.begin() as conn:
+        # A report typed with a different spelling than the employee record
+        conn.execute(insert(schema.weekly_reports), [
+            {"employeeid": 2, "contractorname": "smith john", "weekstartdate": WK2, "workproducttitle": "B",
+             "divisioncommand": "N2", "status": "In Progress", "effortpercentage": 50},
+        ])
+        cube.refresh_weekly_cube(conn, [WK2])
+    c = schema.weekly_fact_cube.c
+    with engine.connect() as conn:
+        rows = conn.execute(select(c.contractorname, c.reportcount).where(c.weekstartdate == WK2)).fetchall()
+    assert rows == [("Smith, John", 2)]
+
+# -------------------------------
+# Dashboard queries
+# -------------------------------
+def test_accomplishment_counts(engine):
+    seed_cube_db(engine)
+    with engine.connect() as conn:
+        by_workstream = cube.accomplishment_counts(conn, "workstream")
+        by_contractor = cube.accomplishment_counts(conn, "contractor", weeks=["2025-07-07"])
+    assert by_workstream.to_dict() == {"Data Ops": 2, "Cloud": 1}
+    assert by_contractor.to_dict() == {"Doe, Jane": 2}
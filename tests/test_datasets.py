@@ -0,0 +1,71 @@
+# tests/test_datasets.py
+from datetime import date, datetime
+from sqlalchemy import event, insert
+from utils import datasets, schema, snapshots
+
+# -------------------------------
+# Fake reporting database
+# -------------------------------
+def seed_db(engine):
+    wk1, wk2 = date(2025, 7, 7), date(2025, 7, 14)
+    created = datetime(2025, 7, 14, 9, 0)
+    with engine.begin() as conn:
+        conn.execute(insert(schema.employees), [
+            {"employeeid": 1, "name": "Doe, Jane", "vendorname": "Acme", "laborcategory": "Analyst", "uniquekey": "k1"},
+            {"employeeid": 2, "name": "Smith, John", "vendorname": "Globex", "laborcategory": "Engineer", "uniquekey": "k2"},
+        ])
+        conn.execute(insert(schema.weekly_reports), [
+            {"reportid": 1, "employeeid": 1, "weekstartdate": wk1, "workproducttitle": "A",
+             "effortpercentage": 50, "created_at": created},
+            {"reportid": 2, "employeeid": 2, "weekstartdate": wk2, "workproducttitle": "B",
+             "effortpercentage": None, "created_at": created},
+        ])
+    snapshots.create_snapshot(engine)
+
+def load_canonical(engine):
+    seed_db(engine)
+    with engine.connect() as conn:
+        datasets._weekly_frame.refresh(conn, full=True)
+    return datasets._weekly_frame.frame
+
+# -------------------------------
+# Canonical weekly report frame
+# -------------------------------
+def test_canonical_frame_is_typed_once_at_fetch(engine):
+    df = load_canonical(engine)
+    assert list(df.columns) == list(datasets.WEEKLY_COLUMNS) + ["Hours"]
+    assert str(df["Reporting Week"].dtype).startswith("datetime64")
+    assert df["Level of Effort (%)"].tolist() == [50.0, 0.0]
+    assert df["Hours"].tolist() == [20.0, 0.0]
+    assert df["Contractor (Last Name, First Name)"].tolist() == ["Doe, Jane", "Smith, John"]
+    for col in datasets.WEEKLY_CATEGORIES:
+        assert df[col].dtype == "category"
+
+def test_hr_view_derives_from_canonical_frame(engine):
+    hr = datasets.hr_view(load_canonical(engine))
+    assert list(hr.columns) == datasets.HR_COLUMNS
+    assert hr["Labor Category"].tolist() == ["Analyst", "Engineer"]
+
+# -------------------------------
+# Filtered weekly report query
+# -------------------------------
+def test_query_weekly_reports_filters_in_sql(engine):
+    seed_db(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    with engine.connect() as conn:
+        filtered = datasets.query_weekly_reports(conn, weeks=("2025-07-14",), vendors=("Globex",))
+        everything = datasets.query_weekly_reports(conn)
+    assert "WHERE" in statements[0] and "WHERE" not in statements[1]
+    assert filtered["Work Product Title"].tolist() == ["B"]
+    assert everything["Work Product Title"].tolist() == ["A", "B"]
+
+def test_query_weekly_reports_is_typed_like_the_canonical_frame(engine):
+    seed_db(engine)
+    with engine.connect() as conn:
+        df = datasets.query_weekly_reports(conn, contractors=("Doe, Jane",))
+    assert list(df.columns) == list(datasets.WEEKLY_COLUMNS) + ["Hours"]
+    assert str(df["Reporting Week"].dtype).startswith("datetime64")
+    assert df["Hours"].tolist() == [20.0]
+    for col in datasets.WEEKLY_CATEGORIES:
+        assert df[col].dtype == "category"
@@ -0,0 +1,74 @@
+# tests/test_fetch.py
+from datetime import date, datetime
+import pandas as pd
+from sqlalchemy import insert, select, func, text
+from utils import schema
+from utils.fetch import fetch_frame
+
+def seed_db(engine):
+    with engine.begin() as conn:
+        conn.execute(insert(schema.employees), [{"employeeid": 1, "name": "Doe, Jane", "uniquekey": "k1"}])
+        conn.execute(insert(schema.weekly_reports), [
+            {"employeeid": 1, "weekstartdate": date(2025, 7, 7), "datecompleted": date(2025, 7, 9), "workproducttitle": "A", "status": "Completed", "effortpercentage": 12.5},
+            {"employeeid": 1, "weekstartdate": date(2025, 7, 7), "datecompleted": None, "workproducttitle": "B", "status": "Completed", "effortpercentage": None},
+        ])
+
+# -------------------------------
+# Typed columns
+# -------------------------------
+def test_core_select_columns_are_typed_from_the_statement(engine):
+    seed_db(engine)
+    wr = schema.weekly_reports
+    stmt = select(wr.c.datecompleted, wr.c.effortpercentage, wr.c.status, wr.c.employeeid).order_by(wr.c.reportid)
+    with engine.connect() as conn:
+        df = fetch_frame(conn, stmt, categories=["status"])
+
+    assert df["effortpercentage"].dtype == "float64"          # DECIMAL, not object Decimals
+    assert df["effortpercentage"].isna().tolist() == [False, True]
+    assert str(df["datecompleted"].dtype).startswith("datetime64")
+    assert df["datecompleted"].isna().tolist() == [False, True]
+    assert df["status"].dtype == "category"
+    assert df["employeeid"].dtype == "int64"
+
+def test_untyped_expressions_and_text_queries_are_inferred(engine):
+    seed_db(engine)
+    wr = schema.weekly_reports
+    with engine.connect() as conn:
+        rounded = fetch_frame(conn, select(func.round(wr.c.effortpercentage * 0.4, 2)))
+        raw = fetch_frame(conn, text("SELECT effortpercentage FROM weeklyreports"))
+    assert rounded.iloc[:, 0].dtype == "float64"
+    assert raw["effortpercentage"].dtype == "float64"
+
+def test_empty_results_keep_typed_columns(engine):
+    wr = schema.weekly_reports
+    with engine.connect() as conn:
+        df = fetch_frame(conn, select(wr.c.weekstartdate, wr.c.effortpercentage))
+    assert df.empty
+    assert str(df["weekstartdate"].dtype).startswith("datetime64")
+    assert df["effortpercentage"].dtype == "float64"
+
+# -------------------------------
+# Streaming
+# -------------------------------
+def test_rows_stream_in_chunks_into_the_same_columns(engine):
+    with engine.begin() as conn:
+        conn.execute(insert(schema.employees), [{"employeeid": 1, "name": "Doe, Jane", "uniquekey": "k1"}])
+        conn.execute(insert(schema.weekly_reports), [
+            {"reportid": i, "employeeid": 1, "weekstartdate": date(2025, 7, 7 + i), "workproducttitle": f"WP{i % 3}",
+             "status": None if i == 4 else "Completed", "effortpercentage": i * 10}
+            for i in range(1, 8)
+        ])
+
+    wr = schema.weekly_reports
+    stmt = select(wr.c.reportid, wr.c.weekstartdate, wr.c.effortpercentage, wr.c.workproducttitle, wr.c.status)
+    with engine.connect() as conn:
+        streamed = fetch_frame(conn, stmt.order_by(wr.c.reportid), categories=["workproducttitle"], chunk_rows=2)
+        whole = fetch_frame(conn, stmt.order_by(wr.c.reportid), categories=["workproducttitle"])
+
+    assert len(streamed) == 7
+    assert streamed["reportid"].tolist() == list(range(1, 8))
+    assert streamed["effortpercentage"].tolist() == [i * 10.0 for i in range(1, 8)]
+    assert streamed["weekstartdate"].iloc[-1] == datetime(2025, 7, 14)
+    assert streamed["workproducttitle"].cat.categories.tolist() == ["WP1", "WP2", "WP0"]   # first-seen order
+    assert streamed["status"].isna().tolist() == [i == 4 for i in range(1, 8)]
+    pd.testing.assert_frame_equal(streamed, whole)
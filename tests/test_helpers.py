@@ -23,6 +23,27 @@ def test_generate_employee_key_is_deterministic():
     assert isinstance(k1, str)
     assert len(k1) == 64  # SHA-256 hex length
 
+# -------------------------------
+# normalize_text_series / generate_employee_keys
+# -------------------------------
+def test_normalize_text_series_matches_scalar():
+    values = [" john   doe ", "", None, "  MULTI   line\nName  ", float("nan"), 42, "o'neil  mc\tdonald"]
+    result = helpers.normalize_text_series(pd.Series(values, dtype=object))
+    assert result.tolist() == [helpers.normalize_text(v) for v in values]
+
+def test_normalize_text_series_without_strings():
+    result = helpers.normalize_text_series(pd.Series([None, None]))
+    assert result.tolist() == ["", ""]
+
+def test_generate_employee_keys_matches_scalar():
+    names = pd.Series(["John Doe", " John  Doe ", "Jane Smith"])
+    vendors = pd.Series(["Vendor A", "  Vendor A ", None])
+    keys = helpers.generate_employee_keys(names, vendors)
+    assert keys.tolist() == [
+        helpers.generate_employee_key(n, v) for n, v in zip(names, vendors)
+    ]
+    assert keys.iloc[0] == keys.iloc[1]
+
 # -------------------------------
 # generate_public_id
 # -------------------------------
@@ -95,7 +116,8 @@ def test_get_or_create_employee_insert_new():
     mock_conn.execute.side_effect = [
         MagicMock(mappings=lambda: MagicMock(fetchone=lambda: None)),  # SELECT returns nothing
         MagicMock(scalar_one=lambda: 5),                                # INSERT returns ID
-        None                                                            # UPDATE publicid
+        None,                                                           # UPDATE publicid
+        MagicMock(rowcount=1),                                          # UPDATE dataversions
     ]
 
     result = helpers.get_or_create_employee(
@@ -122,7 +144,8 @@ def test_get_or_create_workstream_insert_new():
 
     mock_conn.execute.side_effect = [
         MagicMock(scalar_one_or_none=lambda: None),  # SELECT returns nothing
-        MagicMock(scalar_one=lambda: 7)              # INSERT returns new ID
+        MagicMock(scalar_one=lambda: 7),             # INSERT returns new ID
+        MagicMock(rowcount=1),                       # UPDATE dataversions
     ]
 
     result = helpers.get_or_create_workstream(mock_conn, "Innovation Lab", workstreams_table=fake_ws)
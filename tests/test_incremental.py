@@ -0,0 +1,161 @@
+# tests/test_incremental.py
+from datetime import date, datetime, timedelta
+import pandas as pd
+from sqlalchemy import insert, update, select, func, join
+from utils import schema, versions
+from utils.incremental import IncrementalFrame
+
+T0 = datetime(2025, 7, 7, 9, 0)
+
+def seed_db(engine):
+    with engine.begin() as conn:
+        conn.execute(insert(schema.employees), [{"employeeid": 1, "name": "Doe, Jane", "uniquekey": "k1"}])
+        conn.execute(insert(schema.weekly_reports), [
+            {"reportid": i, "employeeid": 1, "weekstartdate": date(2025, 7, 7),
+             "workproducttitle": f"WP{i}", "created_at": T0 - timedelta(minutes=3 - i)}
+            for i in range(1, 4)
+        ])
+
+def load(frame, engine):
+    with engine.connect() as conn:
+        frame.refresh(conn)
+    return frame.frame
+
+def make_frame(overlap=timedelta(0)):
+    wr = schema.weekly_reports
+    return IncrementalFrame(
+        select(wr.c.workproducttitle.label("Work Product Title"), wr.c.status.label("Status")),
+        key=wr.c.reportid,
+        timestamp=func.coalesce(wr.c.updated_at, wr.c.created_at),
+        overlap=overlap,
+    )
+
+# -------------------------------
+# IncrementalFrame
+# -------------------------------
+def test_first_load_fetches_everything(engine):
+    seed_db(engine)
+    frame = make_frame()
+    df = load(frame, engine)
+    assert frame.last_fetched == 3
+    assert df.index.tolist() == [1, 2, 3]
+    assert list(df.columns) == ["Work Product Title", "Status"]
+    assert frame.watermark == T0
+
+def test_refresh_fetches_only_rows_past_watermark_and_upserts(engine):
+    seed_db(engine)
+    frame = make_frame()
+    load(frame, engine)
+
+    later = T0 + timedelta(hours=1)
+    with engine.begin() as conn:
+        conn.execute(insert(schema.weekly_reports), [
+            {"reportid": 4, "employeeid": 1, "weekstartdate": date(2025, 7, 14),
+             "workproducttitle": "WP4", "created_at": later},
+        ])
+        conn.execute(update(schema.weekly_reports).where(schema.weekly_reports.c.reportid == 2)
+                     .values(status="Completed", updated_at=later))
+
+    df = load(frame, engine)
+    # The new row, the updated row, and the row stamped exactly at the old mark
+    assert frame.last_fetched == 3
+    assert df.index.tolist() == [1, 2, 3, 4]
+    assert df.loc[2, "Status"] == "Completed"
+    assert frame.watermark == later
+
+def test_overlap_rereads_are_deduplicated(engine):
+    seed_db(engine)
+    frame = make_frame(overlap=timedelta(days=1))
+    load(frame, engine)
+    df = load(frame, engine)
+    assert frame.last_fetched == 3
+    assert df.index.tolist() == [1, 2, 3]
+
+# -------------------------------
+# Data version checks
+# -------------------------------
+def make_joined_frame():
+    wr, e = schema.weekly_reports, schema.employees
+    return IncrementalFrame(
+        select(wr.c.workproducttitle.label("Work Product Title"), e.c.laborcategory.label("Labor Category"))
+        .select_from(join(wr, e, wr.c.employeeid == e.c.employeeid)),
+        key=wr.c.reportid,
+        timestamp=func.coalesce(wr.c.updated_at, wr.c.created_at),
+        overlap=timedelta(0),
+        tables=("weeklyreports", "employees"),
+        reload_on=("employees",),
+    )
+
+def test_change_to_untimestamped_dependency_reloads_in_full(engine):
+    seed_db(engine)
+    frame = make_joined_frame()
+    with engine.connect() as conn:
+        frame.refresh(conn)
+    with engine.begin() as conn:
+        conn.execute(update(schema.employees).values(laborcategory="Analyst"))
+        versions.bump_versions(conn, "employees")
+    with engine.connect() as conn:
+        assert frame.refresh(conn) == 3
+    assert frame.frame["Labor Category"].tolist() == ["Analyst"] * 3
+
+def test_version_change_without_newer_rows_reloads_in_full(engine):
+    seed_db(engine)
+    frame = make_joined_frame()
+    with engine.connect() as conn:
+        frame.refresh(conn)
+    # e.g. a migration rewriting rows in place, or a delete
+    with engine.begin() as conn:
+        conn.execute(update(schema.weekly_reports).where(schema.weekly_reports.c.reportid == 1)
+                     .values(workproducttitle="Renamed"))
+        conn.execute(schema.weekly_reports.delete().where(schema.weekly_reports.c.reportid == 3))
+        versions.bump_versions(conn, "weeklyreports")
+    with engine.connect() as conn:
+        assert frame.refresh(conn) == 2
+    assert frame.frame["Work Product Title"].tolist() == ["Renamed", "WP2"]
+
+def test_stamped_changes_still_refresh_incrementally(engine):
+    seed_db(engine)
+    frame = make_joined_frame()
+    with engine.connect() as conn:
+        frame.refresh(conn)
+    with engine.begin() as conn:
+        conn.execute(insert(schema.weekly_reports), [
+            {"reportid": 4, "employeeid": 1, "weekstartdate": date(2025, 7, 14),
+             "workproducttitle": "WP4", "created_at": T0 + timedelta(hours=1)},
+        ])
+        versions.bump_versions(conn, "weeklyreports")
+    with engine.connect() as conn:
+        # The new row and the row stamped exactly at the old mark, not the full history
+        assert frame.refresh(conn) == 2
+    assert frame.frame.index.tolist() == [1, 2, 3, 4]
+
+# -------------------------------
+# Categorical columns
+# -------------------------------
+def test_categorical_columns_share_one_growing_dictionary(engine):
+    seed_db(engine)
+    wr = schema.weekly_reports
+    frame = IncrementalFrame(
+        select(wr.c.workproducttitle.label("Work Product Title"), wr.c.status.label("Status")),
+        key=wr.c.reportid,
+        timestamp=wr.c.created_at,
+        overlap=timedelta(0),
+        categories=["Work Product Title"],
+    )
+    load(frame, engine)
+    codes_before = frame.frame["Work Product Title"].cat.codes.tolist()
+
+    with engine.begin() as conn:
+        conn.execute(insert(schema.weekly_reports), [
+            {"reportid": 4, "employeeid": 1, "weekstartdate": date(2025, 7, 14),
+             "workproducttitle": "WP9", "created_at": T0 + timedelta(hours=1)},
+            {"reportid": 5, "employeeid": 1, "weekstartdate": date(2025, 7, 14),
+             "workproducttitle": "WP1", "created_at": T0 + timedelta(hours=1)},
+        ])
+    df = load(frame, engine)
+
+    titles = df["Work Product Title"]
+    assert isinstance(titles.dtype, pd.CategoricalDtype)
+    assert titles.cat.categories.tolist() == ["WP1", "WP2", "WP3", "WP9"]   # appended, not re-sorted
+    assert titles.cat.codes.tolist()[:3] == codes_before                    # existing codes unchanged
+    assert titles.tolist() == ["WP1", "WP2", "WP3", "WP9", "WP1"]
@@ -0,0 +1,201 @@
+# tests/test_ingest.py
+from datetime import date
+import pandas as pd
+from sqlalchemy import (
+    inspect, select, func,
+    Table, Column, Integer, String, Text, Date, DateTime, Numeric, MetaData
+)
+from sqlalchemy.dialects import mssql, postgresql
+from sqlalchemy.schema import CreateTable
+from utils import ingest, schema, snapshots, versions
+from utils.cube import refresh_weekly_cube
+from utils.helpers import generate_employee_key
+
+# -------------------------------
+# Fake Tables (in-memory SQLite)
+# -------------------------------
+def make_fake_schema(engine):
+    metadata = MetaData()
+    emp = Table("employees", metadata,
+        Column("employeeid", Integer, primary_key=True),
+        Column("name", String(255)),
+        Column("vendorname", String(255)),
+        Column("laborcategory", String(255)),
+        Column("publicid", Text, unique=True),
+        Column("uniquekey", Text, unique=True),
+    )
+    wr = Table("weeklyreports", metadata,
+        Column("reportid", Integer, primary_key=True),
+        Column("employeeid", Integer),
+        Column("weekstartdate", Date),
+        Column("divisioncommand", String(255)),
+        Column("workproducttitle", String(255)),
+        Column("contributiondescription", Text),
+        Column("status", String(100)),
+        Column("plannedorunplanned", String(50)),
+        Column("datecompleted", Date),
+        Column("distinctnfr", String(255)),
+        Column("distinctcap", String(255)),
+        Column("effortpercentage", Numeric(5, 2)),
+        Column("contractorname", String(255)),
+        Column("govttaname", String(255)),
+        Column("created_at", DateTime),
+        Column("updated_at", DateTime),
+        Column("source_file", Text),
+        Column("entered_by", Text),
+    )
+    ht = Table("hourstracking", metadata,
+        Column("entryid", Integer, primary_key=True),
+        Column("employeeid", Integer),
+        Column("workstreamid", Integer),
+        Column("reportingweek", Date),
+        Column("hoursworked", Numeric(5, 2)),
+        Column("levelofeffort", Numeric(5, 2)),
+        Column("created_at", DateTime),
+        Column("source_file", Text),
+        Column("entered_by", Text),
+    )
+    schema.weekly_fact_cube.to_metadata(metadata)
+    schema.work_product_cube.to_metadata(metadata)
+    schema.data_versions.to_metadata(metadata)
+    snapshots.snapshot.to_metadata(metadata)
+    metadata.create_all(engine)
+    return emp, wr, ht
+
+def make_submission():
+    df = pd.DataFrame({
+        "contractorname": [" doe,  jane ", "Smith, John", "", "Doe, Jane"],
+        "vendorname": ["acme", "", "Other", "ACME"],
+        "laborcategory": ["analyst", None, "", "analyst"],
+        "weekstartdate": pd.to_datetime(["2025-07-07"] * 4),
+        "datecompleted": [pd.NaT] * 4,
+        "workproducttitle": ["report a", "report b", "report c", "report d"],
+        "status": ["completed", "in progress", "completed", "completed"],
+        "plannedorunplanned": [" Planned", "UNPLANNED", "planned", None],
+        "hoursworked": [40.0, 0.0, 8.0, 10.0],
+    })
+    df["effortpercentage"] = df["hoursworked"] / 40 * 100
+    return df
+
+# -------------------------------
+# prepare_weekly_rows
+# -------------------------------
+def test_prepare_weekly_rows_normalizes_and_skips_blank_contractors():
+    rows = ingest.prepare_weekly_rows(make_submission())
+    assert len(rows) == 3
+    assert rows[0]["contractorname"] == "Doe, Jane"
+    assert rows[0]["plannedorunplanned"] == "planned"
+    assert rows[1]["vendorname"] == "Unknown Vendor"
+    assert rows[1]["laborcategory"] == "Unknown LCAT"
+    assert rows[2]["plannedorunplanned"] == ""
+    assert rows[0]["uniquekey"] == rows[2]["uniquekey"]
+    assert [r["rownum"] for r in rows] == [0, 1, 2]
+
+def test_staging_table_is_session_temporary():
+    pg_ddl = str(CreateTable(ingest._make_staging_table("stage", "postgresql")).compile(dialect=postgresql.dialect()))
+    ms_ddl = str(CreateTable(ingest._make_staging_table("stage", "mssql")).compile(dialect=mssql.dialect()))
+    assert pg_ddl.strip().startswith("CREATE TEMPORARY TABLE stage")
+    assert ms_ddl.strip().startswith("CREATE TABLE [#stage]")
+
+# -------------------------------
+# bulk_ingest_weekly_reports
+# -------------------------------
+def test_bulk_ingest_merges_batch_with_set_based_sql(empty_engine):
+    engine = empty_engine
+    emp, wr, ht = make_fake_schema(engine)
+    rows = ingest.prepare_weekly_rows(make_submission())
+
+    with engine.begin() as conn:
+        counts = ingest.bulk_ingest_weekly_reports(
+            conn, rows, entered_by="tester",
+            employees_table=emp, weekly_reports_table=wr, hours_table=ht
+        )
+
+    assert counts == {"employees": 2, "weekly_reports": 3, "hours": 2}
+    with engine.connect() as conn:
+        public_ids = conn.execute(select(emp.c.publicid).order_by(emp.c.employeeid)).scalars().all()
+        assert public_ids == ["E0001", "E0002"]
+        titles = conn.execute(select(wr.c.workproducttitle).order_by(wr.c.reportid)).scalars().all()
+        assert titles == ["Report A", "Report B", "Report D"]
+        assert conn.execute(select(func.count()).select_from(ht)).scalar() == 2
+        # staging table is dropped once the batch is merged
+        assert sorted(inspect(conn).get_table_names()) == [
+            "dataversions", "employees", "hourstracking", "weeklyfactcube", "weeklyreports",
+            "weeklyreportsnapshot", "workproductcube",
+        ]
+
+def test_bulk_ingest_refreshes_fact_cube_for_batch_weeks(empty_engine):
+    engine = empty_engine
+    emp, wr, ht = make_fake_schema(engine)
+    rows = ingest.prepare_weekly_rows(make_submission())
+    tables = dict(employees_table=emp, weekly_reports_table=wr, hours_table=ht)
+
+    with engine.begin() as conn:
+        ingest.bulk_ingest_weekly_reports(conn, rows, **tables)
+    with engine.begin() as conn:
+        ingest.bulk_ingest_weekly_reports(conn, rows[:1], **tables)
+
+    cube = schema.weekly_fact_cube
+    with engine.connect() as conn:
+        totals = conn.execute(
+            select(func.sum(cube.c.reportcount), func.sum(cube.c.hours))
+        ).one()
+    # 4 reports in total; hours 40 + 0 + 10 from the first batch, 40 from the second
+    assert totals[0] == 4
+    assert float(totals[1]) == 90.0
+
+def test_bulk_ingest_refreshes_earlier_weeks_of_backfilled_employees(empty_engine):
+    engine = empty_engine
+    emp, wr, ht = make_fake_schema(engine)
+    tables = dict(employees_table=emp, weekly_reports_table=wr, hours_table=ht)
+    # An employee recorded without a labor category, with a report in an earlier week
+    with engine.begin() as conn:
+        conn.execute(emp.insert().values(
+            employeeid=1, name="Smith, John", vendorname="Globex", laborcategory=None,
+            uniquekey=generate_employee_key("Smith, John", "Globex")
+        ))
+        conn.execute(wr.insert().values(employeeid=1, weekstartdate=date(2025, 7, 7), effortpercentage=50))
+        refresh_weekly_cube(conn, [date(2025, 7, 7)], weekly_reports_table=wr, employees_table=emp)
+
+    # A later week's batch supplies the labor category
+    later = ingest.prepare_weekly_rows(pd.DataFrame({
+        "contractorname": ["Smith, John"], "vendorname": ["Globex"], "laborcategory": ["Engineer"],
+        "weekstartdate": pd.to_datetime(["2025-07-14"]), "workproducttitle": ["report e"],
+        "hoursworked": [20.0], "effortpercentage": [50.0],
+    }))
+    with engine.begin() as conn:
+        ingest.bulk_ingest_weekly_reports(conn, later, **tables)
+
+    c = schema.weekly_fact_cube.c
+    with engine.connect() as conn:
+        rows = conn.execute(select(c.weekstartdate, c.laborcategory).order_by(c.weekstartdate)).all()
+    assert rows == [(date(2025, 7, 7), "Engineer"), (date(2025, 7, 14), "Engineer")]
+
+def test_bulk_ingest_reuses_existing_employees(empty_engine):
+    engine = empty_engine
+    emp, wr, ht = make_fake_schema(engine)
+    rows = ingest.prepare_weekly_rows(make_submission())
+    tables = dict(employees_table=emp, weekly_reports_table=wr, hours_table=ht)
+
+    with engine.begin() as conn:
+        ingest.bulk_ingest_weekly_reports(conn, rows, **tables)
+    with engine.begin() as conn:
+        counts = ingest.bulk_ingest_weekly_reports(conn, rows[:1], **tables)
+
+    assert counts["employees"] == 0
+    assert counts["weekly_reports"] == 1
+
+    with engine.connect() as conn:
+        # The second batch changed no employee, so their version is left alone
+        assert versions.get_versions(conn, "weeklyreports", "employees", "hourstracking") == (
+            ("employees", 1), ("hourstracking", 2), ("weeklyreports", 2)
+        )
+
+def test_bulk_ingest_empty_batch_is_noop(empty_engine):
+    engine = empty_engine
+    emp, wr, ht = make_fake_schema(engine)
+    with engine.begin() as conn:
+        counts = ingest.bulk_ingest_weekly_reports(
+            conn, [], employees_table=emp, weekly_reports_table=wr, hours_table=ht
+        )
+    assert counts == {"employees": 0, "weekly_reports": 0, "hours": 0}
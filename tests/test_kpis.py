@@ -0,0 +1,110 @@
+# tests/test_kpis.py
+from datetime import date
+import pandas as pd
+from sqlalchemy import insert
+from utils import cube, kpis, schema
+
+# -------------------------------
+# Fake reporting database
+# -------------------------------
+def seed_kpi_db(engine):
+    wk1, wk2 = date(2025, 7, 7), date(2025, 7, 14)
+    with engine.begin() as conn:
+        conn.execute(insert(schema.employees), [
+            {"employeeid": 1, "name": "Doe, Jane", "laborcategory": "Analyst", "uniquekey": "k1"},
+            {"employeeid": 2, "name": "Smith, John", "laborcategory": "Engineer", "uniquekey": "k2"},
+        ])
+        conn.execute(insert(schema.weekly_reports), [
+            {"employeeid": 1, "contractorname": "Doe, Jane", "weekstartdate": wk1, "workproducttitle": "A",
+             "status": "Completed", "plannedorunplanned": "planned", "divisioncommand": "N1", "effortpercentage": 50},
+            {"employeeid": 1, "contractorname": "Doe, Jane", "weekstartdate": wk2, "workproducttitle": "B",
+             "status": "Completed", "plannedorunplanned": "unplanned", "divisioncommand": "N2", "effortpercentage": 25},
+            {"employeeid": 2, "contractorname": "Smith, John", "weekstartdate": wk2, "workproducttitle": "A",
+             "status": "In Progress", "plannedorunplanned": "planned", "divisioncommand": "N1", "effortpercentage": 100},
+            {"employeeid": 2, "contractorname": "Smith, John", "weekstartdate": wk2, "workproducttitle": "C",
+             "status": None, "plannedorunplanned": "unplanned", "divisioncommand": None, "effortpercentage": None},
+        ])
+        cube.rebuild(conn)
+
+# -------------------------------
+# KPI families
+# -------------------------------
+def test_summary_kpis_match_pandas_definitions(engine):
+    seed_kpi_db(engine)
+    with engine.connect() as conn:
+        summary = kpis.summary_kpis(conn)
+    # Hours: 20 + 10 + 40 + 0
+    assert summary["total_hours"] == 70
+    assert summary["avg_hours_per_contractor"] == 35
+    assert summary["unplanned_hours"] == 10
+    assert round(summary["unplanned_pct"], 4) == round(10 / 70 * 100, 4)
+
+def test_summary_kpis_on_empty_table(engine):
+    with engine.connect() as conn:
+        summary = kpis.summary_kpis(conn)
+    assert summary == {"total_hours": 0, "avg_hours_per_contractor": 0,
+                       "unplanned_hours": 0, "unplanned_pct": 0}
+
+def test_grouped_kpis(engine):
+    seed_kpi_db(engine)
+    with engine.connect() as conn:
+        status = kpis.status_counts(conn)
+        completed = kpis.weekly_completed(conn)
+        effort = kpis.effort_by_division(conn)
+        unplanned = kpis.unplanned_hours_by_division(conn)
+        top = kpis.top_work_products(conn, limit=2)
+        labor = kpis.labor_category_counts(conn)
+        active = kpis.active_contractors(conn)
+
+    assert status.values.tolist() == [["Completed", 2], ["In Progress", 1]]
+    assert completed["Reporting Week"].tolist() == list(pd.to_datetime(["2025-07-07", "2025-07-14"]))
+    assert completed["count"].tolist() == [1, 1]
+    assert effort.values.tolist() == [["N2", 25.0], ["N1", 150.0]]
+    assert unplanned.values.tolist() == [["N2", 10.0]]
+    assert top.values.tolist() == [["A", 60.0, 2], ["B", 10.0, 1]]
+    assert sorted(labor.values.tolist()) == [["Analyst", 2], ["Engineer", 2]]
+    assert active == {"Doe, Jane", "Smith, John"}
+
+def test_load_hr_kpis_returns_every_family(engine):
+    seed_kpi_db(engine)
+    with engine.connect() as conn:
+        result = kpis.load_hr_kpis(conn)
+    assert set(result) == {
+        "summary", "status_counts", "weekly_completed", "effort_by_division",
+        "unplanned_by_division", "top_work_products", "labor_category_counts",
+        "active_contractors",
+    }
+
+# -------------------------------
+# Monthly hours heatmap
+# -------------------------------
+def test_monthly_hours_buckets_by_month_in_sql(engine):
+    seed_kpi_db(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(schema.weekly_reports), [
+            {"employeeid": 1, "contractorname": "Doe, Jane", "weekstartdate": date(2025, 8, 4),
+             "workproducttitle": "D", "effortpercentage": 10},
+        ])
+        cube.refresh_weekly_cube(conn, [date(2025, 8, 4)])
+    with engine.connect() as conn:
+        long = kpis.monthly_hours(conn)
+    assert long.values.tolist() == [
+        ["Doe, Jane", "2025-07", 30.0],
+        ["Doe, Jane", "2025-08", 4.0],
+        ["Smith, John", "2025-07", 40.0],
+    ]
+
+def test_monthly_hours_pages_by_contractor(engine):
+    seed_kpi_db(engine)
+    with engine.connect() as conn:
+        assert kpis.contractor_count(conn) == 2
+        first = kpis.monthly_hours(conn, limit=1)
+        second = kpis.monthly_hours(conn, limit=1, offset=1)
+    assert first["Contractor"].unique().tolist() == ["Doe, Jane"]
+    assert second["Contractor"].unique().tolist() == ["Smith, John"]
+
+def test_month_start_compiles_per_dialect():
+    from sqlalchemy.dialects import postgresql, mssql
+    expr = kpis.month_start(schema.weekly_fact_cube.c.weekstartdate)
+    assert "date_trunc('month'" in str(expr.compile(dialect=postgresql.dialect()))
+    assert "DATEFROMPARTS" in str(expr.compile(dialect=mssql.dialect()))
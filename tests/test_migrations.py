@@ -0,0 +1,130 @@
+# tests/test_migrations.py
+from sqlalchemy import inspect, select, insert, text, Table, Column, Integer, String, Date, MetaData
+from utils import versions
+from utils.migrations import canonical_text, accomplishment_dates, indexes
+
+# -------------------------------
+# Fake Tables (in-memory SQLite)
+# -------------------------------
+def make_fake_weekly_reports(engine):
+    metadata = MetaData()
+    table = Table("weeklyreports", metadata,
+        Column("reportid", Integer, primary_key=True),
+        Column("status", String(100)),
+        Column("plannedorunplanned", String(50)),
+        Column("contractorname", String(255)),
+    )
+    metadata.create_all(engine)
+    return table
+
+# -------------------------------
+# canonical_text.upgrade
+# -------------------------------
+def test_canonical_text_backfill_rewrites_only_dirty_rows(empty_engine):
+    engine = empty_engine
+    wr = make_fake_weekly_reports(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(wr), [
+            {"reportid": 1, "status": " in   progress", "plannedorunplanned": "Unplanned ", "contractorname": "doe, jane"},
+            {"reportid": 2, "status": "Completed", "plannedorunplanned": "planned", "contractorname": "Smith, John"},
+            {"reportid": 3, "status": None, "plannedorunplanned": "PLANNED", "contractorname": "Smith, John"},
+        ])
+
+    result = canonical_text.upgrade(engine, chunk_size=2, tables={"weeklyreports": wr})
+    assert result == {"weeklyreports": 2}
+
+    with engine.connect() as conn:
+        rows = conn.execute(select(wr).order_by(wr.c.reportid)).fetchall()
+    assert rows[0] == (1, "In Progress", "unplanned", "Doe, Jane")
+    assert rows[1] == (2, "Completed", "planned", "Smith, John")
+    assert rows[2] == (3, None, "planned", "Smith, John")
+
+    # Rows rewritten in place keep their timestamps, so each changed chunk bumps the version
+    assert versions.read_versions(engine, "weeklyreports") == (("weeklyreports", 2),)
+
+    # Re-running is a no-op
+    assert canonical_text.upgrade(engine, tables={"weeklyreports": wr}) == {"weeklyreports": 0}
+    assert versions.read_versions(engine, "weeklyreports") == (("weeklyreports", 2),)
+
+# -------------------------------
+# accomplishment_dates.upgrade
+# -------------------------------
+def test_accomplishment_dates_adds_and_backfills_column(empty_engine):
+    engine = empty_engine
+    metadata = MetaData()
+    table = Table("accomplishments", metadata,
+        Column("accomplishmentid", Integer, primary_key=True),
+        Column("employeeid", Integer),
+        Column("daterange", String(50)),
+    )
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(table), [
+            {"employeeid": 1, "daterange": "07/15/2025"},
+            {"employeeid": 1, "daterange": "not a date"},
+            {"employeeid": 2, "daterange": None},
+            {"employeeid": 2, "daterange": "12/29/2024"},
+        ])
+
+    result = accomplishment_dates.upgrade(engine, chunk_size=2)
+    assert result == {"column_added": True, "rows_backfilled": 2}
+
+    with engine.connect() as conn:
+        weeks = conn.execute(text(
+            "SELECT weekstartdate FROM accomplishments ORDER BY accomplishmentid"
+        )).scalars().all()
+    assert weeks == ["2025-07-15", None, None, "2024-12-29"]
+
+    index_names = {ix["name"] for ix in inspect(engine).get_indexes("accomplishments")}
+    assert accomplishment_dates.INDEX_NAME in index_names
+
+    assert versions.read_versions(engine, "accomplishments") == (("accomplishments", 2),)
+
+    assert accomplishment_dates.upgrade(engine) == {"column_added": False, "rows_backfilled": 0}
+
+# -------------------------------
+# indexes.create_indexes / verify_indexes
+# -------------------------------
+def test_indexes_are_created_and_used(empty_engine):
+    engine = empty_engine
+    metadata = MetaData()
+    Table("weeklyreports", metadata,
+        Column("reportid", Integer, primary_key=True),
+        Column("employeeid", Integer),
+        Column("weekstartdate", Date),
+    )
+    Table("hourstracking", metadata,
+        Column("entryid", Integer, primary_key=True),
+        Column("employeeid", Integer),
+        Column("reportingweek", Date),
+    )
+    Table("accomplishments", metadata,
+        Column("accomplishmentid", Integer, primary_key=True),
+        Column("employeeid", Integer),
+        Column("workstreamid", Integer),
+        Column("weekstartdate", Date),
+    )
+    metadata.create_all(engine)
+
+    created = indexes.create_indexes(engine)
+    assert set(created.values()) == {"created"}
+    assert len(created) == len(indexes.INDEXES)
+    assert set(indexes.create_indexes(engine).values()) == {"exists"}
+
+    assert all(indexes.verify_indexes(engine).values())
+
+def test_indexes_skip_missing_columns(empty_engine):
+    engine = empty_engine
+    metadata = MetaData()
+    for name in ("weeklyreports", "hourstracking"):
+        Table(name, metadata, Column("id", Integer, primary_key=True))
+    Table("accomplishments", metadata,
+        Column("accomplishmentid", Integer, primary_key=True),
+        Column("employeeid", Integer),
+        Column("workstreamid", Integer),
+    )
+    metadata.create_all(engine)
+
+    created = indexes.create_indexes(engine)
+    assert created[accomplishment_dates.INDEX_NAME] == "skipped"
+    assert created["ix_accomplishments_workstreamid"] == "created"
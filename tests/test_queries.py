@@ -1,10 +1,30 @@
 # tests/test_queries.py
-from utils import queries
-from sqlalchemy import text
+from datetime import date
+from sqlalchemy import insert, text
+from utils import queries, schema
 
-def test_weekly_reports_query_compiles():
-    try:
-        q = text(queries.weekly_reports_with_employees)
-        assert "SELECT" in str(q)
-    except Exception as e:
-        pytest.fail(f"Query did not compile: {e}")
+# -------------------------------
+# Shared in-memory fixture data
+# -------------------------------
+def seed_reporting_db(engine):
+    with engine.begin() as conn:
+        conn.execute(insert(schema.employees), [
+            {"employeeid": 1, "name": "Doe, Jane", "vendorname": "Acme", "laborcategory": "Analyst", "uniquekey": "k1"},
+            {"employeeid": 2, "name": "Smith, John", "vendorname": "Globex", "laborcategory": "Engineer", "uniquekey": "k2"},
+            {"employeeid": 3, "name": "Idle, Ivan", "vendorname": "Initech", "laborcategory": "Engineer", "uniquekey": "k3"},
+        ])
+        conn.execute(insert(schema.weekly_reports), [
+            {"employeeid": 1, "weekstartdate": date(2025, 7, 7), "workproducttitle": "A", "effortpercentage": 50},
+            {"employeeid": 1, "weekstartdate": date(2025, 7, 14), "workproducttitle": "B", "effortpercentage": 100},
+            {"employeeid": 2, "weekstartdate": date(2025, 7, 14), "workproducttitle": "C", "effortpercentage": 25},
+        ])
+
+# -------------------------------
+# Filter option queries
+# -------------------------------
+def test_filter_option_queries_only_list_reporting_employees(engine):
+    seed_reporting_db(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text(queries.weekly_report_vendors)).scalars().all() == ["Acme", "Globex"]
+        assert conn.execute(text(queries.weekly_report_contractors)).scalars().all() == ["Doe, Jane", "Smith, John"]
+        assert len(conn.execute(text(queries.weekly_report_weeks)).scalars().all()) == 2
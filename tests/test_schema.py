@@ -0,0 +1,41 @@
+# tests/test_schema.py
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.schema import CreateTable, CreateIndex
+from sqlalchemy.dialects import postgresql, mssql, sqlite
+from utils import schema
+
+# -------------------------------
+# DDL compiles on every supported dialect
+# -------------------------------
+@pytest.mark.parametrize("dialect", [postgresql.dialect(), mssql.dialect(), sqlite.dialect()])
+def test_schema_ddl_compiles(dialect):
+    for table in schema.metadata.sorted_tables:
+        ddl = str(CreateTable(table).compile(dialect=dialect))
+        assert table.name in ddl
+        for index in table.indexes:
+            assert index.name in str(CreateIndex(index).compile(dialect=dialect))
+
+# -------------------------------
+# create_all
+# -------------------------------
+def test_create_all_builds_tables_and_indexes():
+    engine = create_engine("sqlite://")
+    schema.create_all(engine)
+    schema.create_all(engine)  # idempotent
+
+    inspector = inspect(engine)
+    assert set(inspector.get_table_names()) == {
+        "employees", "workstreams", "accomplishments", "weeklyreports", "hourstracking",
+        "weeklyfactcube", "workproductcube", "accomplishmentcube", "dataversions",
+    }
+    index_names = {
+        ix["name"] for table in inspector.get_table_names() for ix in inspector.get_indexes(table)
+    }
+    assert {name for name, _, _ in schema.SECONDARY_INDEXES} <= index_names
+
+def test_publicid_unique_index_ignores_nulls_on_mssql():
+    index = next(ix for ix in schema.employees.indexes if ix.name == "uq_employees_publicid")
+    ddl = str(CreateIndex(index).compile(dialect=mssql.dialect()))
+    assert ddl.startswith("CREATE UNIQUE INDEX uq_employees_publicid")
+    assert ddl.endswith("WHERE publicid IS NOT NULL")
@@ -0,0 +1,153 @@
+# tests/test_shared.py
+import os
+import time
+from datetime import date, datetime, timedelta
+import pandas as pd
+from sqlalchemy import insert, select
+from utils import schema, versions
+from utils.datasets import Dataset
+from utils.incremental import IncrementalFrame
+from utils.shared import ARROW_STRINGS, SharedFrames
+from utils.warmer import DatasetWarmer
+
+VERSION = (("weeklyreports", 3),)
+
+def make_frame():
+    return pd.DataFrame(
+        {"Vendor Name": ["Acme", "Globex", "Acme"], "Hours": [8.0, 4.5, 2.0]},
+        index=[10, 11, 12],
+    )
+
+# -------------------------------
+# SharedFrames
+# -------------------------------
+def test_write_then_read_round_trips(tmp_path):
+    shared = SharedFrames(str(tmp_path))
+    shared.write("weekly_reports", VERSION, make_frame())
+    pd.testing.assert_frame_equal(shared.read("weekly_reports", VERSION), make_frame())
+
+def test_strings_stay_arrow_backed_and_categoricals_stay_categorical(tmp_path):
+    frame = make_frame().assign(Title=["a", None, "c"])
+    frame["Vendor Name"] = frame["Vendor Name"].astype("category")
+    shared = SharedFrames(str(tmp_path))
+    shared.write("weekly_reports", VERSION, frame)
+    restored = shared.read("weekly_reports", VERSION)
+    assert isinstance(restored["Vendor Name"].dtype, pd.CategoricalDtype)
+    if ARROW_STRINGS is not None:
+        assert restored["Title"].dtype == ARROW_STRINGS
+    assert restored["Title"].isna().tolist() == [False, True, False]
+
+def test_read_requires_matching_version(tmp_path):
+    shared = SharedFrames(str(tmp_path))
+    shared.write("weekly_reports", VERSION, make_frame())
+    assert shared.read("weekly_reports", (("weeklyreports", 4),)) is None
+    assert shared.read("accomplishments", VERSION) is None
+
+def test_expired_files_are_ignored(tmp_path):
+    SharedFrames(str(tmp_path)).write("weekly_reports", VERSION, make_frame())
+    SharedFrames(str(tmp_path)).write("hr_kpis", VERSION, {"summary": {}})
+    day_old = time.time() - 24 * 60 * 60 - 1
+    for path in tmp_path.iterdir():
+        os.utime(path, (day_old, day_old))
+
+    shared = SharedFrames(str(tmp_path), max_age=24 * 60 * 60)
+    assert shared.read("weekly_reports", VERSION) is None
+    assert shared.read("hr_kpis", VERSION) is None
+    assert SharedFrames(str(tmp_path), max_age=0).read("weekly_reports", VERSION) is not None
+
+def test_read_requires_matching_stamp(tmp_path):
+    shared = SharedFrames(str(tmp_path))
+    shared.write("weekly_reports", VERSION, make_frame(), stamp="query-a")
+    shared.write("hr_kpis", VERSION, {"summary": {}}, stamp="query-a")
+    assert shared.read("weekly_reports", VERSION, stamp="query-b") is None
+    assert shared.read("hr_kpis", VERSION, stamp="query-b") is None
+    assert shared.read("weekly_reports", VERSION, stamp="query-a") is not None
+
+def test_rewrite_replaces_file_atomically(tmp_path):
+    shared = SharedFrames(str(tmp_path))
+    shared.write("weekly_reports", VERSION, make_frame())
+    mapped = shared.read("weekly_reports", VERSION)
+    shared.write("weekly_reports", (("weeklyreports", 4),), make_frame().iloc[:1])
+
+    assert len(shared.read("weekly_reports", (("weeklyreports", 4),))) == 1
+    assert len(mapped) == 3                        # earlier mapping still readable
+    assert [p.name for p in tmp_path.iterdir()] == ["weekly_reports.arrow"]
+
+# -------------------------------
+# Warmer integration
+# -------------------------------
+def test_second_process_maps_instead_of_loading(engine, tmp_path):
+    with engine.begin() as conn:
+        versions.bump_versions(conn, "weeklyreports")
+    loads = []
+
+    def load(conn):
+        loads.append(1)
+        return make_frame()
+
+    datasets = {"weekly_reports": Dataset(("weeklyreports",), load)}
+    first = DatasetWarmer(engine, datasets=datasets, shared=SharedFrames(str(tmp_path)))
+    second = DatasetWarmer(engine, datasets=datasets, shared=SharedFrames(str(tmp_path)))
+
+    pd.testing.assert_frame_equal(first.get("weekly_reports"), make_frame())
+    pd.testing.assert_frame_equal(second.get("weekly_reports"), make_frame())
+    assert len(loads) == 1
+
+    with engine.begin() as conn:
+        versions.bump_versions(conn, "weeklyreports")
+    second.refresh_all()                           # stale stamp: rebuilt from the database
+    assert len(loads) == 2
+
+# -------------------------------
+# Restart persistence
+# -------------------------------
+def test_non_frame_values_persist_with_their_stamp(tmp_path):
+    kpis = {"summary": {"total_reports": 3}, "status_counts": make_frame()}
+    SharedFrames(str(tmp_path)).write("hr_kpis", VERSION, kpis)
+
+    restored = SharedFrames(str(tmp_path)).read("hr_kpis", VERSION)   # e.g. after a restart
+    assert restored["summary"] == kpis["summary"]
+    pd.testing.assert_frame_equal(restored["status_counts"], make_frame())
+    assert SharedFrames(str(tmp_path)).read("hr_kpis", (("weeklyreports", 4),)) is None
+
+def test_restart_restores_incremental_frame_and_watermark(engine, tmp_path):
+    mark = datetime(2025, 7, 7, 9, 0)
+    with engine.begin() as conn:
+        conn.execute(insert(schema.employees), [{"employeeid": 1, "name": "Doe, Jane", "uniquekey": "k1"}])
+        conn.execute(insert(schema.weekly_reports), [
+            {"reportid": i, "employeeid": 1, "weekstartdate": date(2025, 7, 7),
+             "workproducttitle": f"WP{i}", "created_at": mark - timedelta(hours=2 - i)} for i in (1, 2)
+        ])
+        versions.bump_versions(conn, "weeklyreports")
+
+    def make_dataset():
+        wr = schema.weekly_reports
+        frame = IncrementalFrame(
+            select(wr.c.workproducttitle.label("Work Product Title")),
+            key=wr.c.reportid, timestamp=wr.c.created_at, overlap=timedelta(0),
+        )
+
+        def load(conn):
+            frame.refresh(conn)
+            return frame.frame
+
+        return frame, {"reports": Dataset(("weeklyreports",), load, frame)}
+
+    _, datasets = make_dataset()
+    DatasetWarmer(engine, datasets=datasets, shared=SharedFrames(str(tmp_path))).get("reports")
+
+    # New process: restored from disk without touching the reports table
+    frame, datasets = make_dataset()
+    restarted = DatasetWarmer(engine, datasets=datasets, shared=SharedFrames(str(tmp_path)))
+    assert restarted.get("reports").index.tolist() == [1, 2]
+    assert frame.watermark == mark
+
+    with engine.begin() as conn:
+        conn.execute(insert(schema.weekly_reports), [
+            {"reportid": 3, "employeeid": 1, "weekstartdate": date(2025, 7, 14),
+             "workproducttitle": "WP3", "created_at": datetime(2025, 7, 14, 9, 0)}
+        ])
+        versions.bump_versions(conn, "weeklyreports")
+    restarted.refresh_all()
+    assert frame.last_fetched == 2                 # WP2 (at the mark) and WP3, not a full reload
+    assert restarted.get("reports")["Work Product Title"].tolist() == ["WP1", "WP2", "WP3"]
@@ -0,0 +1,112 @@
+# tests/test_snapshots.py
+from datetime import date
+import pandas as pd
+import pytest
+from sqlalchemy import inspect, insert, select, text, Table, Column, Integer, MetaData
+from utils import ingest, schema, snapshots, versions
+from utils.helpers import generate_employee_key
+
+# -------------------------------
+# Shared in-memory fixture data
+# -------------------------------
+def seed_snapshot_db(engine):
+    with engine.begin() as conn:
+        conn.execute(insert(schema.employees), [
+            {"employeeid": 1, "name": "Doe, Jane", "vendorname": "Acme", "laborcategory": None,
+             "uniquekey": generate_employee_key("Doe, Jane", "Acme")},
+            {"employeeid": 2, "name": "Smith, John", "vendorname": "Globex", "laborcategory": "Engineer", "uniquekey": "k2"},
+        ])
+        conn.execute(insert(schema.weekly_reports), [
+            {"employeeid": 1, "weekstartdate": date(2025, 7, 7), "workproducttitle": "A", "effortpercentage": 50},
+            {"employeeid": 2, "weekstartdate": date(2025, 7, 14), "workproducttitle": "B", "effortpercentage": 25},
+        ])
+
+def make_rows():
+    return ingest.prepare_weekly_rows(pd.DataFrame({
+        "contractorname": ["Doe, Jane"],
+        "vendorname": ["Acme"],
+        "laborcategory": ["Analyst"],
+        "weekstartdate": pd.to_datetime(["2025-07-21"]),
+        "workproducttitle": ["C"],
+        "hoursworked": [20.0],
+        "effortpercentage": [50.0],
+    }))
+
+def read_snapshot(conn):
+    return sorted(tuple(row) for row in conn.execute(select(snapshots.snapshot)))
+
+def read_live(conn):
+    return sorted(tuple(row) for row in conn.execute(text(snapshots.SNAPSHOT_SELECT).columns(*snapshots.snapshot.c)))
+
+def snapshot_version(engine):
+    return versions.read_versions(engine, snapshots.SNAPSHOT_NAME)
+
+# -------------------------------
+# create_snapshot
+# -------------------------------
+def test_snapshot_matches_live_join(engine):
+    seed_snapshot_db(engine)
+    assert snapshots.create_snapshot(engine) is True
+    assert snapshots.create_snapshot(engine) is False  # already exists
+
+    with engine.connect() as conn:
+        assert len(read_snapshot(conn)) == 2
+        assert read_snapshot(conn) == read_live(conn)
+
+def test_stale_snapshot_is_recreated(engine):
+    seed_snapshot_db(engine)
+    # A snapshot created before the employeeid / updated_at columns existed
+    Table(snapshots.SNAPSHOT_NAME, MetaData(), Column("reportid", Integer, primary_key=True)).create(engine)
+
+    assert snapshots.create_snapshot(engine) is True
+    with engine.connect() as conn:
+        columns = {col["name"] for col in inspect(conn).get_columns(snapshots.SNAPSHOT_NAME)}
+        assert set(snapshots.snapshot.c.keys()) <= columns
+        assert read_snapshot(conn) == read_live(conn)
+
+# -------------------------------
+# Refresh inside the write transaction
+# -------------------------------
+def test_ingest_refreshes_snapshot_in_its_transaction(engine):
+    seed_snapshot_db(engine)
+    snapshots.create_snapshot(engine)
+    before = snapshot_version(engine)
+
+    with engine.begin() as conn:
+        ingest.bulk_ingest_weekly_reports(conn, make_rows())
+        # Visible to the writer before commit, together with the new report
+        assert len(read_snapshot(conn)) == 3
+
+    assert snapshot_version(engine) != before
+    with engine.connect() as conn:
+        assert read_snapshot(conn) == read_live(conn)
+
+def test_rolled_back_write_leaves_snapshot_unchanged(engine):
+    seed_snapshot_db(engine)
+    snapshots.create_snapshot(engine)
+    with engine.connect() as conn:
+        before = read_snapshot(conn)
+
+    with pytest.raises(RuntimeError):
+        with engine.begin() as conn:
+            ingest.bulk_ingest_weekly_reports(conn, make_rows())
+            raise RuntimeError("batch failed after ingest")
+
+    with engine.connect() as conn:
+        assert read_snapshot(conn) == before
+
+def test_employee_backfill_reaches_existing_snapshot_rows(engine):
+    seed_snapshot_db(engine)
+    snapshots.create_snapshot(engine)
+
+    # The batch backfills Doe, Jane's missing labor category
+    with engine.begin() as conn:
+        ingest.bulk_ingest_weekly_reports(conn, make_rows())
+
+    s = snapshots.snapshot.c
+    with engine.connect() as conn:
+        categories = conn.execute(
+            select(s.workproducttitle, s.laborcategory).where(s.employeeid == 1).order_by(s.reportid)
+        ).all()
+        assert categories == [("A", "Analyst"), ("C", "Analyst")]
+        assert read_snapshot(conn) == read_live(conn)
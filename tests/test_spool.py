@@ -0,0 +1,114 @@
+# tests/test_spool.py
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from utils import spool
+
+def make_rows(title):
+    return [{"rownum": 0, "workproducttitle": title, "weekstartdate": date(2025, 7, 7), "datecompleted": None}]
+
+# -------------------------------
+# spool_batch / spool_depth
+# -------------------------------
+def test_spool_depth_tracks_batches(tmp_path):
+    path = str(tmp_path / "spool.sqlite")
+    assert spool.spool_depth(path) == 0
+    assert spool.spool_batch(make_rows("A"), path=path) == 1
+    assert spool.spool_batch(make_rows("B"), path=path) == 2
+    assert spool.spool_depth(path) == 2
+
+# -------------------------------
+# replay_spool
+# -------------------------------
+def test_replay_spool_drains_in_order(tmp_path):
+    path = str(tmp_path / "spool.sqlite")
+    spool.spool_batch(make_rows("A"), entered_by="alice", path=path)
+    spool.spool_batch(make_rows("B"), entered_by="bob", path=path)
+    replayed = []
+
+    def fake_ingest(conn, rows, entered_by=None):
+        replayed.append((rows[0]["workproducttitle"], entered_by, rows[0]["weekstartdate"]))
+
+    assert spool.replay_spool(create_engine("sqlite://"), path=path, ingest=fake_ingest) == 2
+    assert replayed == [("A", "alice", date(2025, 7, 7)), ("B", "bob", date(2025, 7, 7))]
+    assert spool.spool_depth(path) == 0
+
+def test_replay_spool_stops_when_database_unreachable(tmp_path):
+    path = str(tmp_path / "spool.sqlite")
+    spool.spool_batch(make_rows("A"), path=path)
+    spool.spool_batch(make_rows("B"), path=path)
+    calls = []
+
+    def down_ingest(conn, rows, entered_by=None):
+        calls.append(rows[0]["workproducttitle"])
+
+    # The database file's folder does not exist, so no connection can be opened
+    unreachable = create_engine(f"sqlite:///{tmp_path / 'missing' / 'wsr.db'}")
+    assert spool.replay_spool(unreachable, path=path, ingest=down_ingest) == 0
+    assert calls == []
+    assert spool.spool_depth(path) == 2
+    assert spool.dead_batches(path) == []
+
+def test_operational_error_from_reachable_database_is_dead_lettered(tmp_path, monkeypatch):
+    path = str(tmp_path / "spool.sqlite")
+    monkeypatch.setattr(spool, "MAX_ATTEMPTS", 2)
+    spool.spool_batch(make_rows("overflow"), path=path)
+
+    def overflowing_ingest(conn, rows, entered_by=None):
+        # e.g. pymssql reports arithmetic overflow as an OperationalError
+        raise OperationalError("INSERT INTO weeklyreports ...", {}, Exception("arithmetic overflow"))
+
+    engine = create_engine("sqlite://")
+    assert spool.replay_spool(engine, path=path, ingest=overflowing_ingest) == 0
+    assert spool.replay_spool(engine, path=path, ingest=overflowing_ingest) == 0
+    assert spool.spool_depth(path) == 0
+    (dead,) = spool.dead_batches(path)
+    assert dead[3] == 2 and "arithmetic overflow" in dead[4]
+
+def test_invalidated_connection_counts_as_unreachable():
+    error = OperationalError("SELECT 1", {}, Exception("server closed the connection"), connection_invalidated=True)
+    assert spool.is_connectivity_error(create_engine("sqlite://"), error)
+    assert not spool.is_connectivity_error(create_engine("sqlite://"), ValueError("bad row"))
+
+def test_replay_spool_stops_at_failed_batch_and_dead_letters_it(tmp_path, monkeypatch):
+    path = str(tmp_path / "spool.sqlite")
+    monkeypatch.setattr(spool, "MAX_ATTEMPTS", 2)
+    spool.spool_batch(make_rows("bad"), path=path)
+    spool.spool_batch(make_rows("B"), path=path)
+    calls = []
+
+    def picky_ingest(conn, rows, entered_by=None):
+        calls.append(rows[0]["workproducttitle"])
+        if rows[0]["workproducttitle"] == "bad":
+            raise ValueError("bad row")
+
+    engine = create_engine("sqlite://")
+    # the failed batch holds back the one behind it
+    assert spool.replay_spool(engine, path=path, ingest=picky_ingest) == 0
+    assert calls == ["bad"]
+    assert spool.dead_batches(path) == []
+    # second failure dead-letters it, after which the next batch goes through
+    assert spool.replay_spool(engine, path=path, ingest=picky_ingest) == 0
+    assert spool.replay_spool(engine, path=path, ingest=picky_ingest) == 1
+    assert calls == ["bad", "bad", "B"]
+    assert spool.spool_depth(path) == 0
+    (dead,) = spool.dead_batches(path)
+    assert dead[3:] == (2, "bad row")
+
+def test_replay_spool_skips_batch_claimed_by_another_process(tmp_path, monkeypatch):
+    path = str(tmp_path / "spool.sqlite")
+    spool.spool_batch(make_rows("A"), path=path)
+    other = spool._connect(path)
+    assert spool._claim(other, "other-host:1:1")[0] == 1
+    calls = []
+
+    def fake_ingest(conn, rows, entered_by=None):
+        calls.append(rows[0]["workproducttitle"])
+
+    assert spool.replay_spool(create_engine("sqlite://"), path=path, ingest=fake_ingest) == 0
+    assert calls == []
+    # an abandoned claim is taken over once it times out
+    monkeypatch.setattr(spool, "CLAIM_TIMEOUT", spool.timedelta(0))
+    assert spool.replay_spool(create_engine("sqlite://"), path=path, ingest=fake_ingest) == 1
+    assert calls == ["A"]
+    other.close()
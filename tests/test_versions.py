@@ -0,0 +1,46 @@
+# tests/test_versions.py
+from sqlalchemy import select, false
+from utils import schema, versions
+
+# -------------------------------
+# bump_versions / get_versions
+# -------------------------------
+def test_unwritten_tables_are_version_zero(engine):
+    assert versions.read_versions(engine, "weeklyreports") == (("weeklyreports", 0),)
+
+def test_bump_increments_each_named_table_once(engine):
+    with engine.begin() as conn:
+        versions.bump_versions(conn, "WeeklyReports", "employees")
+    with engine.begin() as conn:
+        versions.bump_versions(conn, "weeklyreports")
+
+    assert versions.read_versions(engine, "weeklyreports", "employees", "accomplishments") == (
+        ("accomplishments", 0), ("employees", 1), ("weeklyreports", 2)
+    )
+
+def test_rolled_back_write_does_not_bump(engine):
+    try:
+        with engine.begin() as conn:
+            versions.bump_versions(conn, "weeklyreports")
+            raise RuntimeError("write failed")
+    except RuntimeError:
+        pass
+    assert versions.read_versions(engine, "weeklyreports") == (("weeklyreports", 0),)
+
+def test_create_all_seeds_a_row_per_table(engine):
+    with engine.connect() as conn:
+        seeded = dict(conn.execute(select(schema.data_versions.c.tablename, schema.data_versions.c.version)).fetchall())
+    assert set(seeded) == set(schema.metadata.tables) - {"dataversions"}
+    assert set(seeded.values()) == {0}
+
+def test_bump_retries_when_a_concurrent_writer_inserts_the_row_first(engine, monkeypatch):
+    with engine.begin() as conn:
+        versions.bump_versions(conn, "weeklyreportsnapshot")
+    # Hide the existing row from the existence check, as if another writer inserted it meanwhile
+    monkeypatch.setattr(versions, "select", lambda *cols: select(*cols).where(false()))
+    with engine.begin() as conn:
+        versions.bump_versions(conn, "weeklyreportsnapshot", "weeklyreports")
+    monkeypatch.undo()
+    assert versions.read_versions(engine, "weeklyreportsnapshot", "weeklyreports") == (
+        ("weeklyreports", 1), ("weeklyreportsnapshot", 2)
+    )
@@ -0,0 +1,78 @@
+# tests/test_warmer.py
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from utils import schema, versions
+from utils.datasets import Dataset
+from utils.warmer import DatasetWarmer
+
+def make_warmer():
+    # One shared connection, so the warmer thread sees the same in-memory database
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    schema.create_all(engine)
+    builds = []
+
+    def load(conn):
+        builds.append(versions.get_versions(conn, "weeklyreports"))
+        return len(builds)
+
+    warmer = DatasetWarmer(engine, datasets={"counter": Dataset(("weeklyreports",), load)})
+    return engine, warmer, builds
+
+def bump(engine):
+    with engine.begin() as conn:
+        versions.bump_versions(conn, "weeklyreports")
+
+# -------------------------------
+# DatasetWarmer (thread not started)
+# -------------------------------
+def test_first_get_builds_inline_then_serves_cached():
+    engine, warmer, builds = make_warmer()
+    assert warmer.get("counter") == 1
+    assert warmer.get("counter") == 1
+    assert len(builds) == 1
+
+def test_stale_value_served_while_rebuild_is_signalled():
+    engine, warmer, builds = make_warmer()
+    warmer.get("counter")
+    bump(engine)
+
+    assert warmer.get("counter") == 1          # previous build, no inline rebuild
+    assert warmer._wake.is_set()                # background refresh requested
+    assert warmer.refresh_all() == ["counter"]
+    assert warmer.get("counter") == 2
+
+def test_refresh_skips_unchanged_versions():
+    engine, warmer, builds = make_warmer()
+    assert warmer.refresh_all() == ["counter"]
+    assert warmer.refresh_all() == []
+    assert len(builds) == 1
+
+def test_background_thread_rebuilds_after_write():
+    engine, warmer, builds = make_warmer()
+    warmer.interval = 0.01
+    warmer.start()
+    try:
+        warmer.get("counter")
+        bump(engine)
+        for _ in range(200):
+            if len(builds) == 2:
+                break
+            warmer._wake.wait(0.01)
+        assert len(builds) == 2
+    finally:
+        warmer.stop()
+        warmer.join(timeout=1)
+
+# -------------------------------
+# prefetch
+# -------------------------------
+def test_prefetch_builds_datasets_in_background():
+    from concurrent.futures import wait
+    from utils.warmer import prefetch
+
+    engine, warmer, builds = make_warmer()
+    futures = prefetch(warmer, catalogs=[])
+    wait(futures, timeout=5)
+    assert [f.result() for f in futures] == [True]
+    assert warmer.get("counter") == 1
+    assert len(builds) == 1
@@ -0,0 +1,185 @@
+# This module provides a size-bounded, two-tier cache for dashboard DataFrames.
+# Frames live in an in-memory LRU capped by bytes (measured with memory_usage(deep=True));
+# frames evicted from memory are spilled to Parquet files on local disk and promoted back
+# on the next hit. Entries are keyed by (query name, parameters) and carry the data
+# version they were built from, so a write replaces old entries instead of piling up new
+# ones next to them. Hit/miss/eviction counters are exposed through `stats()`.
+#
+# Settings (environment):
+#   WSR_CACHE_MAX_BYTES        in-memory budget (default 512 MB)
+#   WSR_CACHE_MAX_DISK_BYTES   spill budget (default 2 GB)
+#   WSR_CACHE_DIR              spill location (default cache/frames)
+
+import os
+import atexit
+import shutil
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+
+MAX_BYTES = int(os.getenv("WSR_CACHE_MAX_BYTES", 512 * 1024 ** 2))
+MAX_DISK_BYTES = int(os.getenv("WSR_CACHE_MAX_DISK_BYTES", 2 * 1024 ** 3))
+CACHE_DIR = os.getenv("WSR_CACHE_DIR", os.path.join("cache", "frames"))
+
+
+def frame_nbytes(df):
+    """In-memory size of a DataFrame, including object contents and the index."""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+class FrameCache:
+    """
+    In-memory LRU of DataFrames bounded by bytes, with a Parquet spill tier.
+
+    Args:
+        max_bytes (int): In-memory budget.
+        spill_dir (str, optional): Parent folder for spill files; each cache uses
+            its own sub-folder, removed at exit. None disables spilling.
+        max_disk_bytes (int): Spill budget; the oldest spill files are deleted past it.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, spill_dir=CACHE_DIR, max_disk_bytes=MAX_DISK_BYTES):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()    # key -> (version, frame, nbytes)
+        self._disk = OrderedDict()      # key -> (version, path, nbytes)
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.counters = {
+            "hits": 0, "disk_hits": 0, "misses": 0,
+            "evictions": 0, "spills": 0, "disk_evictions": 0,
+        }
+
+        self.spill_dir = None
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+            self.spill_dir = tempfile.mkdtemp(prefix="frames-", dir=spill_dir)
+            atexit.register(shutil.rmtree, self.spill_dir, True)
+
+    # ---- internals (call with the lock held) ----
+
+    def _spill_path(self, key, version):
+        digest = hashlib.sha1(repr((key, version)).encode("utf-8")).hexdigest()
+        return os.path.join(self.spill_dir, f"{digest}.parquet")
+
+    def _drop_disk(self, key):
+        entry = self._disk.pop(key, None)
+        if entry is not None:
+            self._disk_bytes -= entry[2]
+            try:
+                os.remove(entry[1])
+            except OSError:
+                pass
+
+    def _drop_memory(self, key):
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry[2]
+
+    def _spill(self, key, version, frame):
+        path = self._spill_path(key, version)
+        try:
+            frame.to_parquet(path)
+        except Exception as e:
+            # Frames pyarrow cannot serialize are simply dropped
+            print("Frame cache spill failed:", e)
+            return
+        size = os.path.getsize(path)
+        self._disk[key] = (version, path, size)
+        self._disk_bytes += size
+        self.counters["spills"] += 1
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            oldest = next(iter(self._disk))
+            self._drop_disk(oldest)
+            self.counters["disk_evictions"] += 1
+
+    def _store(self, key, version, frame):
+        self._drop_memory(key)
+        self._drop_disk(key)
+        nbytes = frame_nbytes(frame)
+        if nbytes > self.max_bytes:
+            # Larger than the whole budget: keep it on disk only
+            if self.spill_dir:
+                self._spill(key, version, frame)
+            return
+        self._memory[key] = (version, frame, nbytes)
+        self._memory_bytes += nbytes
+        while self._memory_bytes > self.max_bytes:
+            old_key, (old_version, old_frame, _) = next(iter(self._memory.items()))
+            self._drop_memory(old_key)
+            self.counters["evictions"] += 1
+            if self.spill_dir:
+                self._spill(old_key, old_version, old_frame)
+
+    # ---- public API ----
+
+    def get(self, key, version):
+        """
+        Returns the cached frame for `key` built from `version`, or None.
+        Entries built from another version count as misses and are discarded.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] == version:
+                    self._memory.move_to_end(key)
+                    self.counters["hits"] += 1
+                    return entry[1]
+                self._drop_memory(key)
+
+            entry = self._disk.get(key)
+            if entry is not None:
+                if entry[0] == version:
+                    frame = pd.read_parquet(entry[1])
+                    self.counters["disk_hits"] += 1
+                    self._store(key, version, frame)
+                    return frame
+                self._drop_disk(key)
+
+            self.counters["misses"] += 1
+            return None
+
+    def put(self, key, version, frame):
+        """Stores `frame` for `key`, replacing any entry from an older version."""
+        with self._lock:
+            self._store(key, version, frame)
+
+    def get_or_load(self, key, version, loader):
+        """
+        Returns the cached frame, calling `loader()` and caching its result on a miss.
+
+        Args:
+            key (hashable): Query name and parameters, e.g. ("weekly_reports", filters).
+            version (hashable): Data version token (see utils/versions.py).
+            loader (callable): Builds the frame.
+
+        Returns:
+            DataFrame: Shallow copy of the cached frame, safe to modify.
+        """
+        frame = self.get(key, version)
+        if frame is None:
+            frame = loader()
+            self.put(key, version, frame)
+        return frame.copy(deep=False)
+
+    def stats(self):
+        """Counters plus current entry counts and sizes for both tiers."""
+        with self._lock:
+            return {
+                **self.counters,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def get_frame_cache():
+    """The process-wide frame cache, configured from the environment."""
+    return FrameCache()
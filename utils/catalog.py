@@ -0,0 +1,58 @@
+# This module serves the dashboard sidebar filter options (weeks, vendors, contractors,
+# workstreams) from small SELECT DISTINCT queries in utils/queries.py.
+# Results are cached per data version (utils/versions.py), so option lists refresh as
+# soon as a write commits and never require loading a whole fact table.
+
+import pandas as pd
+import streamlit as st
+from sqlalchemy import text
+
+from utils.db import engine, employees, workstreams, weekly_reports, accomplishments
+from utils import queries
+from utils.versions import read_versions
+
+# Dataset -> {option name: DISTINCT query}
+CATALOG_QUERIES = {
+    "weekly_reports": {
+        "weeks": queries.weekly_report_weeks,
+        "vendors": queries.weekly_report_vendors,
+        "contractors": queries.weekly_report_contractors,
+    },
+    "accomplishments": {
+        "weeks": queries.accomplishment_weeks,
+        "contractors": queries.accomplishment_contractors,
+        "workstreams": queries.accomplishment_workstreams,
+    },
+}
+
+# Dataset -> tables whose changes invalidate its options
+CATALOG_TABLES = {
+    "weekly_reports": (weekly_reports.name, employees.name),
+    "accomplishments": (accomplishments.name, employees.name, workstreams.name),
+}
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _load_options(dataset, version):
+    """Runs a dataset's DISTINCT queries. `version` is only part of the cache key."""
+    options = {}
+    with engine.connect() as conn:
+        for name, sql in CATALOG_QUERIES[dataset].items():
+            values = conn.execute(text(sql)).scalars().all()
+            if name == "weeks":
+                values = pd.to_datetime(values).dropna().strftime("%Y-%m-%d").tolist()
+            options[name] = values
+    return options
+
+
+def get_filter_options(dataset):
+    """
+    Returns the sidebar filter options for a dataset.
+
+    Args:
+        dataset (str): "weekly_reports" or "accomplishments".
+
+    Returns:
+        dict: Option name -> sorted list of values ("weeks" as "YYYY-MM-DD" strings).
+    """
+    return _load_options(dataset, read_versions(engine, *CATALOG_TABLES[dataset]))
@@ -0,0 +1,229 @@
+# This module maintains the rollup (cube) tables defined in utils/schema.py.
+# `weeklyfactcube` holds hours, effort, and report counts per reporting week and
+# dashboard dimension; `workproductcube` holds hours and report counts per week and
+# work product title (kept apart because titles are nearly unique per report);
+# `accomplishmentcube` holds accomplishment counts per week, workstream, and contractor. Writers refresh only the weeks they touched, inside
+# their own transaction, so the dashboards can aggregate the cubes instead of the
+# raw history.
+#
+# A refresh deletes a week's cube rows and re-inserts its rollup. Two writers doing that
+# concurrently under READ COMMITTED can each keep the other's freshly inserted rows and
+# double-count the week, so every refresh first bumps the cube's own data version: the
+# row lock on its `dataversions` counter orders the writers, and the later one's DELETE
+# starts only after the earlier one has committed, seeing (and replacing) its rows.
+#
+# Usage:
+#   python -m utils.cube              # create the cube tables and rebuild them from scratch
+
+from datetime import date
+
+import pandas as pd
+from sqlalchemy import select, insert, delete, func, literal, or_
+
+from utils.db import employees, weekly_reports, accomplishments, workstreams
+from utils.schema import weekly_fact_cube, work_product_cube, accomplishment_cube
+from utils.versions import bump_versions
+
+WEEKLY_CUBE_COLUMNS = [
+    "weekstartdate", "vendorname", "divisioncommand", "contractorname", "laborcategory",
+    "status", "plannedorunplanned",
+    "hours", "effortpercentage", "reportcount",
+]
+
+WORK_PRODUCT_CUBE_COLUMNS = ["weekstartdate", "workproducttitle", "hours", "reportcount"]
+
+ACCOMPLISHMENT_CUBE_COLUMNS = ["weekstartdate", "workstreamname", "contractorname", "accomplishmentcount"]
+
+
+def hours_expr(effort):
+    """Hours for one report row: 40 hours == 100% effort, rounded to 2 decimals."""
+    return func.round(func.coalesce(effort, 0) * literal(0.4), 2)
+
+
+def _week_filter(column, weeks):
+    """`column IN weeks`, also matching NULL when None is one of the weeks."""
+    dated = sorted({w for w in weeks if w is not None})
+    clauses = [column.in_(dated)] if dated else []
+    if None in weeks:
+        clauses.append(column.is_(None))
+    return or_(*clauses)
+
+
+def _weekly_rollup(weeks=None, weekly_reports_table=None, employees_table=None):
+    wr = weekly_reports if weekly_reports_table is None else weekly_reports_table
+    e = employees if employees_table is None else employees_table
+    # Contractor names come from Employees, like the dashboards' filter options and frames
+    dims = [
+        wr.c.weekstartdate, e.c.vendorname, wr.c.divisioncommand, e.c.name,
+        e.c.laborcategory, wr.c.status, wr.c.plannedorunplanned,
+    ]
+    stmt = (
+        select(
+            *dims,
+            func.sum(hours_expr(wr.c.effortpercentage)),
+            func.sum(func.coalesce(wr.c.effortpercentage, 0)),
+            func.count(),
+        )
+        .select_from(wr.join(e, wr.c.employeeid == e.c.employeeid))
+        .group_by(*dims)
+    )
+    if weeks is not None:
+        stmt = stmt.where(_week_filter(wr.c.weekstartdate, weeks))
+    return stmt
+
+
+def _work_product_rollup(weeks=None, weekly_reports_table=None):
+    wr = weekly_reports if weekly_reports_table is None else weekly_reports_table
+    dims = [wr.c.weekstartdate, wr.c.workproducttitle]
+    stmt = select(*dims, func.sum(hours_expr(wr.c.effortpercentage)), func.count()).group_by(*dims)
+    if weeks is not None:
+        stmt = stmt.where(_week_filter(wr.c.weekstartdate, weeks))
+    return stmt
+
+
+def _accomplishment_rollup(weeks=None, accomplishments_table=None, employees_table=None,
+                           workstreams_table=None):
+    a = accomplishments if accomplishments_table is None else accomplishments_table
+    e = employees if employees_table is None else employees_table
+    w = workstreams if workstreams_table is None else workstreams_table
+    dims = [a.c.weekstartdate, w.c.name, e.c.name]
+    stmt = (
+        select(*dims, func.count())
+        .select_from(
+            a.join(e, a.c.employeeid == e.c.employeeid)
+            .join(w, a.c.workstreamid == w.c.workstreamid)
+        )
+        .group_by(*dims)
+    )
+    if weeks is not None:
+        stmt = stmt.where(_week_filter(a.c.weekstartdate, weeks))
+    return stmt
+
+
+def refresh_weekly_cube(conn, weeks, weekly_reports_table=None, employees_table=None, cube_table=None,
+                        work_product_table=None):
+    """
+    Recomputes the weekly fact cube and the work product cube for the given reporting weeks.
+
+    Call inside the transaction that wrote the weekly reports, so readers
+    never see the raw rows and the cube out of step. Concurrent refreshes
+    wait for each other until commit (see the module comment).
+
+    Args:
+        conn (Connection): SQLAlchemy database connection.
+        weeks (iterable[date]): Reporting weeks touched by the write.
+
+    Returns:
+        int: Number of weekly fact cube rows written.
+    """
+    cube = weekly_fact_cube if cube_table is None else cube_table
+    work_products = work_product_cube if work_product_table is None else work_product_table
+    weeks = set(weeks)
+    if not weeks:
+        return 0
+    # Serializes concurrent refreshes of both cubes until commit (see module comment)
+    bump_versions(conn, cube.name, work_products.name)
+    conn.execute(delete(cube).where(_week_filter(cube.c.weekstartdate, weeks)))
+    result = conn.execute(insert(cube).from_select(
+        WEEKLY_CUBE_COLUMNS, _weekly_rollup(weeks, weekly_reports_table, employees_table)
+    ))
+    conn.execute(delete(work_products).where(_week_filter(work_products.c.weekstartdate, weeks)))
+    conn.execute(insert(work_products).from_select(
+        WORK_PRODUCT_CUBE_COLUMNS, _work_product_rollup(weeks, weekly_reports_table)
+    ))
+    return max(result.rowcount or 0, 0)
+
+
+def refresh_accomplishment_cube(conn, weeks, accomplishments_table=None, employees_table=None,
+                                workstreams_table=None, cube_table=None):
+    """
+    Recomputes the accomplishment cube for the given reporting weeks.
+
+    Args:
+        conn (Connection): SQLAlchemy database connection.
+        weeks (iterable[date | None]): Reporting weeks touched by the write.
+
+    Returns:
+        int: Number of cube rows written.
+    """
+    cube = accomplishment_cube if cube_table is None else cube_table
+    weeks = set(weeks)
+    if not weeks:
+        return 0
+    bump_versions(conn, cube.name)
+    conn.execute(delete(cube).where(_week_filter(cube.c.weekstartdate, weeks)))
+    result = conn.execute(insert(cube).from_select(
+        ACCOMPLISHMENT_CUBE_COLUMNS,
+        _accomplishment_rollup(weeks, accomplishments_table, employees_table, workstreams_table)
+    ))
+    return max(result.rowcount or 0, 0)
+
+
+def rebuild(conn):
+    """
+    Rebuilds every cube from the full history (after a backfill or on first setup).
+    Bumps the weekly report and accomplishment data versions so cached
+    dashboards pick up the rebuilt cubes.
+
+    Args:
+        conn (Connection): SQLAlchemy database connection, inside a transaction.
+
+    Returns:
+        dict: Rows written to `weekly` and `accomplishments` cubes.
+    """
+    bump_versions(
+        conn, weekly_reports.name, accomplishments.name,
+        weekly_fact_cube.name, work_product_cube.name, accomplishment_cube.name
+    )
+    conn.execute(delete(weekly_fact_cube))
+    conn.execute(delete(work_product_cube))
+    conn.execute(delete(accomplishment_cube))
+    weekly = conn.execute(insert(weekly_fact_cube).from_select(WEEKLY_CUBE_COLUMNS, _weekly_rollup()))
+    conn.execute(insert(work_product_cube).from_select(WORK_PRODUCT_CUBE_COLUMNS, _work_product_rollup()))
+    accomplished = conn.execute(
+        insert(accomplishment_cube).from_select(ACCOMPLISHMENT_CUBE_COLUMNS, _accomplishment_rollup())
+    )
+    return {
+        "weekly": max(weekly.rowcount or 0, 0),
+        "accomplishments": max(accomplished.rowcount or 0, 0),
+    }
+
+
+def accomplishment_counts(conn, by, weeks=(), contractors=(), workstreams=()):
+    """
+    Accomplishment counts per workstream or contractor for the Accomplishments
+    Dashboard bar charts. Empty filters mean "no filter".
+
+    Args:
+        conn (Connection): Open connection.
+        by (str): "workstream" or "contractor".
+        weeks (iterable[str]): ISO reporting weeks ("YYYY-MM-DD").
+        contractors (iterable[str]): Contractor names.
+        workstreams (iterable[str]): Workstream names.
+
+    Returns:
+        Series: Count per name, most common first.
+    """
+    c = accomplishment_cube.c
+    key = {"workstream": c.workstreamname, "contractor": c.contractorname}[by]
+    total = func.sum(c.accomplishmentcount).label("count")
+    stmt = select(key, total).group_by(key).order_by(total.desc())
+    if weeks:
+        stmt = stmt.where(c.weekstartdate.in_([date.fromisoformat(w) for w in weeks]))
+    if contractors:
+        stmt = stmt.where(c.contractorname.in_(list(contractors)))
+    if workstreams:
+        stmt = stmt.where(c.workstreamname.in_(list(workstreams)))
+
+    rows = conn.execute(stmt).fetchall()
+    return pd.Series([int(n) for _, n in rows], index=[name for name, _ in rows], name="count", dtype="int64")
+
+
+if __name__ == "__main__":
+    from utils.db import get_engine
+    from utils.schema import create_all
+
+    target = get_engine()
+    create_all(target)
+    with target.begin() as connection:
+        print(rebuild(connection))
@@ -0,0 +1,166 @@
+# This module is the dashboards' data layer. It owns the canonical frames (weekly reports
+# joined to employees, read from the reporting snapshot in utils/snapshots.py, and
+# accomplishments joined to employees and workstreams), each loaded by one query, typed
+# as rows are fetched (utils/fetch.py), and kept warm in the background (see
+# utils/warmer.py). Pages derive their views from these frames with the helpers below
+# instead of querying and re-cleaning the same rows themselves.
+#
+# The Management Dashboard's filtered table comes from `query_weekly_reports` instead:
+# the same columns and typing, with the filters applied in SQL so transfer and memory
+# scale with the selection rather than the whole history.
+
+from collections import namedtuple
+from datetime import date
+
+from sqlalchemy import select, join
+
+from utils.db import employees, weekly_reports, accomplishments, workstreams
+from utils.fetch import fetch_frame
+from utils.incremental import IncrementalFrame
+from utils.snapshots import SNAPSHOT_NAME, snapshot
+from utils.kpis import load_hr_kpis
+
+# tables: names whose data versions (utils/versions.py) invalidate the dataset
+# load: callable(conn) -> value
+# incremental: the IncrementalFrame behind `load`, if any, so a restored copy can seed it
+Dataset = namedtuple("Dataset", ["tables", "load", "incremental"], defaults=(None,))
+
+# Canonical weekly report columns (display name -> snapshot column), in display order.
+# "Hours" is derived from Level of Effort as rows are fetched (see `_prepare_weekly`).
+WEEKLY_COLUMNS = {
+    "Reporting Week": snapshot.c.weekstartdate,
+    "Vendor Name": snapshot.c.vendorname,
+    "Division/Command": snapshot.c.divisioncommand,
+    "Work Product Title": snapshot.c.workproducttitle,
+    "Brief description of individual's contribution": snapshot.c.contributiondescription,
+    "Work Product Status": snapshot.c.status,
+    "Planned or Unplanned": snapshot.c.plannedorunplanned,
+    "If Completed, Date Completed": snapshot.c.datecompleted,
+    "Distinct NFR": snapshot.c.distinctnfr,
+    "Distinct CAP": snapshot.c.distinctcap,
+    "Level of Effort (%)": snapshot.c.effortpercentage,
+    "Contractor (Last Name, First Name)": snapshot.c.contractorname,
+    "Govt TA (Last Name, First Name)": snapshot.c.govttaname,
+    "Labor Category": snapshot.c.laborcategory,
+}
+
+# Low-cardinality columns stored as categoricals, one dictionary per column per dataset.
+# Repeated names are stored once, which shrinks the frames and speeds up the
+# groupby / value_counts / isin calls the pages make on them.
+WEEKLY_CATEGORIES = [
+    "Vendor Name",
+    "Division/Command",
+    "Work Product Status",
+    "Planned or Unplanned",
+    "Contractor (Last Name, First Name)",
+    "Govt TA (Last Name, First Name)",
+    "Labor Category",
+]
+ACCOMPLISHMENT_CATEGORIES = ["Contractor", "Vendor", "Labor Category", "Workstream"]
+
+# Columns the HR KPIs page exports
+HR_COLUMNS = [
+    "Reporting Week",
+    "Work Product Status",
+    "Planned or Unplanned",
+    "Level of Effort (%)",
+    "Contractor (Last Name, First Name)",
+    "Work Product Title",
+    "Division/Command",
+    "Labor Category",
+    "Hours",
+]
+
+
+def _prepare_weekly(batch):
+    """Adds Hours (40 hours == 100% effort) to a fetched batch of weekly report rows."""
+    # Dates and Level of Effort already arrive typed (utils/fetch.py); no effort counts as 0
+    batch["Level of Effort (%)"] = batch["Level of Effort (%)"].fillna(0)
+    batch["Hours"] = (batch["Level of Effort (%)"] / 100 * 40).round(2)
+    return batch
+
+
+def _weekly_select(columns):
+    return select(*[WEEKLY_COLUMNS[name].label(name) for name in columns]).select_from(snapshot)
+
+
+# Incrementally refreshed frames, one per process (see utils/incremental.py)
+_weekly_frame = IncrementalFrame(
+    _weekly_select(WEEKLY_COLUMNS),
+    key=snapshot.c.reportid,
+    timestamp=snapshot.c.updated_at,
+    prepare=_prepare_weekly,
+    categories=WEEKLY_CATEGORIES,
+    tables=(SNAPSHOT_NAME, employees.name),
+    # Employee edits (e.g. a labor category backfill) change snapshot rows without stamping them
+    reload_on=(employees.name,)
+)
+
+_accomplishments_frame = IncrementalFrame(
+    select(
+        accomplishments.c.weekstartdate.label("Reporting Week"),
+        accomplishments.c.description.label("Accomplishment"),
+        employees.c.name.label("Contractor"),
+        employees.c.vendorname.label("Vendor"),
+        employees.c.laborcategory.label("Labor Category"),
+        workstreams.c.name.label("Workstream")
+    ).select_from(
+        join(accomplishments, employees, accomplishments.c.employeeid == employees.c.employeeid)
+        .join(workstreams, accomplishments.c.workstreamid == workstreams.c.workstreamid)
+    ),
+    key=accomplishments.c.accomplishmentid,
+    timestamp=accomplishments.c.created_at,
+    categories=ACCOMPLISHMENT_CATEGORIES,
+    tables=(accomplishments.name, employees.name, workstreams.name),
+    reload_on=(employees.name, workstreams.name)
+)
+
+
+def load_weekly_reports(conn):
+    """Canonical weekly report rows (Management Dashboard and HR KPIs), refreshed by high-water mark."""
+    _weekly_frame.refresh(conn)
+    return _weekly_frame.frame
+
+
+def load_accomplishments(conn):
+    """Accomplishments with contractor and workstream names, refreshed by high-water mark."""
+    _accomplishments_frame.refresh(conn)
+    return _accomplishments_frame.frame
+
+
+def query_weekly_reports(conn, weeks=(), vendors=(), contractors=()):
+    """
+    Weekly report rows narrowed to the Management Dashboard filters in SQL.
+    Empty filters are left out.
+
+    Args:
+        conn (Connection): Open connection.
+        weeks (iterable): Reporting weeks (date or "YYYY-MM-DD" strings).
+        vendors (iterable): Vendor names.
+        contractors (iterable): Contractor names.
+
+    Returns:
+        DataFrame: Matching rows, typed like the canonical frame.
+    """
+    stmt = _weekly_select(WEEKLY_COLUMNS)
+    if weeks:
+        stmt = stmt.where(WEEKLY_COLUMNS["Reporting Week"].in_(
+            [w if isinstance(w, date) else date.fromisoformat(w) for w in weeks]
+        ))
+    if vendors:
+        stmt = stmt.where(WEEKLY_COLUMNS["Vendor Name"].in_(list(vendors)))
+    if contractors:
+        stmt = stmt.where(WEEKLY_COLUMNS["Contractor (Last Name, First Name)"].in_(list(contractors)))
+    return _prepare_weekly(fetch_frame(conn, stmt, categories=WEEKLY_CATEGORIES))
+
+
+def hr_view(df):
+    """HR KPIs page rows: the export columns of the canonical weekly report frame."""
+    return df[HR_COLUMNS]
+
+
+DATASETS = {
+    "weekly_reports": Dataset(_weekly_frame.tables, load_weekly_reports, _weekly_frame),
+    "hr_kpis": Dataset((weekly_reports.name,), load_hr_kpis),
+    "accomplishments": Dataset(_accomplishments_frame.tables, load_accomplishments, _accomplishments_frame),
+}
@@ -4,9 +4,13 @@
 # Avoids repeating schema reflection and config.
 
 import os
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, MetaData, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
 from dotenv import load_dotenv
 
+from utils import schema, snapshots
+
 # Load variables from .env
 load_dotenv()
 
@@ -29,16 +33,33 @@ _engine = None
 _metadata = None
 _tables = {}
 
+def is_memory_sqlite(url):
+    """True for in-memory SQLite URLs (e.g. "sqlite://" or "sqlite:///:memory:")."""
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
 def get_engine():
-    """Return a cached SQLAlchemy engine."""
+    """
+    Return a cached SQLAlchemy engine.
+
+    An in-memory SQLite URL ("sqlite://") gets a single shared connection and is
+    bootstrapped from utils/schema.py (plus the reporting snapshot), which gives a throwaway local database for
+    benchmarking and tests.
+    """
     global _engine
     if _engine is None:
-        _engine = create_engine(
-            DATABASE_URL,
-            echo=False,
-            fast_executemany=True,
-            pool_pre_ping=True
-        )
+        url = make_url(DATABASE_URL)
+        options = {"echo": False, "pool_pre_ping": True}
+        if url.get_backend_name() == "mssql" and url.get_driver_name() == "pyodbc":
+            options["fast_executemany"] = True
+        if is_memory_sqlite(url):
+            options.update(poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+        _engine = create_engine(url, **options)
+        if is_memory_sqlite(url):
+            schema.create_all(_engine)
+            snapshots.create_snapshot(_engine)
     return _engine
 
 
@@ -60,11 +81,17 @@ def get_table(name):
     raise KeyError(f"Table '{name}' not found in database.")
 
 
+def load_tables():
+    """Reflect the schema (once) so the module-level table references are ready."""
+    return get_metadata()
+
+
 # -----------------------------
 # Lazy table references
 # -----------------------------
 # These will only query metadata on first access
-metadata = get_metadata()
+engine = get_engine()
+metadata = load_tables()
 
 employees = get_table("Employees")
 workstreams = get_table("Workstreams")
@@ -77,7 +104,7 @@ def db_healthcheck():
     """Simple connectivity check."""
     try:
         with get_engine().connect() as conn:
-            conn.execute("SELECT 1")
+            conn.execute(text("SELECT 1"))
         return True
     except Exception as e:
         print("Database health check failed:", e)
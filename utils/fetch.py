@@ -0,0 +1,159 @@
+# This module turns query results into typed DataFrames at the driver boundary.
+# Column types come from the statement itself (SQLAlchemy Core selects) or, for raw
+# text queries, from the first non-null value: DECIMAL/NUMERIC and FLOAT columns become
+# float64, DATE and DATETIME columns become datetime64, and columns the caller names
+# become categoricals, optionally encoded against an existing dictionary so batches of
+# the same dataset share one set of codes. Loaders never hand object columns of Decimals
+# or dates to pages, and nothing round-trips through strings to be cleaned afterwards.
+#
+# Rows are streamed from a server-side cursor (`stream_results` / `yield_per`) and copied
+# chunk by chunk into per-column arrays, so only one chunk of Row objects is alive at a
+# time. Peak memory stays close to the finished frame instead of holding the full row
+# list, a column copy of it, and the frame at once.
+
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Numeric, Float, Date, DateTime
+
+# Rows per streamed chunk
+CHUNK_ROWS = 10_000
+
+# Buffer dtype per column kind; None keeps Python objects and types them at the end
+_BUFFER_DTYPES = {"float": "float64", "datetime": "datetime64[us]", "category": "int32", None: object}
+
+
+def _kind(sql_type, values):
+    """'float', 'datetime', or None (let pandas infer) for one result column."""
+    if isinstance(sql_type, (Numeric, Float)):
+        return "float"
+    if isinstance(sql_type, (Date, DateTime)):
+        return "datetime"
+    # Untyped expressions (e.g. func.round) and text queries: look at the data
+    sample = next((v for v in values if v is not None), None)
+    if isinstance(sample, (Decimal, float)):
+        return "float"
+    if isinstance(sample, date):
+        return "datetime"
+    return None
+
+
+def _floats(values):
+    return np.fromiter((np.nan if v is None else float(v) for v in values), dtype="float64", count=len(values))
+
+
+def _datetimes(values):
+    return pd.to_datetime(pd.Series(values, dtype=object), errors="coerce").to_numpy("datetime64[us]")
+
+
+class _ColumnBuilder:
+    """
+    Growable typed array for one result column.
+
+    Typed and categorical columns are converted chunk by chunk into a float64,
+    datetime64, or int32-code buffer. Untyped columns are buffered as objects and
+    typed from their values once all rows are in.
+    """
+
+    def __init__(self, sql_type, categorical, known):
+        if categorical:
+            self.kind = "category"
+        elif isinstance(sql_type, (Numeric, Float, Date, DateTime)):
+            self.kind = _kind(sql_type, ())
+        else:
+            self.kind = None
+        self.buffer = np.empty(CHUNK_ROWS, dtype=_BUFFER_DTYPES[self.kind])
+        self.size = 0
+        if categorical:
+            # Seeded with the caller's dictionary, so existing codes keep their meaning
+            self.categories = list(known) if known is not None else []
+            self.codes = {value: code for code, value in enumerate(self.categories)}
+            self.dtype = known.dtype if known is not None and len(known) else None
+
+    def _encode(self, values):
+        codes = np.empty(len(values), dtype="int32")
+        for i, value in enumerate(values):
+            if value is None:
+                codes[i] = -1
+                continue
+            code = self.codes.get(value)
+            if code is None:
+                code = self.codes[value] = len(self.categories)
+                self.categories.append(value)
+            codes[i] = code
+        return codes
+
+    def append(self, values):
+        end = self.size + len(values)
+        if end > len(self.buffer):
+            # Grow in place where the allocator allows it
+            self.buffer.resize(max(end, len(self.buffer) * 2), refcheck=False)
+        if self.kind == "float":
+            self.buffer[self.size:end] = _floats(values)
+        elif self.kind == "datetime":
+            self.buffer[self.size:end] = _datetimes(values)
+        elif self.kind == "category":
+            self.buffer[self.size:end] = self._encode(values)
+        else:
+            self.buffer[self.size:end] = values
+        self.size = end
+
+    def finish(self):
+        # Drop the spare capacity in place rather than copying the column
+        self.buffer.resize(self.size, refcheck=False)
+        if self.kind == "category":
+            return pd.Categorical.from_codes(self.buffer, categories=pd.Index(self.categories, dtype=self.dtype))
+        if self.kind is not None:
+            return self.buffer
+        kind = _kind(None, self.buffer)
+        if kind == "float":
+            return _floats(self.buffer)
+        if kind == "datetime":
+            return _datetimes(self.buffer)
+        return pd.Series(self.buffer).infer_objects()
+
+
+def fetch_frame(conn, stmt, categories=(), chunk_rows=CHUNK_ROWS):
+    """
+    Executes `stmt` and streams its rows into a DataFrame with typed columns.
+
+    Args:
+        conn (Connection): Open connection.
+        stmt (Executable): Core select (column types taken from it) or text query.
+        categories (iterable[str] or dict): Result columns to return as categoricals.
+            A dict maps each column to its current dictionary (Index of categories);
+            values are encoded against it and new ones appended, so the result can be
+            concatenated with earlier frames without losing the categorical dtype.
+        chunk_rows (int): Rows fetched from the server-side cursor per chunk.
+
+    Returns:
+        DataFrame: One column per result column, in result order.
+    """
+    if not isinstance(categories, dict):
+        categories = dict.fromkeys(categories)
+
+    # Options on this statement only; Connection.execution_options would change the connection
+    result = conn.execute(stmt, execution_options={"stream_results": True, "yield_per": chunk_rows})
+    names = list(result.keys())
+    selected = getattr(stmt, "selected_columns", None)
+    types = [col.type for col in selected] if selected is not None else [None] * len(names)
+    builders = [
+        _ColumnBuilder(sql_type, name in categories, categories.get(name))
+        for name, sql_type in zip(names, types)
+    ]
+
+    rows = 0
+    for chunk in result.partitions():
+        for i, builder in enumerate(builders):
+            builder.append([row[i] for row in chunk])
+        rows += len(chunk)
+
+    # Built by position, so unlabeled expressions with the same name do not collide
+    df = pd.DataFrame(
+        {i: builder.finish() for i, builder in enumerate(builders)},
+        index=pd.RangeIndex(rows), columns=range(len(names))
+    )
+    df.columns = names
+    return df
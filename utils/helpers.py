@@ -6,6 +6,11 @@ from sqlalchemy import select, insert, func
 import hashlib
 
 from utils.db import employees, workstreams, hourstracking, employees
+from utils.snapshots import refresh_snapshot
+from utils.versions import bump_versions
+
+# Precompiled once; used by both scalar and column-level text normalization
+_WHITESPACE_RE = re.compile(r"\s+")
 
 if os.getenv("CI") != "true":  # Skip this in CI
     from utils.db import load_tables
@@ -154,6 +159,9 @@ def get_or_create_employee(conn, contractor_name, vendor=None, laborcategory=Non
                 .where(employees_table.c.employeeid == emp_id)
                 .values(**updates)
             )
+            # The reporting snapshot carries the employee's vendor and labor category
+            refresh_snapshot(conn, [emp_id])
+            bump_versions(conn, employees_table.name)
         return emp_id
 
     result = conn.execute(
@@ -174,6 +182,7 @@ def get_or_create_employee(conn, contractor_name, vendor=None, laborcategory=Non
         .where(employees_table.c.employeeid == emp_id)
         .values(publicid=public_id)
     )
+    bump_versions(conn, employees_table.name)
 
     return emp_id
 
@@ -190,8 +199,8 @@ def get_or_create_workstream(conn, workstream_name, workstreams_table=None):
 
     # Use correct column names with SQLAlchemy table reflection
     ws = conn.execute(
-        select(workstreams_table.c.WorkstreamID).where(
-            func.lower(workstreams_table.c.Name) == normalized_name.lower()
+        select(workstreams_table.c.workstreamid).where(
+            func.lower(workstreams_table.c.name) == normalized_name.lower()
         )
     ).scalar_one_or_none()
 
@@ -200,9 +209,10 @@ def get_or_create_workstream(conn, workstream_name, workstreams_table=None):
 
     result = conn.execute(
         workstreams_table.insert()
-        .values(Name=normalized_name)
-        .returning(workstreams_table.c.WorkstreamID)
+        .values(name=normalized_name)
+        .returning(workstreams_table.c.workstreamid)
     )
+    bump_versions(conn, workstreams_table.name)
 
     return result.scalar_one()
 
@@ -246,7 +256,47 @@ def normalize_text(value: str) -> str:
     
     if not isinstance(value, str):
         return ""
-    return re.sub(r"\s+", " ", value.strip()).title()
+    return _WHITESPACE_RE.sub(" ", value.strip()).title()
+
+
+def normalize_text_series(values: pd.Series) -> pd.Series:
+    """
+    Vectorized `normalize_text` for a whole column. Produces exactly the same
+    output as applying `normalize_text` to each value, without a Python call per row.
+
+    Args:
+        values (pd.Series): Column of strings (non-string values become "").
+
+    Returns:
+        pd.Series: Cleaned and formatted strings, same index as the input.
+    """
+    # Object dtype keeps Python's str.strip/str.title semantics (Arrow-backed
+    # strings would use different Unicode rules and leave non-strings as-is)
+    values = values.astype(object)
+    try:
+        strings = values.str
+    except AttributeError:  # no string values at all
+        return pd.Series("", index=values.index, dtype=object)
+    return (
+        strings.strip()
+        .str.replace(_WHITESPACE_RE, " ", regex=True)
+        .str.title()
+        .fillna("")
+        .astype(object)
+    )
+
+def normalize_flag_series(values: pd.Series) -> pd.Series:
+    """
+    Canonical form for enum-like text columns (e.g. "planned"/"unplanned"):
+    normalized like `normalize_text_series`, then lowercased.
+
+    Args:
+        values (pd.Series): Column of strings.
+
+    Returns:
+        pd.Series: Lowercase normalized strings.
+    """
+    return normalize_text_series(values).str.lower()
 
 def generate_employee_key(name: str, vendor: str) -> str:
     """
@@ -264,6 +314,27 @@ def generate_employee_key(name: str, vendor: str) -> str:
     base = f'{normalize_text(name)}|{normalize_text(vendor)}'
     return hashlib.sha256(base.encode()).hexdigest()
 
+def generate_employee_keys(names: pd.Series, vendors: pd.Series) -> pd.Series:
+    """
+    Batch version of `generate_employee_key` for (name, vendor) columns.
+    Normalization is vectorized; only the SHA-256 digest runs per row.
+
+    Args:
+        names (pd.Series): Full names.
+        vendors (pd.Series): Vendor names, positionally aligned with `names`.
+
+    Returns:
+        pd.Series: Hexadecimal SHA-256 hash strings, indexed like `names`.
+    """
+    names = pd.Series(names)
+    vendors = pd.Series(vendors)
+    base = normalize_text_series(names).to_numpy() + "|" + normalize_text_series(vendors).to_numpy()
+    return pd.Series(
+        [hashlib.sha256(b.encode()).hexdigest() for b in base],
+        index=names.index,
+        dtype=object
+    )
+
 def generate_public_id(name: str, numeric_id: int) -> str:
     """
     Generates a readable public ID in the format LAST-FIRST-### based on name and ID.
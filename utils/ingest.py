@@ -0,0 +1,294 @@
+# This module provides the set-based ingest path for weekly report submissions.
+# Rows are bulk-loaded into a session-temporary staging table (no CREATE privilege on the
+# application schema needed, nothing left in its catalog), then employees, weekly reports,
+# and hours are resolved and inserted with one INSERT ... SELECT each, so the number
+# of database round trips stays flat no matter how many rows are submitted.
+
+import uuid
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, String, Text, Date, DateTime, Numeric,
+    select, insert, exists, func, literal, null, bindparam, or_
+)
+
+from utils.db import employees, weekly_reports, hourstracking
+from utils.cube import refresh_weekly_cube
+from utils.snapshots import refresh_snapshot
+from utils.versions import bump_versions
+from utils.helpers import normalize_text_series, normalize_flag_series, generate_employee_keys
+
+SOURCE_FILE = "manual_form_submission"
+
+# Weekly report text columns that are stored in normalized (trimmed, title case) form.
+# Together with the lowercase planned/unplanned flag these are the canonical forms the
+# dashboards rely on (see utils/migrations/canonical_text.py for the backfill).
+NORMALIZED_COLUMNS = [
+    "divisioncommand", "workproducttitle", "contributiondescription",
+    "status", "distinctnfr", "distinctcap", "govttaname"
+]
+
+
+def _make_staging_table(name=None, dialect_name=None):
+    """
+    Builds a throwaway staging table definition for one ingest batch.
+    The table is session-temporary: `CREATE TEMPORARY TABLE` on SQLite and
+    PostgreSQL, a `#`-prefixed local temp table on SQL Server.
+
+    Args:
+        name (str, optional): Table name. Defaults to a unique per-batch name.
+        dialect_name (str, optional): Dialect of the connection it will be created on.
+
+    Returns:
+        Table: SQLAlchemy table bound to its own MetaData.
+    """
+    name = name or f"stage_weekly_{uuid.uuid4().hex[:12]}"
+    prefixes = ["TEMPORARY"]
+    if dialect_name == "mssql":
+        # SQL Server has no TEMPORARY keyword; the # prefix makes the table session-local
+        name, prefixes = f"#{name.lstrip('#')}", []
+    return Table(
+        name, MetaData(),
+        Column("rownum", Integer, primary_key=True, autoincrement=False),
+        Column("uniquekey", String(64), nullable=False),
+        Column("contractorname", String(255)),
+        Column("vendorname", String(255)),
+        Column("laborcategory", String(255)),
+        Column("weekstartdate", Date),
+        Column("divisioncommand", String(255)),
+        Column("workproducttitle", String(255)),
+        Column("contributiondescription", Text),
+        Column("status", String(100)),
+        Column("plannedorunplanned", String(50)),
+        Column("datecompleted", Date),
+        Column("distinctnfr", String(255)),
+        Column("distinctcap", String(255)),
+        Column("effortpercentage", Numeric(5, 2)),
+        Column("hoursworked", Numeric(5, 2)),
+        Column("govttaname", String(255)),
+        prefixes=prefixes,
+    )
+
+
+def _to_date(value):
+    """Converts a Timestamp/date-like value to a date, mapping NaT/None to None."""
+    if value is None or pd.isnull(value):
+        return None
+    return pd.Timestamp(value).date()
+
+
+def _column(df, col, default=""):
+    """Returns `df[col]`, or a column filled with `default` if it is missing."""
+    if col in df.columns:
+        return df[col]
+    return pd.Series(default, index=df.index, dtype=object)
+
+
+def prepare_weekly_rows(df):
+    """
+    Normalizes a cleaned weekly report DataFrame into staging rows.
+
+    Expects database column names (after renaming with the form's column map),
+    parsed date columns, numeric `hoursworked`, and a computed `effortpercentage`.
+    Rows without a contractor name are skipped.
+
+    Args:
+        df (pd.DataFrame): Cleaned weekly report rows.
+
+    Returns:
+        list[dict]: One dict per row, keyed by staging table column.
+    """
+    contractors = normalize_text_series(_column(df, "contractorname"))
+    keep = contractors != ""
+    df = df[keep]
+    contractors = contractors[keep]
+
+    vendors = normalize_text_series(_column(df, "vendorname")).replace("", "Unknown Vendor")
+    staged = pd.DataFrame({
+        "rownum": range(len(df)),
+        "uniquekey": generate_employee_keys(contractors, vendors).to_numpy(),
+        "contractorname": contractors.to_numpy(),
+        "vendorname": vendors.to_numpy(),
+        "laborcategory": normalize_text_series(_column(df, "laborcategory"))
+            .replace("", "Unknown LCAT").to_numpy(),
+        "weekstartdate": [_to_date(v) for v in _column(df, "weekstartdate", None)],
+        "datecompleted": [_to_date(v) for v in _column(df, "datecompleted", None)],
+        "plannedorunplanned": normalize_flag_series(_column(df, "plannedorunplanned")).to_numpy(),
+        "effortpercentage": pd.to_numeric(_column(df, "effortpercentage", 0), errors="coerce")
+            .fillna(0).astype(float).to_numpy(),
+        "hoursworked": pd.to_numeric(_column(df, "hoursworked", 0), errors="coerce")
+            .fillna(0).astype(float).to_numpy(),
+    })
+    for col in NORMALIZED_COLUMNS:
+        staged[col] = normalize_text_series(_column(df, col)).to_numpy()
+
+    # Object dtype hands the driver plain Python values (int/float/str/date/None)
+    return staged.astype(object).to_dict("records")
+
+
+def bulk_ingest_weekly_reports(conn, rows, entered_by="anonymous", source_file=SOURCE_FILE,
+                               employees_table=None, weekly_reports_table=None, hours_table=None,
+                               cube_table=None):
+    """
+    Loads prepared weekly report rows through a staging table and merges them
+    into Employees, WeeklyReports, and HoursTracking with set-based SQL, then
+    refreshes the weekly fact cube for the weeks in the batch and the reporting
+    snapshot for its employees, and bumps the data versions of the written tables.
+
+    Must be called inside a transaction (e.g. `with engine.begin() as conn`);
+    the temporary staging table is created and dropped within it, so a failed
+    batch rolls back along with its staging table.
+
+    Args:
+        conn (Connection): SQLAlchemy database connection.
+        rows (list[dict]): Output of `prepare_weekly_rows`.
+        entered_by (str): Audit value for `entered_by`.
+        source_file (str): Audit value for `source_file`.
+
+    Returns:
+        dict: Counts of inserted `employees`, `weekly_reports`, and `hours` rows.
+    """
+    employees_table = employees if employees_table is None else employees_table
+    weekly_reports_table = weekly_reports if weekly_reports_table is None else weekly_reports_table
+    hours_table = hourstracking if hours_table is None else hours_table
+
+    counts = {"employees": 0, "weekly_reports": 0, "hours": 0}
+    if not rows:
+        return counts
+
+    e = employees_table
+    stage = _make_staging_table(dialect_name=conn.dialect.name)
+    stage.create(conn)
+
+    # 1. Bulk load the batch (single executemany)
+    conn.execute(insert(stage), rows)
+    s = stage.c
+
+    # 2. Insert employees that don't exist yet, one row per unique key
+    new_employees = (
+        select(
+            func.min(s.contractorname),
+            func.min(s.vendorname),
+            func.min(s.laborcategory),
+            s.uniquekey,
+        )
+        .where(~exists().where(e.c.uniquekey == s.uniquekey))
+        .group_by(s.uniquekey)
+    )
+    result = conn.execute(
+        insert(e).from_select(["name", "vendorname", "laborcategory", "uniquekey"], new_employees)
+    )
+    counts["employees"] = max(result.rowcount or 0, 0)
+
+    # 3. Backfill missing vendor / labor category on existing employees
+    backfill_candidates = conn.execute(
+        select(e.c.employeeid)
+        .where(e.c.uniquekey.in_(select(s.uniquekey)))
+        .where(or_(*[(e.c[col].is_(None)) | (e.c[col] == "") for col in ("vendorname", "laborcategory")]))
+    ).scalars().all()
+    backfilled = 0
+    for col in ("vendorname", "laborcategory"):
+        staged_value = (
+            select(func.min(s[col]))
+            .where(s.uniquekey == e.c.uniquekey)
+            .scalar_subquery()
+        )
+        result = conn.execute(
+            e.update()
+            .where(e.c.uniquekey.in_(select(s.uniquekey)))
+            .where((e.c[col].is_(None)) | (e.c[col] == ""))
+            .values({col: staged_value})
+        )
+        backfilled += max(result.rowcount or 0, 0)
+
+    # 4. Assign public IDs to newly created employees
+    missing_ids = conn.execute(
+        select(e.c.employeeid)
+        .where(e.c.publicid.is_(None))
+        .where(e.c.uniquekey.in_(select(s.uniquekey)))
+    ).scalars().all()
+    if missing_ids:
+        conn.execute(
+            e.update()
+            .where(e.c.employeeid == bindparam("emp_id"))
+            .values(publicid=bindparam("public_id")),
+            [{"emp_id": emp_id, "public_id": f"E{emp_id:04d}"} for emp_id in missing_ids]
+        )
+
+    # 5. Weekly reports, joined to employees on the unique key
+    created_at = datetime.utcnow()
+    joined = stage.join(e, e.c.uniquekey == s.uniquekey)
+    weekly_select = (
+        select(
+            e.c.employeeid, s.weekstartdate, s.divisioncommand, s.workproducttitle,
+            s.contributiondescription, s.status, s.plannedorunplanned, s.datecompleted,
+            s.distinctnfr, s.distinctcap, s.effortpercentage, s.contractorname, s.govttaname,
+            literal(created_at, DateTime), literal(entered_by, Text), literal(source_file, Text),
+        )
+        .select_from(joined)
+        .order_by(s.rownum)
+    )
+    result = conn.execute(
+        insert(weekly_reports_table).from_select(
+            [
+                "employeeid", "weekstartdate", "divisioncommand", "workproducttitle",
+                "contributiondescription", "status", "plannedorunplanned", "datecompleted",
+                "distinctnfr", "distinctcap", "effortpercentage", "contractorname", "govttaname",
+                "created_at", "entered_by", "source_file",
+            ],
+            weekly_select
+        )
+    )
+    counts["weekly_reports"] = max(result.rowcount or 0, 0)
+
+    # 6. Hours tracking for rows with hours logged
+    hours_select = (
+        select(
+            e.c.employeeid, null(), s.weekstartdate, s.hoursworked, s.effortpercentage,
+            literal(created_at, DateTime), literal(entered_by, Text), literal(source_file, Text),
+        )
+        .select_from(joined)
+        .where(s.hoursworked > 0)
+        .order_by(s.rownum)
+    )
+    result = conn.execute(
+        insert(hours_table).from_select(
+            [
+                "employeeid", "workstreamid", "reportingweek", "hoursworked", "levelofeffort",
+                "created_at", "entered_by", "source_file",
+            ],
+            hours_select
+        )
+    )
+    counts["hours"] = max(result.rowcount or 0, 0)
+
+    batch_employees = conn.execute(
+        select(e.c.employeeid).where(e.c.uniquekey.in_(select(s.uniquekey)))
+    ).scalars().all()
+    stage.drop(conn)
+
+    # 7. Roll the touched weeks up into the fact cube, in the same transaction. The cube
+    #    carries vendor and labor category, so a backfill also touches the weeks of
+    #    those employees' earlier reports.
+    weeks = {row["weekstartdate"] for row in rows}
+    if backfilled and backfill_candidates:
+        weeks |= set(conn.execute(
+            select(weekly_reports_table.c.weekstartdate)
+            .where(weekly_reports_table.c.employeeid.in_(backfill_candidates))
+            .distinct()
+        ).scalars())
+    refresh_weekly_cube(
+        conn, weeks,
+        weekly_reports_table=weekly_reports_table, employees_table=e, cube_table=cube_table
+    )
+    # 8. Replace the batch employees' rows in the reporting snapshot (utils/snapshots.py);
+    #    this covers their new reports and any vendor / labor category backfilled above
+    refresh_snapshot(conn, batch_employees)
+    # Employees only when they changed: an employees bump makes the dashboards reload in full
+    changed = [weekly_reports_table.name, hours_table.name]
+    if counts["employees"] or backfilled or missing_ids:
+        changed.append(e.name)
+    bump_versions(conn, *changed)
+
+    return counts
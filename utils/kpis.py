@@ -0,0 +1,211 @@
+# This module computes the HR KPIs as grouped SQL aggregates, one statement per KPI family.
+# The HR KPIs page receives small summary frames instead of the full WeeklyReports history.
+# Every KPI reads the weekly fact cube (top work products: the work product cube; see
+# utils/cube.py), so query time tracks the number of weeks and dimension values rather
+# than the number of reports.
+# Hours follow the dashboard convention: 40 hours == 100% level of effort.
+
+from sqlalchemy import select, func, Date
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from utils.fetch import fetch_frame
+from utils.schema import weekly_fact_cube, work_product_cube
+
+cube = weekly_fact_cube.c
+IS_UNPLANNED = cube.plannedorunplanned == "unplanned"
+
+
+class month_start(FunctionElement):
+    """First day of the month of a date column, compiled per dialect."""
+    type = Date()
+    inherit_cache = True
+    name = "month_start"
+
+
+@compiles(month_start)
+def _month_start_sqlite(element, compiler, **kw):
+    return "date(%s, 'start of month')" % compiler.process(element.clauses, **kw)
+
+
+@compiles(month_start, "postgresql")
+def _month_start_postgresql(element, compiler, **kw):
+    return "CAST(date_trunc('month', %s) AS DATE)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(month_start, "mssql")
+def _month_start_mssql(element, compiler, **kw):
+    arg = compiler.process(element.clauses, **kw)
+    return "DATEFROMPARTS(YEAR(%s), MONTH(%s), 1)" % (arg, arg)
+
+
+def _frame(conn, stmt, columns):
+    """Executes `stmt` and returns its rows as a typed DataFrame (utils/fetch.py) named `columns`."""
+    df = fetch_frame(conn, stmt)
+    df.columns = columns
+    return df
+
+
+def summary_kpis(conn):
+    """
+    Headline metrics in one statement.
+
+    Returns:
+        dict: total_hours, avg_hours_per_contractor, unplanned_hours, unplanned_pct.
+    """
+    per_contractor = (
+        select(func.sum(cube.hours).label("hours"))
+        .where(cube.contractorname.is_not(None))
+        .group_by(cube.contractorname)
+        .subquery()
+    )
+    stmt = select(
+        select(func.sum(cube.hours)).scalar_subquery(),
+        select(func.avg(per_contractor.c.hours)).scalar_subquery(),
+        select(func.sum(cube.hours)).where(IS_UNPLANNED).scalar_subquery(),
+    )
+    total, average, unplanned = (float(v or 0) for v in conn.execute(stmt).one())
+    return {
+        "total_hours": total,
+        "avg_hours_per_contractor": average,
+        "unplanned_hours": unplanned,
+        "unplanned_pct": (unplanned / total * 100) if total > 0 else 0,
+    }
+
+
+def status_counts(conn):
+    """Report count per Work Product Status, most common first."""
+    count = func.sum(cube.reportcount).label("count")
+    stmt = (
+        select(cube.status, count)
+        .where(cube.status.is_not(None))
+        .group_by(cube.status)
+        .order_by(count.desc())
+    )
+    return _frame(conn, stmt, ["Work Product Status", "count"])
+
+
+def weekly_completed(conn):
+    """Completed work products per reporting week."""
+    stmt = (
+        select(cube.weekstartdate, func.sum(cube.reportcount))
+        .where(cube.status == "Completed")
+        .group_by(cube.weekstartdate)
+        .order_by(cube.weekstartdate)
+    )
+    return _frame(conn, stmt, ["Reporting Week", "count"])
+
+
+def effort_by_division(conn):
+    """Total Level of Effort (%) per Division/Command, ascending (for horizontal bars)."""
+    total = func.sum(cube.effortpercentage).label("effort")
+    stmt = (
+        select(cube.divisioncommand, total)
+        .where(cube.divisioncommand.is_not(None))
+        .group_by(cube.divisioncommand)
+        .order_by(total)
+    )
+    return _frame(conn, stmt, ["Division/Command", "Level of Effort (%)"])
+
+
+def unplanned_hours_by_division(conn):
+    """Unplanned hours per Division/Command, ascending (for horizontal bars)."""
+    total = func.sum(cube.hours).label("hours")
+    stmt = (
+        select(cube.divisioncommand, total)
+        .where(IS_UNPLANNED)
+        .where(cube.divisioncommand.is_not(None))
+        .group_by(cube.divisioncommand)
+        .order_by(total)
+    )
+    return _frame(conn, stmt, ["Division/Command", "Hours"])
+
+
+def top_work_products(conn, limit=5):
+    """Work products with the most total hours, with their report counts."""
+    products = work_product_cube.c
+    total = func.sum(products.hours).label("total_hours")
+    stmt = (
+        select(products.workproducttitle, total, func.sum(products.reportcount))
+        .where(products.workproducttitle.is_not(None))
+        .group_by(products.workproducttitle)
+        .order_by(total.desc())
+        .limit(limit)
+    )
+    return _frame(conn, stmt, ["Work Product Title", "Total_Hours", "Frequency"])
+
+
+def labor_category_counts(conn):
+    """Report count per employee Labor Category, most common first."""
+    count = func.sum(cube.reportcount).label("count")
+    stmt = (
+        select(cube.laborcategory, count)
+        .where(cube.laborcategory.is_not(None))
+        .group_by(cube.laborcategory)
+        .order_by(count.desc())
+    )
+    return _frame(conn, stmt, ["Labor Category", "count"])
+
+
+def active_contractors(conn):
+    """Set of contractor names with at least one weekly report."""
+    stmt = select(cube.contractorname).where(cube.contractorname.is_not(None)).distinct()
+    return set(conn.execute(stmt).scalars())
+
+
+def contractor_count(conn):
+    """Number of distinct contractors with weekly reports (rows of the heatmap)."""
+    stmt = select(func.count(cube.contractorname.distinct()))
+    return conn.execute(stmt).scalar() or 0
+
+
+def monthly_hours(conn, limit=None, offset=0):
+    """
+    Hours per contractor and calendar month as a long table, bucketed and summed in SQL.
+
+    Contractors are paged in name order, so a page always holds complete rows
+    of the contractor x month heatmap.
+
+    Args:
+        conn (Connection): Open connection.
+        limit (int, optional): Contractors per page. None returns every contractor.
+        offset (int): Contractors to skip.
+
+    Returns:
+        DataFrame: Contractor, Month ("YYYY-MM"), Hours.
+    """
+    page = select(cube.contractorname).where(cube.contractorname.is_not(None)).distinct()
+    page = page.order_by(cube.contractorname)
+    if limit is not None:
+        page = page.limit(limit).offset(offset)
+    page = page.subquery()
+
+    month = month_start(cube.weekstartdate).label("month")
+    stmt = (
+        select(cube.contractorname, month, func.sum(cube.hours))
+        .join(page, cube.contractorname == page.c.contractorname)
+        .group_by(cube.contractorname, month)
+        .order_by(cube.contractorname, month)
+    )
+    df = _frame(conn, stmt, ["Contractor", "Month", "Hours"])
+    df["Month"] = df["Month"].dt.strftime("%Y-%m")
+    return df
+
+
+def load_hr_kpis(conn):
+    """
+    Runs every KPI family for the HR KPIs page.
+
+    Returns:
+        dict: KPI name -> dict / DataFrame / set.
+    """
+    return {
+        "summary": summary_kpis(conn),
+        "status_counts": status_counts(conn),
+        "weekly_completed": weekly_completed(conn),
+        "effort_by_division": effort_by_division(conn),
+        "unplanned_by_division": unplanned_hours_by_division(conn),
+        "top_work_products": top_work_products(conn),
+        "labor_category_counts": labor_category_counts(conn),
+        "active_contractors": active_contractors(conn),
+    }
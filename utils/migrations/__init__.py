@@ -0,0 +1,22 @@
+# One-off schema and data migrations for the WSR database.
+# Each module exposes an `upgrade(engine)` function and can be run directly, e.g.:
+#   python -m utils.migrations.canonical_text
+
+from sqlalchemy import inspect
+
+
+def find_table_name(engine, name):
+    """
+    Returns a table's name as stored in the database (case-insensitive match).
+
+    Args:
+        engine (Engine): Target engine.
+        name (str): Table name, any case.
+
+    Returns:
+        str: The stored table name.
+    """
+    for table_name in inspect(engine).get_table_names():
+        if table_name.lower() == name.lower():
+            return table_name
+    raise KeyError(f"Table '{name}' not found in database.")
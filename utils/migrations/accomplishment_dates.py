@@ -0,0 +1,122 @@
+# Adds a real DATE column for the Accomplishments reporting week.
+# Accomplishments.DateRange holds "%m/%d/%Y" strings; this migration adds
+# Accomplishments.WeekStartDate, parses existing strings in chunks with that explicit
+# format, and indexes (EmployeeID, WeekStartDate) so week filters can run in SQL.
+# Backfilled rows keep their timestamps, so each chunk bumps the table's data version
+# (utils/versions.py) and cached dashboards reload.
+#
+# Usage:
+#   python -m utils.migrations.accomplishment_dates
+
+import pandas as pd
+from sqlalchemy import MetaData, Table, Index, inspect, select, bindparam, text
+
+from utils.db import get_engine
+from utils.migrations import find_table_name
+from utils.schema import ACCOMPLISHMENTS_WEEK_INDEX, data_versions
+from utils.versions import bump_versions
+
+TABLE_NAME = "accomplishments"
+DATE_COLUMN = "weekstartdate"
+DATE_FORMAT = "%m/%d/%Y"
+INDEX_NAME = ACCOMPLISHMENTS_WEEK_INDEX
+
+
+def add_date_column(engine, table_name):
+    """
+    Adds the DATE column if it does not exist yet.
+
+    Returns:
+        bool: True if the column was added.
+    """
+    columns = {col["name"].lower() for col in inspect(engine).get_columns(table_name)}
+    if DATE_COLUMN in columns:
+        return False
+
+    preparer = engine.dialect.identifier_preparer
+    add = "ADD" if engine.dialect.name == "mssql" else "ADD COLUMN"
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"ALTER TABLE {preparer.quote(table_name)} {add} {DATE_COLUMN} DATE"
+        ))
+    return True
+
+
+def backfill_dates(engine, table, chunk_size=5000):
+    """
+    Parses `daterange` strings into the DATE column, one transaction per chunk.
+    Rows whose string does not match `DATE_FORMAT` are left NULL.
+
+    Returns:
+        int: Number of rows backfilled.
+    """
+    pk = table.c.accomplishmentid
+    update_stmt = (
+        table.update()
+        .where(pk == bindparam("_pk"))
+        .values({DATE_COLUMN: bindparam("_week")})
+    )
+
+    updated = 0
+    last_pk = None
+    while True:
+        stmt = (
+            select(pk, table.c.daterange)
+            .where(table.c[DATE_COLUMN].is_(None))
+            .where(table.c.daterange.is_not(None))
+            .order_by(pk)
+            .limit(chunk_size)
+        )
+        if last_pk is not None:
+            stmt = stmt.where(pk > last_pk)
+
+        with engine.begin() as conn:
+            chunk = pd.DataFrame(conn.execute(stmt).fetchall(), columns=["pk", "daterange"])
+            if chunk.empty:
+                break
+            pks = chunk["pk"].astype(object)
+            last_pk = pks.iloc[-1]
+
+            weeks = pd.to_datetime(chunk["daterange"].str.strip(), format=DATE_FORMAT, errors="coerce")
+            parsed = weeks.notna()
+            if parsed.any():
+                params = [
+                    {"_pk": row_pk, "_week": week.date()}
+                    for row_pk, week in zip(pks[parsed], weeks[parsed])
+                ]
+                conn.execute(update_stmt, params)
+                bump_versions(conn, table.name)
+                updated += len(params)
+
+        if len(chunk) < chunk_size:
+            break
+    return updated
+
+
+def upgrade(engine=None, chunk_size=5000):
+    """
+    Adds, backfills, and indexes Accomplishments.WeekStartDate. Safe to re-run.
+
+    Args:
+        engine (Engine, optional): Target engine. Defaults to the shared engine.
+        chunk_size (int): Rows parsed and updated per transaction.
+
+    Returns:
+        dict: `column_added` flag and number of `rows_backfilled`.
+    """
+    engine = engine or get_engine()
+    table_name = find_table_name(engine, TABLE_NAME)
+    data_versions.create(engine, checkfirst=True)
+    column_added = add_date_column(engine, table_name)
+
+    # Reflect after the ALTER so the new column is part of the table definition
+    table = Table(table_name, MetaData(), autoload_with=engine)
+    rows_backfilled = backfill_dates(engine, table, chunk_size=chunk_size)
+    Index(INDEX_NAME, table.c.employeeid, table.c[DATE_COLUMN]).create(engine, checkfirst=True)
+
+    return {"column_added": column_added, "rows_backfilled": rows_backfilled}
+
+
+if __name__ == "__main__":
+    result = upgrade()
+    print(f"column added: {result['column_added']}, rows backfilled: {result['rows_backfilled']}")
@@ -0,0 +1,131 @@
+# Backfill job that rewrites existing text columns into the canonical forms the
+# ingest path now guarantees (trimmed, collapsed whitespace, title case; lowercase
+# for planned/unplanned). Once it has run, dashboards can load these columns as-is
+# instead of re-cleaning them on every reload. Rows are rewritten in place without
+# touching their timestamps, so each chunk bumps its table's data version
+# (utils/versions.py) and cached dashboards reload instead of keeping the old text.
+#
+# Usage:
+#   python -m utils.migrations.canonical_text
+
+import pandas as pd
+from sqlalchemy import select, bindparam
+
+from utils.db import get_engine, employees, workstreams, weekly_reports, accomplishments
+from utils.helpers import normalize_text_series, normalize_flag_series
+from utils.schema import data_versions
+from utils.versions import bump_versions
+
+
+# Table -> (primary key column, {text column: canonicalizer})
+CANONICAL_COLUMNS = {
+    "weeklyreports": ("reportid", {
+        "divisioncommand": normalize_text_series,
+        "workproducttitle": normalize_text_series,
+        "contributiondescription": normalize_text_series,
+        "status": normalize_text_series,
+        "plannedorunplanned": normalize_flag_series,
+        "distinctnfr": normalize_text_series,
+        "distinctcap": normalize_text_series,
+        "contractorname": normalize_text_series,
+        "govttaname": normalize_text_series,
+    }),
+    "employees": ("employeeid", {
+        "name": normalize_text_series,
+        "vendorname": normalize_text_series,
+        "laborcategory": normalize_text_series,
+    }),
+    "workstreams": ("workstreamid", {
+        "name": normalize_text_series,
+    }),
+    "accomplishments": ("accomplishmentid", {
+        "description": normalize_text_series,
+    }),
+}
+
+
+def _default_tables():
+    return {
+        "weeklyreports": weekly_reports,
+        "employees": employees,
+        "workstreams": workstreams,
+        "accomplishments": accomplishments,
+    }
+
+
+def _backfill_table(engine, table, pk, canonicalizers, chunk_size):
+    """Canonicalizes one table in primary-key order, one transaction per chunk."""
+    canonicalizers = {col: fn for col, fn in canonicalizers.items() if col in table.c}
+    columns = list(canonicalizers)
+    update_stmt = (
+        table.update()
+        .where(table.c[pk] == bindparam("_pk"))
+        .values({col: bindparam(f"_{col}") for col in columns})
+    )
+
+    updated = 0
+    last_pk = None
+    while True:
+        stmt = select(table.c[pk], *[table.c[col] for col in columns]).order_by(table.c[pk]).limit(chunk_size)
+        if last_pk is not None:
+            stmt = stmt.where(table.c[pk] > last_pk)
+
+        with engine.begin() as conn:
+            chunk = pd.DataFrame(conn.execute(stmt).fetchall(), columns=[pk] + columns)
+            if chunk.empty:
+                break
+            # Plain Python keys (not numpy scalars) for the driver
+            pks = chunk[pk].astype(object)
+            last_pk = pks.iloc[-1]
+
+            # Only rewrite non-null values whose canonical form differs
+            changed = pd.Series(False, index=chunk.index)
+            canonical = {}
+            for col, canonicalize in canonicalizers.items():
+                original = chunk[col].astype(object)
+                canonical[col] = canonicalize(original).where(original.notna(), None)
+                changed |= original.notna() & (canonical[col] != original)
+
+            if changed.any():
+                params = [
+                    {"_pk": row_pk, **{f"_{col}": canonical[col].at[idx] for col in columns}}
+                    for idx, row_pk in pks[changed].items()
+                ]
+                conn.execute(update_stmt, params)
+                bump_versions(conn, table.name)
+                updated += len(params)
+
+        if len(chunk) < chunk_size:
+            break
+    return updated
+
+
+def upgrade(engine=None, chunk_size=5000, tables=None):
+    """
+    Rewrites text columns of existing rows into canonical form.
+
+    Safe to re-run: rows already in canonical form are not touched.
+
+    Args:
+        engine (Engine, optional): Target engine. Defaults to the shared engine.
+        chunk_size (int): Rows read and updated per transaction.
+        tables (dict, optional): Table name -> Table overrides (defaults to the reflected tables).
+
+    Returns:
+        dict: Number of updated rows per table.
+    """
+    engine = engine or get_engine()
+    tables = tables or _default_tables()
+    data_versions.create(engine, checkfirst=True)
+
+    results = {}
+    for name, (pk, canonicalizers) in CANONICAL_COLUMNS.items():
+        if name not in tables:
+            continue
+        results[name] = _backfill_table(engine, tables[name], pk, canonicalizers, chunk_size)
+    return results
+
+
+if __name__ == "__main__":
+    for table_name, count in upgrade().items():
+        print(f"{table_name}: {count} rows canonicalized")
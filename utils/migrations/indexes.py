@@ -0,0 +1,158 @@
+# Secondary indexes for the access patterns the dashboards and ingest path actually use.
+# SCHEMA.txt only declares primary keys and unique keys; this migration adds the
+# composite indexes below with the right DDL per dialect, and can confirm through
+# EXPLAIN that a local database uses each of them.
+#
+# Usage:
+#   python -m utils.migrations.indexes            # create missing indexes
+#   python -m utils.migrations.indexes --verify   # also check query plans
+
+import sys
+from datetime import date
+
+from sqlalchemy import MetaData, Table, Index, inspect, text
+
+from utils.db import get_engine
+from utils.migrations import find_table_name
+from utils.schema import SECONDARY_INDEXES, ACCOMPLISHMENTS_WEEK_INDEX
+
+# Probe query exercising each index, by index name
+PROBES = {
+    "ix_weeklyreports_employeeid_weekstartdate":
+        "SELECT weekstartdate FROM {table} WHERE employeeid = :employeeid AND weekstartdate >= :week",
+    "ix_weeklyreports_weekstartdate":
+        "SELECT employeeid FROM {table} WHERE weekstartdate BETWEEN :week AND :week_end",
+    "ix_hourstracking_employeeid_reportingweek":
+        "SELECT reportingweek FROM {table} WHERE employeeid = :employeeid AND reportingweek >= :week",
+    ACCOMPLISHMENTS_WEEK_INDEX:
+        "SELECT weekstartdate FROM {table} WHERE employeeid = :employeeid AND weekstartdate >= :week",
+    "ix_accomplishments_workstreamid":
+        "SELECT workstreamid FROM {table} WHERE workstreamid = :workstreamid",
+}
+
+# (index name, table, columns, probe query), defined once in utils/schema.py
+INDEXES = [(name, table, columns, PROBES[name]) for name, table, columns in SECONDARY_INDEXES]
+
+PROBE_PARAMS = {
+    "employeeid": 1,
+    "workstreamid": 1,
+    "week": date(2025, 1, 6),
+    "week_end": date(2025, 3, 31),
+}
+
+
+def _reflect(engine, name):
+    return Table(find_table_name(engine, name), MetaData(), autoload_with=engine)
+
+
+def create_indexes(engine):
+    """
+    Creates every index in `INDEXES` that does not exist yet.
+
+    PostgreSQL indexes are built CONCURRENTLY (outside a transaction) so weekly
+    submissions are not blocked while a large table is indexed. Indexes whose
+    columns are missing (e.g. before `accomplishment_dates` has run) are skipped.
+
+    Args:
+        engine (Engine): Target engine.
+
+    Returns:
+        dict: Index name -> "created", "exists", or "skipped".
+    """
+    results = {}
+    tables = {}
+    for index_name, table_name, columns, _ in INDEXES:
+        if table_name not in tables:
+            tables[table_name] = _reflect(engine, table_name)
+        table = tables[table_name]
+
+        existing = {ix["name"] for ix in inspect(engine).get_indexes(table.name)}
+        if index_name in existing:
+            results[index_name] = "exists"
+            continue
+        if any(col not in table.c for col in columns):
+            results[index_name] = "skipped"
+            continue
+
+        if engine.dialect.name == "postgresql":
+            index = Index(index_name, *[table.c[col] for col in columns], postgresql_concurrently=True)
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                index.create(conn)
+        else:
+            index = Index(index_name, *[table.c[col] for col in columns])
+            with engine.begin() as conn:
+                index.create(conn)
+        results[index_name] = "created"
+    return results
+
+
+def explain(conn, sql, params=None):
+    """
+    Returns the query plan for `sql` as a single string, or None if the
+    dialect has no supported EXPLAIN form here (e.g. MSSQL showplan).
+
+    Args:
+        conn (Connection): Open connection.
+        sql (str): Query to explain.
+        params (dict, optional): Bound parameters.
+
+    Returns:
+        str | None: Plan text.
+    """
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params or {}).fetchall()
+        return "\n".join(str(row[-1]) for row in rows)
+    if dialect == "postgresql":
+        # Tiny local tables favour sequential scans; ask the planner for index paths
+        conn.execute(text("SET enable_seqscan = off"))
+        try:
+            rows = conn.execute(text(f"EXPLAIN {sql}"), params or {}).fetchall()
+        finally:
+            conn.execute(text("RESET enable_seqscan"))
+        return "\n".join(str(row[0]) for row in rows)
+    return None
+
+
+def verify_indexes(engine):
+    """
+    Runs each index's probe query through EXPLAIN and checks the index is used.
+
+    Args:
+        engine (Engine): Target engine (ideally a local copy of the database).
+
+    Returns:
+        dict: Index name -> True/False, or None when the plan could not be checked.
+    """
+    results = {}
+    with engine.connect() as conn:
+        for index_name, table_name, columns, probe in INDEXES:
+            table = _reflect(engine, table_name)
+            if any(col not in table.c for col in columns):
+                results[index_name] = None
+                continue
+            plan = explain(conn, probe.format(table=table.name), PROBE_PARAMS)
+            results[index_name] = None if plan is None else index_name in plan
+    return results
+
+
+def upgrade(engine=None):
+    """
+    Creates the missing secondary indexes. Safe to re-run.
+
+    Args:
+        engine (Engine, optional): Target engine. Defaults to the shared engine.
+
+    Returns:
+        dict: Index name -> "created", "exists", or "skipped".
+    """
+    return create_indexes(engine or get_engine())
+
+
+if __name__ == "__main__":
+    target = get_engine()
+    for name, status in upgrade(target).items():
+        print(f"{name}: {status}")
+    if "--verify" in sys.argv:
+        for name, used in verify_indexes(target).items():
+            print(f"{name}: {'used' if used else 'not checked' if used is None else 'NOT USED'}")
@@ -1,21 +1,48 @@
-# This file is a placeholder for any reusable raw SQL query strings. We’ll only define one right now (used in the Management Dashboard), and grow this as needed.
+# This file holds reusable raw SQL query strings (used by the dashboards). Grow this as needed.
 
-weekly_reports_with_employees = """
-SELECT 
-    wr.weekstartdate AS "Reporting Week",
-    e.vendorname AS "Vendor Name",
-    wr.divisioncommand AS "Division/Command",
-    wr.workproducttitle AS "Work Product Title",
-    wr.contributiondescription AS "Brief description of individual's contribution",
-    wr.status AS "Work Product Status",
-    wr.plannedorunplanned AS "Planned or Unplanned",
-    wr.datecompleted AS "If Completed, Date Completed",
-    wr.distinctnfr AS "Distinct NFR",
-    wr.distinctcap AS "Distinct CAP",
-    wr.effortpercentage AS "Level of Effort (%)",
-    e.name AS "Contractor (Last Name, First Name)",
-    wr.govttaname AS "Govt TA (Last Name, First Name)",
-    e.laborcategory AS "Labor Category"
+# Sidebar filter options for the Management Dashboard
+weekly_report_weeks = """
+SELECT DISTINCT wr.weekstartdate
 FROM weeklyreports wr
-JOIN employees e ON wr.employeeid = e.employeeid
+ORDER BY wr.weekstartdate
 """
+
+weekly_report_vendors = """
+SELECT DISTINCT e.vendorname
+FROM employees e
+WHERE e.vendorname IS NOT NULL
+  AND EXISTS (SELECT 1 FROM weeklyreports wr WHERE wr.employeeid = e.employeeid)
+ORDER BY e.vendorname
+"""
+
+weekly_report_contractors = """
+SELECT DISTINCT e.name
+FROM employees e
+WHERE e.name IS NOT NULL
+  AND EXISTS (SELECT 1 FROM weeklyreports wr WHERE wr.employeeid = e.employeeid)
+ORDER BY e.name
+"""
+
+# Sidebar filter options for the Accomplishments Dashboard
+accomplishment_weeks = """
+SELECT DISTINCT a.weekstartdate
+FROM accomplishments a
+ORDER BY a.weekstartdate
+"""
+
+accomplishment_contractors = """
+SELECT DISTINCT e.name
+FROM employees e
+WHERE e.name IS NOT NULL
+  AND EXISTS (SELECT 1 FROM accomplishments a WHERE a.employeeid = e.employeeid)
+ORDER BY e.name
+"""
+
+accomplishment_workstreams = """
+SELECT DISTINCT w.name
+FROM workstreams w
+WHERE w.name IS NOT NULL
+  AND EXISTS (SELECT 1 FROM accomplishments a WHERE a.workstreamid = w.workstreamid)
+ORDER BY w.name
+"""
+
@@ -0,0 +1,182 @@
+# This module is the runnable definition of the WSR schema (see database/SCHEMA.txt).
+# It builds the five tables, the rollup cubes, and their secondary indexes with SQLAlchemy Core, so the same
+# definition works on PostgreSQL, MSSQL, and SQLite (including an in-memory database for
+# local benchmarking and tests). It deliberately does not import utils.db.
+#
+# Usage:
+#   python -m utils.schema            # create missing tables/indexes at DATABASE_URL
+
+from sqlalchemy import (
+    MetaData, Table, Column, Index, ForeignKey,
+    Integer, String, Text, Date, DateTime, Numeric, func, text, select, insert
+)
+
+metadata = MetaData()
+
+employees = Table(
+    "employees", metadata,
+    Column("employeeid", Integer, primary_key=True, autoincrement=True),
+    Column("name", String(255), nullable=False),
+    Column("laborcategory", String(255), server_default="Unknown Role"),
+    Column("vendorname", String(255), server_default="Unknown Vendor"),
+    Column("publicid", String(255)),                # e.g., GARAFOLA-RICHIE-042
+    Column("uniquekey", String(64), unique=True),   # SHA-256 hash of Name + VendorName
+    # The bulk ingest path inserts new employees with a NULL publicid and assigns it
+    # afterwards. A UNIQUE constraint on MSSQL admits only one NULL, so the index is
+    # filtered there; PostgreSQL and SQLite already ignore NULLs in unique indexes.
+    Index("uq_employees_publicid", "publicid", unique=True, mssql_where=text("publicid IS NOT NULL")),
+)
+
+workstreams = Table(
+    "workstreams", metadata,
+    Column("workstreamid", Integer, primary_key=True, autoincrement=True),
+    Column("name", String(255), nullable=False),
+    Column("description", Text),
+)
+
+accomplishments = Table(
+    "accomplishments", metadata,
+    Column("accomplishmentid", Integer, primary_key=True, autoincrement=True),
+    Column("employeeid", Integer, ForeignKey("employees.employeeid", ondelete="CASCADE"), nullable=False),
+    Column("workstreamid", Integer, ForeignKey("workstreams.workstreamid", ondelete="SET NULL")),
+    Column("daterange", String(50)),        # e.g., "07/15/2025"
+    Column("weekstartdate", Date),          # DateRange as a real date
+    Column("description", Text, nullable=False),
+    # Audit
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+    Column("entered_by", Text),
+)
+
+weekly_reports = Table(
+    "weeklyreports", metadata,
+    Column("reportid", Integer, primary_key=True, autoincrement=True),
+    Column("employeeid", Integer, ForeignKey("employees.employeeid", ondelete="CASCADE"), nullable=False),
+    Column("weekstartdate", Date, nullable=False),
+    Column("divisioncommand", String(255)),
+    Column("workproducttitle", String(255), nullable=False),
+    Column("contributiondescription", Text),
+    Column("status", String(100)),
+    Column("plannedorunplanned", String(50)),
+    Column("datecompleted", Date),
+    Column("distinctnfr", String(255)),
+    Column("distinctcap", String(255)),
+    Column("effortpercentage", Numeric(5, 2)),
+    Column("contractorname", String(255)),
+    Column("govttaname", String(255)),
+    # Audit
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+    Column("updated_at", DateTime),
+    Column("source_file", Text),
+    Column("entered_by", Text),
+)
+
+hourstracking = Table(
+    "hourstracking", metadata,
+    Column("entryid", Integer, primary_key=True, autoincrement=True),
+    Column("employeeid", Integer, ForeignKey("employees.employeeid")),
+    Column("workstreamid", Integer, ForeignKey("workstreams.workstreamid")),
+    Column("reportingweek", Date),
+    Column("hoursworked", Numeric(5, 2)),
+    Column("levelofeffort", Numeric(5, 2)),
+    # Audit
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+    Column("source_file", Text),
+    Column("entered_by", Text),
+)
+
+# -----------------------------
+# Rollup (cube) tables
+# -----------------------------
+# Maintained per reporting week by utils/cube.py; the dashboards aggregate these
+# instead of the raw WeeklyReports / Accomplishments history.
+weekly_fact_cube = Table(
+    "weeklyfactcube", metadata,
+    Column("weekstartdate", Date, nullable=False),
+    Column("vendorname", String(255)),
+    Column("divisioncommand", String(255)),
+    Column("contractorname", String(255)),
+    Column("laborcategory", String(255)),
+    Column("status", String(100)),
+    Column("plannedorunplanned", String(50)),
+    Column("hours", Numeric(12, 2), nullable=False),
+    Column("effortpercentage", Numeric(12, 2), nullable=False),
+    Column("reportcount", Integer, nullable=False),
+    Index("ix_weeklyfactcube_weekstartdate", "weekstartdate"),
+)
+
+# Work product titles are nearly unique per report, so they get their own rollup
+# rather than multiplying the rows of the weekly fact cube.
+work_product_cube = Table(
+    "workproductcube", metadata,
+    Column("weekstartdate", Date, nullable=False),
+    Column("workproducttitle", String(255)),
+    Column("hours", Numeric(12, 2), nullable=False),
+    Column("reportcount", Integer, nullable=False),
+    Index("ix_workproductcube_weekstartdate", "weekstartdate"),
+)
+
+accomplishment_cube = Table(
+    "accomplishmentcube", metadata,
+    Column("weekstartdate", Date),
+    Column("workstreamname", String(255)),
+    Column("contractorname", String(255)),
+    Column("accomplishmentcount", Integer, nullable=False),
+    Index("ix_accomplishmentcube_weekstartdate", "weekstartdate"),
+)
+
+# -----------------------------
+# Data versions
+# -----------------------------
+# One counter per table, bumped by every write transaction (utils/versions.py).
+# Dashboard caches are keyed on these instead of expiring on a timer. `create_all`
+# seeds a row per table, so a bump only ever updates (and row-locks) an existing row.
+data_versions = Table(
+    "dataversions", metadata,
+    Column("tablename", String(64), primary_key=True),
+    Column("version", Integer, nullable=False),
+    Column("updated_at", DateTime),
+)
+
+# -----------------------------
+# Secondary indexes
+# -----------------------------
+# (index name, table name, columns) — also applied to existing databases by
+# utils/migrations/indexes.py
+ACCOMPLISHMENTS_WEEK_INDEX = "ix_accomplishments_employeeid_weekstartdate"
+
+SECONDARY_INDEXES = [
+    ("ix_weeklyreports_employeeid_weekstartdate", "weeklyreports", ("employeeid", "weekstartdate")),
+    ("ix_weeklyreports_weekstartdate", "weeklyreports", ("weekstartdate",)),
+    ("ix_hourstracking_employeeid_reportingweek", "hourstracking", ("employeeid", "reportingweek")),
+    (ACCOMPLISHMENTS_WEEK_INDEX, "accomplishments", ("employeeid", "weekstartdate")),
+    ("ix_accomplishments_workstreamid", "accomplishments", ("workstreamid",)),
+]
+
+for _name, _table, _columns in SECONDARY_INDEXES:
+    Index(_name, *[metadata.tables[_table].c[col] for col in _columns])
+
+
+def create_all(engine):
+    """
+    Creates any missing tables and indexes on the given engine, and seeds a
+    version-0 `dataversions` row for each table. Existing tables are left untouched.
+
+    Args:
+        engine (Engine): Target engine (PostgreSQL, MSSQL, or SQLite).
+
+    Returns:
+        MetaData: The schema metadata.
+    """
+    metadata.create_all(engine, checkfirst=True)
+    with engine.begin() as conn:
+        seeded = set(conn.execute(select(data_versions.c.tablename)).scalars())
+        missing = [name for name in metadata.tables if name != data_versions.name and name not in seeded]
+        if missing:
+            conn.execute(insert(data_versions), [{"tablename": name, "version": 0} for name in missing])
+    return metadata
+
+
+if __name__ == "__main__":
+    from utils.db import get_engine
+    create_all(get_engine())
+    print("Schema created:", ", ".join(metadata.tables))
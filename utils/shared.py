@@ -0,0 +1,193 @@
+# This module shares dashboard DataFrames between Streamlit processes on one host.
+# Each dataset is written once to an Arrow IPC file stamped with the data version it
+# was built from (utils/versions.py). Other processes memory-map the file instead of
+# querying the database: pages then read column buffers straight from the OS page
+# cache, so host memory holds one copy of a dataset however many processes serve it.
+#
+# Files are replaced atomically (write to a temp file, then rename), so a reader either
+# maps the old file or the new one; a file still mapped by a reader stays valid until
+# it is unmapped.
+#
+# The files also outlive the process: after a deploy or crash, a dataset whose stamp
+# still matches the database is restored from disk instead of rebuilt. Values that are
+# not DataFrames (e.g. the HR KPI dict) are persisted as version-stamped pickles.
+# Data versions do not cover everything a file depends on, so a file is also ignored
+# (and the dataset rebuilt in full) when it is older than WSR_SHARED_MAX_AGE, or when
+# the writer's dataset stamp (e.g. a hash of its query, which changes with a deploy
+# that alters its columns or source tables) differs from the reader's.
+#
+# Settings (environment):
+#   WSR_SHARED_DIR       folder for the shared files (default cache/shared, empty disables)
+#   WSR_SHARED_MAX_AGE   seconds a file may be reused for (default 86400, 0 for no limit)
+
+import os
+import json
+import pickle
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+SHARED_DIR = os.getenv("WSR_SHARED_DIR", os.path.join("cache", "shared"))
+SHARED_MAX_AGE = float(os.getenv("WSR_SHARED_MAX_AGE", 24 * 60 * 60))
+
+# Schema metadata keys holding the data version token, the dataset stamp, and the
+# incremental high-water mark
+VERSION_KEY = b"wsr_version"
+STAMP_KEY = b"wsr_stamp"
+WATERMARK_KEY = b"wsr_watermark"
+
+
+def _arrow_string_dtype():
+    """
+    Arrow-backed string dtype with NaN missing values (pandas 3's default `str`), or
+    None on pandas versions without one.
+    """
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)     # pandas >= 2.3
+    except TypeError:
+        pass
+    try:
+        return pd.StringDtype("pyarrow_numpy")                # pandas 2.1 / 2.2
+    except (TypeError, ValueError):
+        return None                                           # pandas 2.0
+
+
+ARROW_STRINGS = _arrow_string_dtype()
+
+
+def _types_mapper(arrow_type):
+    if ARROW_STRINGS is not None and (pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)):
+        return ARROW_STRINGS
+    return None
+
+
+def version_token(version):
+    """Serializes a data version (see utils/versions.py) for the file stamp."""
+    return json.dumps(version, default=str).encode("utf-8")
+
+
+class SharedFrames:
+    """
+    Version-stamped, memory-mapped Arrow IPC files, one per dataset
+    (pickles for datasets that are not DataFrames).
+
+    Args:
+        directory (str): Folder for the shared files, created if missing.
+        max_age (float): Seconds after which a file is ignored; 0 for no limit.
+    """
+
+    def __init__(self, directory=SHARED_DIR, max_age=SHARED_MAX_AGE):
+        self.directory = directory
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, name, suffix=".arrow"):
+        return os.path.join(self.directory, f"{name}{suffix}")
+
+    def _replace(self, path, write):
+        # Write next to the target, then rename over it in one step
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as sink:
+                write(sink)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def _expired(self, path):
+        # Files are written whole and renamed into place, so mtime is the write time
+        return bool(self.max_age) and time.time() - os.path.getmtime(path) > self.max_age
+
+    def _read_pickle(self, name, version, stamp):
+        path = self.path(name, ".pkl")
+        try:
+            if self._expired(path):
+                return None
+            with open(path, "rb") as source:
+                token, written_stamp, value = pickle.load(source)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Shared dataset {name} unreadable:", e)
+            return None
+        return value if token == version_token(version) and written_stamp == stamp else None
+
+    def read(self, name, version, stamp=None):
+        """
+        Maps the shared file for `name` if it was built from `version`.
+
+        Args:
+            name (str): Dataset name.
+            version (hashable): Data version token the caller expects.
+            stamp (str, optional): Dataset stamp the caller expects.
+
+        Returns:
+            object or None: Frame backed by the mapped file (with the incremental
+            high-water mark, if any, in `attrs["watermark"]`), the unpickled value for
+            other datasets, or None when the file is missing, unreadable, older than
+            `max_age`, or stamped with another version or dataset stamp.
+        """
+        path = self.path(name)
+        try:
+            source = pa.memory_map(path, "r")
+        except (FileNotFoundError, OSError):
+            return self._read_pickle(name, version, stamp)
+        if self._expired(path):
+            return None
+        try:
+            reader = ipc.open_file(source)
+            metadata = reader.schema.metadata or {}
+            if metadata.get(VERSION_KEY) != version_token(version):
+                return None
+            if metadata.get(STAMP_KEY, b"").decode("utf-8") != (stamp or ""):
+                return None
+            # split_blocks avoids consolidating columns, so numeric columns keep
+            # pointing at the mapped buffers. Strings only stay in the mapped buffers
+            # as an Arrow-backed dtype; pandas 2 would otherwise copy them into Python
+            # objects, so they are mapped explicitly (a no-op on pandas 3, whose
+            # default `str` dtype is the same one). Categoricals are decoded as usual.
+            frame = reader.read_all().to_pandas(split_blocks=True, types_mapper=_types_mapper)
+        except pa.ArrowException as e:
+            print(f"Shared dataset {name} unreadable:", e)
+            return None
+        if WATERMARK_KEY in metadata:
+            frame.attrs["watermark"] = datetime.fromisoformat(metadata[WATERMARK_KEY].decode("utf-8"))
+        return frame
+
+    def write(self, name, version, value, watermark=None, stamp=None):
+        """
+        Writes `value` as the shared copy of `name`, stamped with `version`.
+
+        Args:
+            name (str): Dataset name.
+            version (hashable): Data version token the value was built from.
+            value (object): Dataset value; DataFrames are written as Arrow IPC,
+                anything else is pickled.
+            watermark (datetime, optional): High-water mark of an incremental frame,
+                restored with it (see utils/incremental.py).
+            stamp (str, optional): Dataset stamp readers must match.
+        """
+        if not isinstance(value, pd.DataFrame):
+            payload = (version_token(version), stamp, value)
+            self._replace(self.path(name, ".pkl"), lambda sink: pickle.dump(payload, sink))
+            return
+
+        table = pa.Table.from_pandas(value)
+        metadata = {**(table.schema.metadata or {}), VERSION_KEY: version_token(version)}
+        if stamp:
+            metadata[STAMP_KEY] = stamp.encode("utf-8")
+        if watermark is not None:
+            metadata[WATERMARK_KEY] = watermark.isoformat().encode("utf-8")
+        table = table.replace_schema_metadata(metadata)
+
+        def write_table(sink):
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+        self._replace(self.path(name), write_table)
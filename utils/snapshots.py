@@ -0,0 +1,167 @@
+# This module materializes the weekly reports + employees join the dashboards read.
+# On PostgreSQL it is a materialized view with a unique index, refreshed CONCURRENTLY so
+# readers are never blocked; other dialects get a plain snapshot table whose rows are
+# replaced per employee. Writers refresh it inside the transaction of each write batch
+# (see utils/ingest.py), so the snapshot commits together with the rows it reflects and
+# the join runs once per write instead of once per reader. It deliberately does not
+# import utils.db.
+#
+# Writes that bypass the ingest path (e.g. the backfills in utils/migrations) leave the
+# snapshot behind; re-run the command below after them.
+#
+# Usage:
+#   python -m utils.snapshots         # create the snapshot (or re-create a stale one) and refresh it
+
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, String, Text, Date, DateTime, Numeric, Index,
+    inspect, text, delete, bindparam
+)
+
+from utils.versions import bump_versions
+
+SNAPSHOT_NAME = "weeklyreportsnapshot"
+SNAPSHOT_INDEX = "ux_weeklyreportsnapshot_reportid"
+
+# Source query, one row per weekly report (column names match the snapshot table)
+SNAPSHOT_SELECT = """
+SELECT
+    wr.reportid,
+    wr.employeeid,
+    wr.weekstartdate,
+    e.vendorname,
+    wr.divisioncommand,
+    wr.workproducttitle,
+    wr.contributiondescription,
+    wr.status,
+    wr.plannedorunplanned,
+    wr.datecompleted,
+    wr.distinctnfr,
+    wr.distinctcap,
+    wr.effortpercentage,
+    e.name AS contractorname,
+    wr.govttaname,
+    e.laborcategory,
+    COALESCE(wr.updated_at, wr.created_at) AS updated_at
+FROM weeklyreports wr
+JOIN employees e ON wr.employeeid = e.employeeid
+"""
+
+# Snapshot table for dialects without materialized views (also usable to read the PG view)
+snapshot = Table(
+    SNAPSHOT_NAME, MetaData(),
+    Column("reportid", Integer, primary_key=True, autoincrement=False),
+    Column("employeeid", Integer),
+    Column("weekstartdate", Date),
+    Column("vendorname", String(255)),
+    Column("divisioncommand", String(255)),
+    Column("workproducttitle", String(255)),
+    Column("contributiondescription", Text),
+    Column("status", String(100)),
+    Column("plannedorunplanned", String(50)),
+    Column("datecompleted", Date),
+    Column("distinctnfr", String(255)),
+    Column("distinctcap", String(255)),
+    Column("effortpercentage", Numeric(5, 2)),
+    Column("contractorname", String(255)),
+    Column("govttaname", String(255)),
+    Column("laborcategory", String(255)),
+    # Row change time of the underlying report, for incremental reads (utils/incremental.py)
+    Column("updated_at", DateTime),
+    Index("ix_weeklyreportsnapshot_weekstartdate", "weekstartdate"),
+    Index("ix_weeklyreportsnapshot_employeeid", "employeeid"),
+)
+
+
+def snapshot_exists(conn):
+    """True if the snapshot view/table exists on this connection's database."""
+    inspector = inspect(conn)
+    if conn.dialect.name == "postgresql":
+        return SNAPSHOT_NAME in inspector.get_materialized_view_names()
+    return inspector.has_table(SNAPSHOT_NAME)
+
+
+def _is_stale(conn):
+    """True if the existing snapshot predates columns of the current definition."""
+    existing = {col["name"].lower() for col in inspect(conn).get_columns(SNAPSHOT_NAME)}
+    return not set(snapshot.c.keys()) <= existing
+
+
+def create_snapshot(engine):
+    """
+    Creates and populates the snapshot if it does not exist yet. A snapshot
+    created by an earlier version, missing some of the current columns, is
+    dropped and created again.
+
+    Args:
+        engine (Engine): Target engine.
+
+    Returns:
+        bool: True if the snapshot was created, False if it already existed.
+    """
+    with engine.begin() as conn:
+        is_pg = conn.dialect.name == "postgresql"
+        if snapshot_exists(conn):
+            if not _is_stale(conn):
+                return False
+            conn.execute(text(f"DROP {'MATERIALIZED VIEW' if is_pg else 'TABLE'} {SNAPSHOT_NAME}"))
+        if is_pg:
+            conn.execute(text(f"CREATE MATERIALIZED VIEW {SNAPSHOT_NAME} AS {SNAPSHOT_SELECT}"))
+            # CONCURRENTLY refreshes require a unique index on the view
+            conn.execute(text(f"CREATE UNIQUE INDEX {SNAPSHOT_INDEX} ON {SNAPSHOT_NAME} (reportid)"))
+            conn.execute(text(
+                f"CREATE INDEX ix_weeklyreportsnapshot_weekstartdate ON {SNAPSHOT_NAME} (weekstartdate)"
+            ))
+        else:
+            snapshot.create(conn)
+            _fill(conn)
+        bump_versions(conn, SNAPSHOT_NAME)
+    return True
+
+
+def _fill(conn, employee_ids=None):
+    """Replaces the snapshot rows of `employee_ids` (all rows if None) with the current join."""
+    columns = ", ".join(snapshot.c.keys())
+    if employee_ids is None:
+        conn.execute(delete(snapshot))
+        conn.execute(text(f"INSERT INTO {SNAPSHOT_NAME} ({columns}) {SNAPSHOT_SELECT}"))
+        return
+    employee_ids = sorted(set(employee_ids))
+    if not employee_ids:
+        return
+    conn.execute(delete(snapshot).where(snapshot.c.employeeid.in_(employee_ids)))
+    conn.execute(
+        text(f"INSERT INTO {SNAPSHOT_NAME} ({columns}) {SNAPSHOT_SELECT}WHERE wr.employeeid IN :ids")
+        .bindparams(bindparam("ids", value=employee_ids, expanding=True))
+    )
+
+
+def refresh_snapshot(conn, employee_ids=None):
+    """
+    Brings the snapshot up to date within the caller's transaction, so it commits
+    or rolls back together with the write it reflects.
+
+    PostgreSQL refreshes the materialized view CONCURRENTLY, so dashboard reads
+    keep running against the previous contents. Other dialects replace the rows of
+    the written employees (every row if `employee_ids` is None). Either way the
+    snapshot's data version is bumped.
+
+    Args:
+        conn (Connection): Connection with an open transaction.
+        employee_ids (iterable[int], optional): Employees whose reports (or employee
+            columns) the write changed.
+    """
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {SNAPSHOT_NAME}"))
+    else:
+        _fill(conn, employee_ids)
+    bump_versions(conn, SNAPSHOT_NAME)
+
+
+if __name__ == "__main__":
+    from utils.db import get_engine
+
+    target = get_engine()
+    if not create_snapshot(target):
+        with target.begin() as connection:
+            refresh_snapshot(connection)
+    print(f"{SNAPSHOT_NAME} is up to date.")
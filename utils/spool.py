@@ -0,0 +1,333 @@
+# This module provides a local write-ahead spool for form submissions.
+# When the database is unreachable, prepared batches are written to a small SQLite file
+# next to the app instead of being lost. A background replayer drains the spool, oldest
+# first, through the bulk ingest path once the database is reachable again.
+#
+# Several app processes may share one spool file. A replayer claims the oldest batch in
+# a `BEGIN IMMEDIATE` transaction before ingesting it, so a batch is only ever in flight
+# in one process, and a batch claimed elsewhere holds back everything behind it. A batch
+# that keeps failing for a reason other than connectivity is moved to a dead-letter state
+# after `MAX_ATTEMPTS` tries so the batches behind it can go through; the form page
+# reports dead batches instead of counting them as waiting.
+
+import os
+import json
+import socket
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, InterfaceError, SQLAlchemyError
+
+from utils.ingest import bulk_ingest_weekly_reports
+
+SPOOL_PATH = os.getenv("WSR_SPOOL_PATH", os.path.join("spool", "submissions.sqlite"))
+
+# Staging row fields stored as ISO dates in the spool payload
+_DATE_FIELDS = ("weekstartdate", "datecompleted")
+
+# Failed (non-connectivity) attempts before a batch is dead-lettered
+MAX_ATTEMPTS = 5
+
+# A claim older than this is treated as abandoned (its process died mid-replay)
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+# Batch states
+PENDING, CLAIMED, DEAD = "pending", "claimed", "dead"
+
+# Only one replay runs per process at a time; other processes are held off by claims
+_replay_lock = threading.Lock()
+
+# Columns added after the first spool files were written
+_LATER_COLUMNS = {
+    "status": f"TEXT NOT NULL DEFAULT '{PENDING}'",
+    "claimed_by": "TEXT",
+    "claimed_at": "TEXT",
+}
+
+
+def _connect(path=None):
+    """Opens the spool file, creating it and its table on first use."""
+    path = path or SPOOL_PATH
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS spool (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            entered_by TEXT,
+            payload TEXT NOT NULL,
+            spooled_at TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT
+        )
+    """)
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(spool)")}
+    for column, ddl in _LATER_COLUMNS.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE spool ADD COLUMN {column} {ddl}")
+    return conn
+
+
+def is_connectivity_error(engine, exc):
+    """
+    True if `exc` means the database is unreachable rather than that the batch failed.
+
+    The exception class alone cannot tell: drivers raise OperationalError for batch
+    errors too (pymssql for arithmetic overflow or truncation, psycopg2 for deadlocks
+    and statement timeouts, SQLite for SQL errors). An error counts as connectivity
+    only if SQLAlchemy invalidated the connection, or a `SELECT 1` on a newly checked
+    out connection fails as well.
+
+    Args:
+        engine (Engine): Engine the failed operation ran on.
+        exc (Exception): The error it raised.
+
+    Returns:
+        bool: True if the database could not be reached.
+    """
+    if getattr(exc, "connection_invalidated", False):
+        return True
+    if not isinstance(exc, (OperationalError, InterfaceError)):
+        return False
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except SQLAlchemyError:
+        return True
+    return False
+
+
+def _owner():
+    """Claim owner for this process and thread."""
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def _claim(spool, owner, now=None):
+    """
+    Claims the oldest live batch for `owner`.
+
+    Runs in a `BEGIN IMMEDIATE` transaction, which takes the spool's write lock
+    before reading, so two processes cannot claim the same batch.
+
+    Returns:
+        tuple or None: (id, entered_by, payload) of the claimed batch, or None if the
+        spool is empty or its oldest batch is claimed by another live replayer.
+    """
+    now = now or datetime.utcnow()
+    spool.execute("BEGIN IMMEDIATE")
+    try:
+        head = spool.execute(
+            "SELECT id, entered_by, payload, status, claimed_at FROM spool "
+            "WHERE kind = 'weekly_reports' AND status != ? ORDER BY id LIMIT 1",
+            (DEAD,)
+        ).fetchone()
+        if head is None:
+            return None
+        batch_id, entered_by, payload, status, claimed_at = head
+        if status == CLAIMED and claimed_at > (now - CLAIM_TIMEOUT).isoformat():
+            # In flight elsewhere; the batches behind it must wait to keep their order
+            return None
+        spool.execute(
+            "UPDATE spool SET status = ?, claimed_by = ?, claimed_at = ? WHERE id = ?",
+            (CLAIMED, owner, now.isoformat(), batch_id)
+        )
+        return batch_id, entered_by, payload
+    finally:
+        spool.commit()
+
+
+def _encode(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot spool value of type {type(value).__name__}")
+
+
+def _decode_rows(payload):
+    rows = json.loads(payload)
+    for row in rows:
+        for field in _DATE_FIELDS:
+            if row.get(field):
+                row[field] = date.fromisoformat(row[field])
+    return rows
+
+
+def spool_batch(rows, entered_by="anonymous", kind="weekly_reports", path=None):
+    """
+    Persists a prepared ingest batch to the local spool.
+
+    Args:
+        rows (list[dict]): Output of `prepare_weekly_rows`.
+        entered_by (str): Audit value replayed with the batch.
+        kind (str): Batch type. Only "weekly_reports" is replayed today.
+        path (str, optional): Spool file. Defaults to `SPOOL_PATH`.
+
+    Returns:
+        int: Spool depth after the batch was added.
+    """
+    payload = json.dumps(rows, default=_encode)
+    conn = _connect(path)
+    try:
+        with conn:
+            conn.execute(
+                "INSERT INTO spool (kind, entered_by, payload, spooled_at) VALUES (?, ?, ?, ?)",
+                (kind, entered_by, payload, datetime.utcnow().isoformat())
+            )
+        return conn.execute("SELECT COUNT(*) FROM spool WHERE status != ?", (DEAD,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def spool_depth(path=None):
+    """
+    Returns the number of batches waiting in the spool (dead-lettered ones excluded).
+
+    Args:
+        path (str, optional): Spool file. Defaults to `SPOOL_PATH`.
+
+    Returns:
+        int: Pending batch count (0 if the spool file does not exist).
+    """
+    path = path or SPOOL_PATH
+    if not os.path.exists(path):
+        return 0
+    conn = _connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM spool WHERE status != ?", (DEAD,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def dead_batches(path=None):
+    """
+    Lists batches that were given up on after `MAX_ATTEMPTS` failed replays.
+
+    Args:
+        path (str, optional): Spool file. Defaults to `SPOOL_PATH`.
+
+    Returns:
+        list[tuple]: (id, entered_by, spooled_at, attempts, last_error) per batch, oldest first.
+    """
+    path = path or SPOOL_PATH
+    if not os.path.exists(path):
+        return []
+    conn = _connect(path)
+    try:
+        return conn.execute(
+            "SELECT id, entered_by, spooled_at, attempts, last_error FROM spool WHERE status = ? ORDER BY id",
+            (DEAD,)
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def replay_spool(engine, path=None, ingest=bulk_ingest_weekly_reports):
+    """
+    Drains spooled batches in submission order through the bulk ingest path.
+
+    Each batch is claimed in the spool file before it is ingested, committed in its
+    own transaction, and removed from the spool only after the commit succeeds.
+    Replay stops at the first batch that fails, so the remaining batches keep their
+    order: a connectivity error (see `is_connectivity_error`) leaves the batch pending
+    as it was; any other error is recorded against it, and after `MAX_ATTEMPTS` failures the batch is moved to
+    the dead-letter state (see `dead_batches`) so later batches can proceed.
+
+    Args:
+        engine (Engine): SQLAlchemy engine for the target database.
+        path (str, optional): Spool file. Defaults to `SPOOL_PATH`.
+        ingest (callable): Ingest function taking (conn, rows, entered_by=...).
+
+    Returns:
+        int: Number of batches replayed (0 if another replay is already running).
+    """
+    path = path or SPOOL_PATH
+    if not os.path.exists(path):
+        return 0
+    if not _replay_lock.acquire(blocking=False):
+        return 0
+
+    owner = _owner()
+    replayed = 0
+    try:
+        spool = _connect(path)
+        try:
+            while True:
+                claimed = _claim(spool, owner)
+                if claimed is None:
+                    break
+                batch_id, entered_by, payload = claimed
+                try:
+                    with engine.begin() as conn:
+                        ingest(conn, _decode_rows(payload), entered_by=entered_by)
+                except Exception as e:
+                    if is_connectivity_error(engine, e):
+                        with spool:
+                            spool.execute(
+                                "UPDATE spool SET status = ?, claimed_by = NULL, claimed_at = NULL "
+                                "WHERE id = ? AND claimed_by = ?",
+                                (PENDING, batch_id, owner)
+                            )
+                        break
+                    with spool:
+                        spool.execute(
+                            "UPDATE spool SET attempts = attempts + 1, last_error = ?, "
+                            "status = CASE WHEN attempts + 1 >= ? THEN ? ELSE ? END, "
+                            "claimed_by = NULL, claimed_at = NULL "
+                            "WHERE id = ? AND claimed_by = ?",
+                            (str(e), MAX_ATTEMPTS, DEAD, PENDING, batch_id, owner)
+                        )
+                    break
+                with spool:
+                    spool.execute("DELETE FROM spool WHERE id = ? AND claimed_by = ?", (batch_id, owner))
+                replayed += 1
+        finally:
+            spool.close()
+    finally:
+        _replay_lock.release()
+    return replayed
+
+
+class SpoolReplayer(threading.Thread):
+    """
+    Daemon thread that periodically replays the spool.
+    Start one per process (e.g. from a `st.cache_resource` factory).
+    """
+
+    def __init__(self, engine, interval=30, path=None):
+        super().__init__(name="wsr-spool-replayer", daemon=True)
+        self.engine = engine
+        self.interval = interval
+        self.path = path
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                if spool_depth(self.path):
+                    replay_spool(self.engine, self.path)
+            except Exception as e:
+                print("Spool replay failed:", e)
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+def start_replayer(engine, interval=30, path=None):
+    """
+    Starts a background `SpoolReplayer` and returns it.
+
+    Args:
+        engine (Engine): SQLAlchemy engine for the target database.
+        interval (int): Seconds between replay attempts.
+        path (str, optional): Spool file. Defaults to `SPOOL_PATH`.
+
+    Returns:
+        SpoolReplayer: The running replayer thread.
+    """
+    replayer = SpoolReplayer(engine, interval=interval, path=path)
+    replayer.start()
+    return replayer
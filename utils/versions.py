@@ -0,0 +1,85 @@
+# This module keeps a data-version counter per table in `dataversions` (utils/schema.py).
+# Every write transaction bumps the counters of the tables it changed, in the same
+# transaction, so a committed write is always visible as a new version. Dashboard loaders
+# pass the versions they depend on into `st.cache_data`, which keeps results cached
+# indefinitely and recomputes them exactly once after each real write.
+# It deliberately does not import utils.db.
+
+from datetime import datetime
+
+from sqlalchemy import select, insert, update
+from sqlalchemy.exc import IntegrityError
+
+from utils.schema import data_versions
+
+
+def _names(names):
+    return sorted({name.lower() for name in names})
+
+
+def bump_versions(conn, *names):
+    """
+    Increments the data version of each named table. Call inside the write's transaction.
+
+    Args:
+        conn (Connection): SQLAlchemy database connection.
+        *names (str): Table names (any case).
+    """
+    names = _names(names)
+    if not names:
+        return
+    now = datetime.utcnow()
+    v = data_versions.c
+    bump = (
+        update(data_versions)
+        .where(v.tablename.in_(names))
+        .values(version=v.version + 1, updated_at=now)
+    )
+    if conn.execute(bump).rowcount == len(names):
+        return
+    # Rows not seeded by schema.create_all (e.g. the snapshot, or an older database).
+    # A concurrent writer may insert the same row first: the savepoint keeps the
+    # transaction usable, and the retried update then waits on that writer's row lock.
+    existing = set(conn.execute(select(v.tablename).where(v.tablename.in_(names))).scalars())
+    for name in names:
+        if name in existing:
+            continue
+        try:
+            with conn.begin_nested():
+                conn.execute(insert(data_versions).values(tablename=name, version=1, updated_at=now))
+        except IntegrityError:
+            conn.execute(bump.where(v.tablename == name))
+
+
+def get_versions(conn, *names):
+    """
+    Returns the current data versions of the named tables as a cache key.
+
+    Args:
+        conn (Connection): Open connection.
+        *names (str): Table names (any case).
+
+    Returns:
+        tuple: ((table name, version), ...) sorted by name; never-written tables are 0.
+    """
+    names = _names(names)
+    v = data_versions.c
+    found = dict(conn.execute(
+        select(v.tablename, v.version).where(v.tablename.in_(names))
+    ).fetchall())
+    return tuple((name, found.get(name, 0)) for name in names)
+
+
+def read_versions(engine, *names):
+    """
+    Same as `get_versions`, opening a short-lived connection on `engine`.
+
+    Args:
+        engine (Engine): SQLAlchemy engine.
+        *names (str): Table names (any case).
+
+    Returns:
+        tuple: ((table name, version), ...).
+    """
+    with engine.connect() as conn:
+        return get_versions(conn, *names)
@@ -0,0 +1,215 @@
+# This module keeps the dashboard datasets (utils/datasets.py) warm in the background.
+# A single `DatasetWarmer` thread per process polls the data versions and rebuilds a
+# dataset as soon as one of its tables changes, then swaps the new value in atomically.
+# Readers always get the last finished value immediately (stale-while-revalidate), so
+# no page view pays for a rebuild inline except the very first one in a process.
+# `prefetch` starts those first builds (and the filter catalogs) from the landing page,
+# so the first dashboard click is warm too.
+# With a `SharedFrames` store (utils/shared.py), a dataset is built by the first process
+# that needs a version and read from disk by every other process on the host, including
+# processes started after a restart while the version still matches, the file is
+# younger than WSR_SHARED_MAX_AGE, and the dataset's stamp (`dataset_stamp`) is unchanged.
+
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import streamlit as st
+
+from utils.db import engine
+from utils.catalog import CATALOG_QUERIES, get_filter_options
+from utils.datasets import DATASETS
+from utils.shared import SHARED_DIR, SharedFrames
+from utils.versions import get_versions, read_versions
+
+
+def dataset_stamp(dataset):
+    """
+    Identifies what a dataset's shared file was built by, beyond its data versions.
+    Incremental datasets hash their query text, so a deploy that changes the columns or
+    source tables rejects files written before it; others use their loader's name.
+    """
+    if dataset.incremental is not None:
+        source = str(dataset.incremental.select)
+    else:
+        source = f"{dataset.load.__module__}.{dataset.load.__qualname__}"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+class DatasetWarmer(threading.Thread):
+    """
+    Daemon thread that rebuilds datasets when their data version changes.
+    Start one per process via `get_warmer()`.
+
+    Args:
+        engine (Engine): SQLAlchemy engine.
+        datasets (dict, optional): Name -> `Dataset`. Defaults to `DATASETS`.
+        interval (int): Seconds between version checks.
+        shared (SharedFrames, optional): Cross-process store for DataFrame datasets.
+    """
+
+    def __init__(self, engine, datasets=None, interval=30, shared=None):
+        super().__init__(name="wsr-dataset-warmer", daemon=True)
+        self.engine = engine
+        self.datasets = DATASETS if datasets is None else datasets
+        self.interval = interval
+        self.shared = shared
+        self._entries = {}          # name -> (version, value)
+        # One lock per dataset, so different datasets can build in parallel
+        self._build_locks = {name: threading.Lock() for name in self.datasets}
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+
+    def refresh(self, name):
+        """
+        Rebuilds one dataset if its data version changed since the last build.
+
+        Returns:
+            bool: True if the dataset was rebuilt.
+        """
+        dataset = self.datasets[name]
+        with self._build_locks[name]:
+            with self.engine.connect() as conn:
+                version = get_versions(conn, *dataset.tables)
+                entry = self._entries.get(name)
+                if entry is not None and entry[0] == version:
+                    return False
+                value = self._restore(name, version)
+                if value is None:
+                    value = dataset.load(conn)
+                    self._share(name, version, value)
+            # Single dict assignment: readers see either the old or the new entry
+            self._entries[name] = (version, value)
+            return True
+
+    def _restore(self, name, version):
+        if self.shared is None:
+            return None
+        value = self.shared.read(name, version, stamp=dataset_stamp(self.datasets[name]))
+        incremental = self.datasets[name].incremental
+        if incremental is not None and isinstance(value, pd.DataFrame) and "watermark" in value.attrs:
+            # Later changes are then fetched incrementally instead of by a full reload
+            incremental.restore(value, value.attrs["watermark"], versions=version)
+        return value
+
+    def _share(self, name, version, value):
+        if self.shared is None:
+            return
+        dataset = self.datasets[name]
+        incremental = dataset.incremental
+        try:
+            self.shared.write(
+                name, version, value,
+                watermark=incremental.watermark if incremental else None, stamp=dataset_stamp(dataset)
+            )
+        except Exception as e:
+            # Other processes (and restarts) fall back to building their own copy
+            print(f"Sharing dataset {name} failed:", e)
+
+    def refresh_all(self):
+        """Rebuilds every dataset whose version changed. Returns the rebuilt names."""
+        return [name for name in self.datasets if self.refresh(name)]
+
+    def get(self, name):
+        """
+        Returns a dataset's latest finished value.
+
+        If the data has changed since, the stale value is returned and the
+        background thread is woken to rebuild it. Only the first request for a
+        dataset in a process builds it inline.
+
+        Returns:
+            object: The dataset (DataFrames are shallow copies, safe to modify).
+        """
+        return self.get_with_version(name)[1]
+
+    def get_with_version(self, name):
+        """
+        Like `get`, but also returns the data version the value was built from,
+        for caching views derived from it.
+
+        Returns:
+            tuple: (version, value).
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            self.refresh(name)
+            entry = self._entries[name]
+        elif read_versions(self.engine, *self.datasets[name].tables) != entry[0]:
+            self._wake.set()
+        version, value = entry
+        return version, value.copy(deep=False) if isinstance(value, pd.DataFrame) else value
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.refresh_all()
+            except Exception as e:
+                print("Dataset warm-up failed:", e)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+
+
+def start_warmer(engine, datasets=None, interval=30, shared=None):
+    """
+    Starts a background `DatasetWarmer` and returns it.
+
+    Args:
+        engine (Engine): SQLAlchemy engine.
+        datasets (dict, optional): Name -> `Dataset`. Defaults to `DATASETS`.
+        interval (int): Seconds between version checks.
+        shared (SharedFrames, optional): Cross-process store for DataFrame datasets.
+
+    Returns:
+        DatasetWarmer: The running warmer thread.
+    """
+    warmer = DatasetWarmer(engine, datasets=datasets, interval=interval, shared=shared)
+    warmer.start()
+    return warmer
+
+
+# Pool for landing-page prefetches, and the batch currently in flight
+_prefetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="wsr-prefetch")
+_prefetch_futures = []
+_prefetch_lock = threading.Lock()
+
+
+def prefetch(warmer, catalogs=None):
+    """
+    Starts non-blocking loads of every dataset and filter catalog in a thread pool.
+    While a previous prefetch is still running, it is returned instead of starting another.
+
+    Args:
+        warmer (DatasetWarmer): Warmer whose datasets to build.
+        catalogs (iterable[str], optional): Catalog datasets. Defaults to all of `CATALOG_QUERIES`.
+
+    Returns:
+        list[Future]: The in-flight loads.
+    """
+    global _prefetch_futures
+    catalogs = CATALOG_QUERIES if catalogs is None else catalogs
+    with _prefetch_lock:
+        if any(not future.done() for future in _prefetch_futures):
+            return _prefetch_futures
+        _prefetch_futures = (
+            [_prefetch_pool.submit(warmer.refresh, name) for name in warmer.datasets]
+            + [_prefetch_pool.submit(get_filter_options, dataset) for dataset in catalogs]
+        )
+        return _prefetch_futures
+
+
+@st.cache_resource(show_spinner=False)
+def get_warmer():
+    """The process-wide warmer, started on first use."""
+    shared = None
+    if SHARED_DIR:
+        try:
+            shared = SharedFrames(SHARED_DIR)
+        except OSError as e:
+            print("Shared datasets disabled:", e)
+    return start_warmer(engine, shared=shared)